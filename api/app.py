@@ -7,17 +7,42 @@ Provides REST API endpoints for the frontend to query PostgreSQL database.
 """
 
 import os
+import sys
 import json
+import base64
 import logging
+import math
+import tempfile
+import threading
+import time
 import urllib.request
 import urllib.error
-from contextlib import contextmanager
-from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
+from urllib.parse import urlencode
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timezone
+from functools import wraps
+from flask import (Flask, Response, g, has_app_context, has_request_context, jsonify,
+                   request, stream_with_context)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+# Allow running as a script (python api/app.py) as well as api.app:app
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.db import ConnectionPool, TimedCursor
+from api.cache import DatasetVersion, ResponseCache, Version, make_etag
+from api.compression import COMPRESS_MIN_BYTES, available_encodings, compress, negotiate
+from api.encoding import dumps as encode_json
+from api.metrics import DEFAULT_DIRECTORY as DEFAULT_METRICS_DIR, Metrics
+from api.outbox import Outbox, OutboxDrainer, PermanentError, PostgresOutbox
+from api.query_log import SlowQueryLog
+from api.rate_limit import MemoryBucketStore, SqliteBucketStore
+from api.search_index import SearchEngine
+from api.sqlite_snapshot import SqliteSnapshot
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -33,8 +58,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger('viriato-api')
 
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify() backed by api.encoding (orjson when installed).
+
+    Dates, datetimes and Decimals from database rows are encoded natively,
+    and response bodies are produced as bytes without a str round trip.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return encode_json(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        started = time.perf_counter()
+        body = encode_json(obj)
+        stats = request_stats()
+        if stats is not None:
+            stats['serialize_seconds'] += time.perf_counter() - started
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend access
+app.json = FastJSONProvider(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'Link'])  # Enable CORS for frontend access
+
+
+# Request metrics (see api/metrics.py), shared across gunicorn workers via files
+METRICS_DIR = os.environ.get('METRICS_DIR', DEFAULT_METRICS_DIR)
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 5))
+metrics = Metrics(METRICS_DIR, flush_interval=METRICS_FLUSH_SECONDS)
+
+
+def request_stats():
+    """Per-request timing counters, or None outside a request."""
+    if not has_request_context():
+        return None
+    return request.environ.setdefault('viriato.stats', {
+        'started': time.perf_counter(),
+        'db_seconds': 0.0,
+        'db_queries': 0,
+        'db_rows': 0,
+        'serialize_seconds': 0.0,
+    })
+
+
+@app.before_request
+def start_request_timer():
+    request_stats()
+
 
 def get_db_connection():
     """Get database connection from environment."""
@@ -46,43 +120,621 @@ def get_db_connection():
     return psycopg2.connect(database_url, cursor_factory=RealDictCursor)
 
 
+# Connection pool settings (per gunicorn worker)
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 5))
+DB_POOL_MAX_AGE = int(os.environ.get('DB_POOL_MAX_AGE', 1800))      # seconds
+DB_POOL_CHECK_IDLE = int(os.environ.get('DB_POOL_CHECK_IDLE', 30))  # seconds
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))      # seconds
+
+# Slow-query log (see api/query_log.py); SLOW_QUERY_MS=0 disables it
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 500))
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE', 0.1))
+SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG',
+                                os.path.join(tempfile.gettempdir(), 'viriato-slow-queries.log'))
+
+slow_query_log = (SlowQueryLog(SLOW_QUERY_LOG, threshold_ms=SLOW_QUERY_MS,
+                               explain_sample=SLOW_QUERY_EXPLAIN_SAMPLE)
+                  if SLOW_QUERY_MS > 0 else None)
+
+_db_pool = None
+_db_pool_pid = None
+
+
+def get_db_pool():
+    """
+    Get the connection pool for the current process.
+
+    Pools are created lazily and keyed by PID, so each gunicorn worker
+    (including workers forked from a --preload master) gets its own
+    connections. An inherited pool is abandoned rather than closed,
+    because closing would terminate the parent's sockets.
+    """
+    global _db_pool, _db_pool_pid
+
+    pid = os.getpid()
+    if _db_pool is None or _db_pool_pid != pid:
+        _db_pool = ConnectionPool(
+            lambda: get_db_connection(),
+            minconn=DB_POOL_MIN,
+            maxconn=DB_POOL_MAX,
+            max_age=DB_POOL_MAX_AGE,
+            check_idle=DB_POOL_CHECK_IDLE,
+            timeout=DB_POOL_TIMEOUT
+        )
+        _db_pool_pid = pid
+    return _db_pool
+
+
+def install_db_pool(pool):
+    """
+    Use `pool` for this process instead of a psycopg2 ConnectionPool.
+
+    The ASGI entry point installs an asyncpg-backed pool with the same
+    interface (see api/asgi.py); None goes back to the default.
+    """
+    global _db_pool, _db_pool_pid
+
+    _db_pool = pool
+    _db_pool_pid = os.getpid() if pool is not None else None
+
+
+def close_db_pool():
+    """Close all pooled connections owned by this process."""
+    global _db_pool, _db_pool_pid
+
+    if _db_pool is not None and _db_pool_pid == os.getpid():
+        _db_pool.closeall()
+    _db_pool = None
+    _db_pool_pid = None
+
+
+def timed_cursor(conn):
+    """Cursor that feeds request metrics and the slow-query log."""
+    context = request.url_rule.rule if has_request_context() and request.url_rule else None
+    return TimedCursor(conn.cursor(), request_stats(), slow_query_log, context)
+
+
 @contextmanager
 def db_connection():
     """
-    Context manager for database connections.
+    Context manager for pooled database connections.
 
-    Automatically closes connection and cursor on exit, even if an exception occurs.
+    Checks a connection out of the worker's pool and returns it on exit
+    (rolling back any open transaction), even if an exception occurs.
+    Inside /api/batch, sub-requests share the batch's connection instead.
     Usage:
         with db_connection() as (conn, cur):
             cur.execute("SELECT ...")
             results = cur.fetchall()
     """
+    shared = g.get('batch_connection') if has_app_context() else None
+    if shared is not None:
+        cur = timed_cursor(shared)
+        try:
+            yield shared, cur
+        finally:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        return
+
+    pool = get_db_pool()
     conn = None
     cur = None
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        conn = pool.getconn()
+        cur = timed_cursor(conn)
         yield conn, cur
     finally:
         if cur:
-            cur.close()
+            try:
+                cur.close()
+            except Exception:
+                pass
         if conn:
-            conn.close()
+            pool.putconn(conn)
+
+
+def fetch_concurrently(queries):
+    """
+    Run independent read queries and return each one's rows, in order.
+
+    With the ASGI entry point's asyncpg pool they run at the same time,
+    each on its own pooled connection (AsyncpgPool.fetch_concurrently).
+    Otherwise, and inside /api/batch (whose sub-requests share one
+    connection and time budget), they run one after another. Call it
+    without holding a connection from db_connection().
+
+    Args:
+        queries: [(query, params), ...]
+    """
+    pool = get_db_pool()
+    shared = g.get('batch_connection') if has_app_context() else None
+    if shared is None and hasattr(pool, 'fetch_concurrently'):
+        stats = request_stats()
+        started = time.perf_counter()
+        results = pool.fetch_concurrently(queries)
+        if stats is not None:
+            stats['db_seconds'] += time.perf_counter() - started
+            stats['db_queries'] += len(queries)
+            stats['db_rows'] += sum(len(rows) for rows in results)
+        return results
+
+    results = []
+    with db_connection() as (conn, cur):
+        for query, params in queries:
+            cur.execute(query, params)
+            results.append(cur.fetchall())
+    return results
+
+
+# 'postgres', or 'sqlite' to serve everything from the read-only file
+# written by pipeline/export_sqlite.py (see api/sqlite_snapshot.py)
+DATA_BACKEND = os.environ.get('DATA_BACKEND', 'postgres')
+SQLITE_SNAPSHOT = os.environ.get('SQLITE_SNAPSHOT', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'api_snapshot.sqlite3'))
+
+sqlite_snapshot = SqliteSnapshot(SQLITE_SNAPSHOT) if DATA_BACKEND == 'sqlite' else None
+
+
+# Response cache settings
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+DATASET_VERSION_TTL = float(os.environ.get('DATASET_VERSION_TTL', 5))  # seconds
+
+
+def read_dataset_version():
+    """
+    Read the dataset version stamp bumped by the pipeline loaders.
+
+    Returns None if no loader has stamped the database yet. With the
+    SQLite backend, the version the snapshot file was exported from.
+    """
+    if sqlite_snapshot is not None:
+        return sqlite_snapshot.version()
+
+    with db_connection() as (conn, cur):
+        cur.execute("SELECT version, updated_at FROM dataset_version WHERE id = 1")
+        row = cur.fetchone()
+        if not row:
+            return None
+        return Version(int(row['version']), row['updated_at'])
+
+
+dataset_version = DatasetVersion(lambda: read_dataset_version(), ttl=DATASET_VERSION_TTL)
+response_cache = ResponseCache(max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+
+def reset_caches():
+    """Drop cached responses, the cached dataset version and the warm-up state."""
+    dataset_version.reset()
+    response_cache.clear()
+    search_engine.reset()
+    reset_warmup()
+
+
+def cached_response(view=None, *, key=None, daily=False):
+    """
+    Cache a view's serialized JSON body per query string and dataset version.
+
+    Only successful responses are stored. Without a version stamp in the
+    database the view runs uncached, so stale data is never served.
+    Compressed variants are built from the cached body on first request
+    for each encoding and reused afterwards.
+
+    Usable bare (@cached_response) or with options:
+        key: Callable returning the request's cache key (default: the
+             sorted query string); lets equivalent requests share an entry
+        daily: Body also depends on today's date (e.g. computed ages)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = dataset_version.get()
+            if version is None:
+                return view(*args, **kwargs)
+
+            request_key = key() if key else tuple(sorted(request.args.items(multi=True)))
+            cache_key = (request.path, request_key, version.version)
+            if daily:
+                cache_key += (date.today().isoformat(),)
+
+            encoding = negotiate(request.accept_encodings)
+            found = response_cache.get_encoded(cache_key, encoding)
+            if found is not None:
+                response = _encoded_response(*found)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                stored = response.headers.get('Content-Encoding')
+                if stored is None or stored in available_encodings():
+                    response_cache.set(cache_key, response.get_data(), version.version, encoding=stored)
+                    if stored is None and encoding is not None:
+                        # Build the compressed variant now so later requests reuse it
+                        found = response_cache.encode(cache_key, encoding)
+                        if found is not None and found[1] is not None:
+                            response.set_data(found[0])
+                            response.headers['Content-Encoding'] = found[1]
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    if view is not None:
+        return decorator(view)
+    return decorator
+
+
+def _encoded_response(body, encoding):
+    response = Response(body, mimetype='application/json')
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# Serve pipeline-built snapshots (see pipeline/build_snapshots.py)
+app.config['SNAPSHOTS_ENABLED'] = os.environ.get('SNAPSHOTS_ENABLED', '1') == '1'
+
+
+def snapshot_query_string():
+    """Canonical query string used as the api_snapshots key."""
+    return urlencode(sorted(request.args.items(multi=True)))
+
+
+def snapshot_response(view):
+    """
+    Serve a pre-rendered snapshot of this endpoint if one exists.
+
+    pipeline/build_snapshots.py stores the serialized (and gzipped) body of
+    common requests in api_snapshots, stamped with the dataset version it
+    was built from. A snapshot is only used if that version is current;
+    otherwise, or for any other query string, the view runs as usual.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not app.config['SNAPSHOTS_ENABLED']:
+            return view(*args, **kwargs)
+
+        version = dataset_version.get()
+        if version is None:
+            return view(*args, **kwargs)
+
+        gzip_ok = request.accept_encodings['gzip'] > 0
+        column = 'body_gzip' if gzip_ok else 'body'
+        # Inside /api/batch the connection is shared: a failed lookup (e.g.
+        # build_snapshots.py hasn't created api_snapshots yet) must not
+        # abort the transaction the live query then runs in
+        batched = g.get('batch_connection') is not None
+        try:
+            with db_connection() as (conn, cur):
+                if batched:
+                    cur.execute("SAVEPOINT snapshot_lookup")
+                try:
+                    cur.execute(f"""
+                        SELECT {column} AS body
+                        FROM api_snapshots
+                        WHERE path = %s AND query = %s AND version = %s
+                    """, (request.path, snapshot_query_string(), version.version))
+                    row = cur.fetchone()
+                except Exception:
+                    if batched:
+                        cur.execute("ROLLBACK TO SAVEPOINT snapshot_lookup")
+                    raise
+                if batched:
+                    cur.execute("RELEASE SAVEPOINT snapshot_lookup")
+        except Exception as e:
+            logger.debug("Snapshot lookup failed for %s: %s", request.path, e)
+            row = None
+
+        if not row or row['body'] is None:
+            return view(*args, **kwargs)
+
+        response = Response(bytes(row['body']), mimetype='application/json')
+        if gzip_ok:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['X-Snapshot'] = str(version.version)
+        return response
+
+    return wrapper
+
+
+# Cache-Control max-age per kind of endpoint (seconds)
+CACHE_MAX_AGE = int(os.environ.get('CACHE_MAX_AGE', 300))
+CACHE_MAX_AGE_SEARCH = int(os.environ.get('CACHE_MAX_AGE_SEARCH', 60))
+
+
+def conditional_response(max_age=CACHE_MAX_AGE, daily=False):
+    """
+    Add ETag / Last-Modified / Cache-Control to a read endpoint.
+
+    The ETag is derived from the dataset version and the request, so a
+    matching If-None-Match (or a fresh If-Modified-Since) is answered with
+    304 before the view runs any SQL.
+
+    Args:
+        max_age: Cache-Control max-age for successful responses
+        daily: Body also depends on today's date (e.g. computed ages)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = dataset_version.get()
+            etag = None
+            last_modified = None
+
+            if version is not None:
+                salt = (date.today().isoformat(),) if daily else ()
+                etag = make_etag(version.version, request.path,
+                                 request.args.items(multi=True), *salt)
+                if version.updated_at is not None and not daily:
+                    last_modified = version.updated_at.replace(microsecond=0)
+                    if last_modified.tzinfo is None:
+                        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+                matched = _not_modified_etag(etag, last_modified)
+                if matched:
+                    response = Response(status=304)
+                    _set_validators(response, matched, last_modified, max_age)
+                    return response
+
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified, max_age)
+            else:
+                response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        return wrapper
+    return decorator
+
+
+def _not_modified_etag(etag, last_modified):
+    """
+    Evaluate If-None-Match, falling back to If-Modified-Since (RFC 7232).
+
+    Compressed responses carry the encoding in their ETag, so any variant
+    of `etag` matches. Returns the tag to send with the 304, or None.
+    """
+    if request.if_none_match:
+        for tag in [etag] + [f"{etag}-{enc}" for enc in available_encodings()]:
+            if request.if_none_match.contains_weak(tag):
+                return tag
+        return None
+    if last_modified is not None and request.if_modified_since is not None:
+        if last_modified <= request.if_modified_since:
+            return etag
+    return None
+
+
+def _set_validators(response, etag, last_modified, max_age):
+    if etag is not None:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.vary.add('Accept-Encoding')
+
+
+# Token-bucket rate limits (see api/rate_limit.py), shared by the workers on
+# this host through RATE_LIMIT_DB; RATE_LIMIT_DB=memory keeps them per process
+RATE_LIMIT_DB = os.environ.get('RATE_LIMIT_DB',
+                               os.path.join(tempfile.gettempdir(), 'viriato-ratelimit.sqlite3'))
+READ_RATE_LIMIT = int(os.environ.get('READ_RATE_LIMIT', 0))  # Per client per minute, 0 = off
+
+rate_limit_store = MemoryBucketStore() if RATE_LIMIT_DB == 'memory' else SqliteBucketStore(RATE_LIMIT_DB)
+
+
+def client_ip():
+    """Client address, taken from X-Forwarded-For behind Render's proxy."""
+    forwarded = request.headers.get('X-Forwarded-For')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.remote_addr
+
+
+def consume_rate_limit(name, capacity, period, message='Too many requests'):
+    """
+    Take one of the client's `capacity` requests per `period` seconds
+    (token bucket) for a handler that only counts some of its requests.
+
+    capacity=0 disables the limit, and if the bucket store fails the
+    request is allowed.
+
+    Args:
+        name: Bucket namespace, so routes can share or split a budget
+
+    Returns:
+        Response or None: A 429 with a Retry-After header over the limit
+    """
+    if capacity <= 0:
+        return None
+    try:
+        allowed, retry_after = rate_limit_store.take(f"{name}:{client_ip()}", capacity, period)
+    except Exception as e:
+        logger.warning("Rate limit check failed, allowing request: %s", e)
+        return None
+
+    if allowed:
+        return None
+    wait = max(1, math.ceil(retry_after))
+    response = jsonify({'error': message, 'retry_after': wait})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(wait)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def rate_limited(name, capacity, period, message='Too many requests'):
+    """
+    Limit every request to the view with consume_rate_limit(); over the
+    limit the view doesn't run. Sub-requests of /api/batch are not limited
+    again (the batch itself is).
+    """
+    def decorator(view):
+        if capacity <= 0:
+            return view
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not request.environ.get('viriato.batch'):
+                limited = consume_rate_limit(name, capacity, period, message)
+                if limited is not None:
+                    return limited
+            return view(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+# Endpoints that keep running their own view with the SQLite backend
+SQLITE_LIVE_ENDPOINTS = {'health_check', 'readiness_check', 'get_metrics', 'search_iniciativas',
+                         'batch'}
+
+
+@app.before_request
+def serve_from_sqlite_snapshot():
+    """
+    With DATA_BACKEND=sqlite, answer read routes from the snapshot file.
+
+    Pre-rendered responses are looked up by path and canonical query
+    string; single initiatives come from the exported raw_data. Requests
+    the exporter did not render (pagination, fields=, date ranges,
+    combined deputy filters, change feeds, suggestions) get 501: the file
+    has no tables to query.
+    """
+    if (sqlite_snapshot is None or request.method != 'GET' or request.url_rule is None
+            or request.endpoint in SQLITE_LIVE_ENDPOINTS):
+        return None
+    return sqlite_snapshot_view()
+
+
+@conditional_response()
+def sqlite_snapshot_view():
+    try:
+        if request.endpoint == 'get_iniciativa':
+            body = sqlite_snapshot.iniciativa_raw(request.view_args['ini_id'])
+            if body is None:
+                return jsonify({'error': 'Not found'}), 404
+            return Response(body, mimetype='application/json')
+
+        gzip_ok = request.accept_encodings['gzip'] > 0
+        # The exporter renders /api/deputados with its filters spelled out,
+        # so /api/deputados and ?legislature=XVII find the same response
+        query = deputados_query_string() if request.endpoint == 'get_deputados' else snapshot_query_string()
+        body = sqlite_snapshot.response(request.path, query, gzipped=gzip_ok)
+    except Exception as e:
+        logger.error("SQLite snapshot lookup failed for %s: %s", request.path, e)
+        return jsonify({'error': str(e)}), 500
+
+    if body is None:
+        return jsonify({'error': 'Not available from the SQLite snapshot',
+                        'path': request.path}), 501
+
+    response = Response(body, mimetype='application/json')
+    if gzip_ok:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+# Registered before compress_response so it runs after it (Flask runs
+# after_request hooks in reverse) and sees the bytes actually sent
+@app.after_request
+def record_request_metrics(response):
+    """Record latency, DB time, serialization time, rows and size for the route."""
+    if request.environ.get('viriato.warmup'):
+        return response  # Not client traffic
+    stats = request_stats()
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    try:
+        metrics.observe('viriato_http_request_duration_seconds',
+                        time.perf_counter() - stats['started'],
+                        endpoint=endpoint, method=request.method, status=response.status_code)
+        metrics.observe('viriato_db_duration_seconds', stats['db_seconds'], endpoint=endpoint)
+        metrics.observe('viriato_serialization_duration_seconds', stats['serialize_seconds'],
+                        endpoint=endpoint)
+        metrics.inc('viriato_db_queries_total', stats['db_queries'], endpoint=endpoint)
+        metrics.inc('viriato_db_rows_fetched_total', stats['db_rows'], endpoint=endpoint)
+        if not response.is_streamed and response.content_length is not None:
+            metrics.observe('viriato_response_size_bytes', response.content_length, endpoint=endpoint)
+        metrics.flush()
+    except Exception:
+        logger.exception("Failed to record request metrics")
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """
+    Compress JSON responses the client accepts gzip/brotli for.
+
+    Cached responses arrive here already encoded (see cached_response);
+    everything else above COMPRESS_MIN_BYTES is compressed per request.
+    Encoded responses get the encoding appended to their ETag so caches
+    never confuse them with the identity body.
+    """
+    if response.status_code != 200 or response.mimetype != 'application/json':
+        return response
+
+    if ('Content-Encoding' not in response.headers and not response.is_streamed
+            and (response.content_length or 0) >= COMPRESS_MIN_BYTES):
+        encoding = negotiate(request.accept_encodings)
+        if encoding is not None:
+            response.set_data(compress(response.get_data(), encoding))
+            response.headers['Content-Encoding'] = encoding
+
+    encoding = response.headers.get('Content-Encoding')
+    if encoding is not None:
+        response.vary.add('Accept-Encoding')
+        etag, weak = response.get_etag()
+        if etag and not etag.endswith(f"-{encoding}"):
+            response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request metrics of all workers in Prometheus text format (never cached)."""
+    response = Response(metrics.render(), mimetype='text/plain')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (never cached)."""
     try:
+        if sqlite_snapshot is not None:
+            response = jsonify({
+                'status': 'ok',
+                'database': 'sqlite',
+                'snapshot': sqlite_snapshot.stats(),
+                'cache': response_cache.stats(),
+                'feedback_outbox': feedback_outbox.stats() if feedback_outbox is not None else None
+            })
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
         with db_connection() as (conn, cur):
             cur.execute("SELECT COUNT(*) as count FROM iniciativas")
             count = cur.fetchone()['count']
 
-            return jsonify({
-                'status': 'ok',
-                'database': 'connected',
-                'iniciativas_count': count
-            })
+        # Outside the block: the PostgreSQL outbox checks out its own connection
+        response = jsonify({
+            'status': 'ok',
+            'database': 'connected',
+            'iniciativas_count': count,
+            'pool': get_db_pool().stats(),
+            'cache': response_cache.stats(),
+            'feedback_outbox': feedback_outbox.stats() if feedback_outbox is not None else None
+        })
+        response.headers['Cache-Control'] = 'no-store'
+        return response
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -90,7 +742,459 @@ def health_check():
         }), 500
 
 
+# Cached requests replayed by warm_up(), as a browser would send them
+# (Accept-Encoding included, so the compressed variant is cached too)
+WARMUP_PATHS = [
+    '/api/iniciativas',
+    '/api/orgaos/summary',
+    '/api/agenda',
+    '/api/deputados',
+]
+WARMUP_RETRY_SECONDS = float(os.environ.get('WARMUP_RETRY_SECONDS', 10))
+
+_warmup_lock = threading.Lock()
+_warmup = {'ready': False, 'running': False, 'attempted_at': None, 'seconds': None, 'error': None,
+           'failures': []}
+
+
+def reset_warmup():
+    with _warmup_lock:
+        _warmup.update(ready=False, running=False, attempted_at=None, seconds=None, error=None,
+                       failures=[])
+
+
+def warm_up(close_connections=False):
+    """
+    Check that the data can be reached and load the dataset version, then
+    fill the response cache for WARMUP_PATHS and build the search index,
+    and mark this process ready.
+
+    Only reaching the data gates readiness: filling the caches is
+    best-effort, so one failing endpoint doesn't keep the others out of
+    service. Its failures are logged and listed by /api/ready.
+
+    Run once in the gunicorn master under --preload (see gunicorn.conf.py):
+    forked workers inherit the warm caches copy-on-write and start ready.
+    There, close_connections=True closes the connections opened here so
+    workers never share the master's sockets.
+
+    Returns:
+        bool: True if the process is ready
+    """
+    with _warmup_lock:
+        if _warmup['ready'] or _warmup['running']:
+            return _warmup['ready']
+        _warmup.update(running=True, attempted_at=time.monotonic())
+    return _run_warmup(close_connections)
+
+
+def _run_warmup(close_connections=False):
+    started = time.perf_counter()
+    version = None
+    error = None
+    failures = []
+    try:
+        if sqlite_snapshot is not None:
+            sqlite_snapshot.version()
+        else:
+            with db_connection() as (conn, cur):
+                cur.execute("SELECT 1")
+        version = dataset_version.get()
+    except Exception as e:
+        error = str(e)
+        logger.warning("Warm-up failed, data unreachable (will retry): %s", e)
+    else:
+        client = app.test_client()
+        for path in WARMUP_PATHS:
+            try:
+                response = client.get(path, headers={'Accept-Encoding': 'gzip, deflate, br'},
+                                      environ_overrides={'viriato.warmup': True})
+                if response.status_code != 200:
+                    failures.append(f"{path} returned {response.status_code}")
+            except Exception as e:
+                failures.append(f"{path}: {e}")
+        if version is not None and (SEARCH_BACKEND == 'memory' or sqlite_snapshot is not None):
+            try:
+                search_engine.get(version)
+            except Exception as e:
+                failures.append(f"search index: {e}")
+        for failure in failures:
+            logger.warning("Warm-up step failed: %s", failure)
+    finally:
+        if close_connections:
+            close_db_pool()
+
+    seconds = round(time.perf_counter() - started, 3)
+    with _warmup_lock:
+        _warmup.update(ready=error is None, running=False, seconds=seconds, error=error,
+                       failures=failures)
+    if error is None:
+        logger.info("Warm-up finished in %.2fs (dataset version %s, %d steps failed)", seconds,
+                    version.version if version else None, len(failures))
+    return error is None
+
+
+def ensure_warm():
+    """
+    Start warm_up() in a background thread unless this process is already
+    warm, warming up, or failed less than WARMUP_RETRY_SECONDS ago.
+
+    Returns:
+        bool: True if the process is ready
+    """
+    with _warmup_lock:
+        if _warmup['ready']:
+            return True
+        if _warmup['running']:
+            return False
+        attempted_at = _warmup['attempted_at']
+        if attempted_at is not None and time.monotonic() - attempted_at < WARMUP_RETRY_SECONDS:
+            return False
+        _warmup.update(running=True, attempted_at=time.monotonic())
+
+    threading.Thread(target=_run_warmup, name='viriato-warmup', daemon=True).start()
+    return False
+
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: 503 until this worker's warm-up has reached the data
+    (never cached). Warm-up steps that failed are listed under `failures`.
+
+    A worker that isn't warm yet starts (or retries) its warm-up here.
+    """
+    ready = ensure_warm()
+    with _warmup_lock:
+        state = {key: _warmup[key] for key in ('seconds', 'error', 'failures')}
+    response = jsonify({'status': 'ready' if ready else 'warming', **state})
+    response.status_code = 200 if ready else 503
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+# /api/iniciativas output field -> column in the query below (None = events)
+INICIATIVA_FIELDS = {
+    'IniId': 'ini_id',
+    'IniTitulo': 'title',
+    'IniTipo': 'type',
+    'IniDescTipo': 'type_description',
+    'IniNr': 'number',
+    'IniLeg': 'legislature',
+    'IniLinkTexto': 'text_link',
+    'IniEventos': None,
+    'IniAutorGruposParlamentares': 'author_groups',
+    'IniAutorOutros': 'author_others',
+    'DataInicioleg': 'start_date',
+    '_currentStatus': 'current_status',
+    '_isCompleted': 'is_completed',
+    '_summary': 'summary'
+}
+
+# Columns needed for the fields above (only the two author keys of raw_data)
+INICIATIVA_SELECT = """
+    id, ini_id, legislature, number, type, type_description,
+    title, start_date, current_status, is_completed, text_link, summary,
+    raw_data->'IniAutorGruposParlamentares' AS author_groups,
+    raw_data->'IniAutorOutros' AS author_others
+"""
+
+MAX_PAGE_SIZE = 1000
+
+
+def fetch_iniciativa_events(cur, ini_db_ids):
+    """
+    Batch fetch events for the given initiatives (avoids N+1 queries).
+
+    Returns dict of initiative database ID -> list of events in
+    /api/iniciativas format.
+    """
+    if not ini_db_ids:
+        return {}
+
+    cur.execute("""
+        SELECT iniciativa_id, phase_name, event_date, observations
+        FROM iniciativa_events
+        WHERE iniciativa_id = ANY(%s)
+        ORDER BY iniciativa_id, event_date
+    """, (ini_db_ids,))
+
+    events_by_ini_db_id = {}
+    for event in cur.fetchall():
+        ini_db_id = event['iniciativa_id']
+        if ini_db_id not in events_by_ini_db_id:
+            events_by_ini_db_id[ini_db_id] = []
+        events_by_ini_db_id[ini_db_id].append({
+            'Fase': event['phase_name'],
+            'DataFase': event['event_date'],
+            'DescFase': event['observations']
+        })
+    return events_by_ini_db_id
+
+
+def serialize_iniciativa(ini, events_by_ini_db_id, fields=None):
+    """Build the frontend representation of an iniciativa row."""
+    data = {}
+    for field in fields or INICIATIVA_FIELDS:
+        column = INICIATIVA_FIELDS[field]
+        if column is None:
+            data[field] = events_by_ini_db_id.get(ini['id'], [])
+        else:
+            data[field] = ini[column]  # dates are encoded by api.encoding
+    return data
+
+
+def parse_fields(value):
+    """Parse a fields= parameter into a list of output fields (None = all)."""
+    if not value:
+        return None
+
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in INICIATIVA_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def encode_cursor(start_date, db_id):
+    """Opaque keyset cursor for (start_date, id)."""
+    payload = json.dumps([start_date.isoformat() if start_date else None, db_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(value):
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        start_date, db_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if start_date is not None:
+            start_date = date.fromisoformat(start_date)
+        return start_date, int(db_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+CHANGES_DEFAULT_LIMIT = 500
+
+
+def encode_change_token(position):
+    """Opaque change feed token for ((updated_at, id), (deleted_at, id))."""
+    (changed_at, changed_id), (deleted_at, deleted_id) = position
+    payload = json.dumps([
+        changed_at.isoformat() if changed_at else None, changed_id,
+        deleted_at.isoformat() if deleted_at else None, deleted_id,
+    ])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def parse_change_since(value):
+    """
+    Parse since= into a feed position.
+
+    Accepts an ISO 8601 timestamp (changes strictly after it) or the
+    `next` token of a previous response. Raises ValueError otherwise.
+    """
+    try:
+        since = datetime.fromisoformat(value)
+        return (since, None), (since, None)
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        changed_at, changed_id, deleted_at, deleted_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode('ascii')))
+        return ((datetime.fromisoformat(changed_at) if changed_at else None, changed_id),
+                (datetime.fromisoformat(deleted_at) if deleted_at else None, deleted_id))
+    except Exception:
+        raise ValueError("since must be an ISO 8601 timestamp or the next token of a previous response")
+
+
+def _after(column_at, column_id, position):
+    """SQL condition (and params) for rows past a keyset position."""
+    at, row_id = position
+    if at is None:
+        return "TRUE", []
+    if row_id is None:
+        return f"{column_at} > %s", [at]
+    return f"({column_at}, {column_id}) > (%s, %s)", [at, row_id]
+
+
+def fetch_changes(source, alias, columns, tombstone_table, since, limit):
+    """
+    Read one page of a change feed (changed rows and deletions are
+    independent queries, run concurrently where the pool allows).
+
+    Args:
+        source: FROM clause; `alias` names the table whose updated_at is tracked
+        columns: Select list for changed rows
+        tombstone_table: change_tombstones.table_name of the tracked table
+        since: Position from parse_change_since()
+
+    Returns:
+        tuple: (changed rows, deleted record keys, next position, has_more)
+    """
+    changed_since, deleted_since = since
+
+    changed_condition, changed_params = _after(f"{alias}.updated_at", f"{alias}.id", changed_since)
+    deleted_condition, deleted_params = _after("deleted_at", "id", deleted_since)
+    changed, deleted = fetch_concurrently([
+        (f"""
+            SELECT {columns}, {alias}.updated_at AS _changed_at, {alias}.id AS _changed_id
+            FROM {source}
+            WHERE {changed_condition}
+            ORDER BY {alias}.updated_at, {alias}.id
+            LIMIT %s
+        """, changed_params + [limit + 1]),
+        (f"""
+            SELECT id, record_key, deleted_at
+            FROM change_tombstones
+            WHERE table_name = %s AND {deleted_condition}
+            ORDER BY deleted_at, id
+            LIMIT %s
+        """, [tombstone_table] + deleted_params + [limit + 1]),
+    ])
+
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    if changed:
+        changed_since = (changed[-1]['_changed_at'], changed[-1]['_changed_id'])
+    if deleted:
+        deleted_since = (deleted[-1]['deleted_at'], deleted[-1]['id'])
+
+    return changed, [row['record_key'] for row in deleted], (changed_since, deleted_since), has_more
+
+
+def change_feed_args():
+    """Parse since= and limit= for the change feed endpoints. Raises ValueError."""
+    since = request.args.get('since')
+    if not since:
+        raise ValueError("since is required")
+    limit = request.args.get('limit', CHANGES_DEFAULT_LIMIT, type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return parse_change_since(since), limit
+
+
+def change_feed_response(changes, deleted, position, has_more):
+    return jsonify({
+        'changes': changes,
+        'deleted': deleted,
+        'next': encode_change_token(position),
+        'has_more': has_more
+    })
+
+
+STREAM_ITERSIZE = int(os.environ.get('STREAM_ITERSIZE', 500))    # rows per server-side fetch
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def wants_stream():
+    """True if the client asked for a streamed response (?stream=1)."""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def server_side_cursor(conn, name):
+    """Named (server-side) cursor that fetches STREAM_ITERSIZE rows at a time."""
+    cur = conn.cursor(name=name)
+    cur.itersize = STREAM_ITERSIZE
+    return cur
+
+
+def stream_json_array(items):
+    """
+    Serialize an iterable as a JSON array, yielding ~64KB chunks.
+
+    Only one chunk is held in memory at a time, so memory use does not
+    grow with the number of items.
+    """
+    buffer = [b'[']
+    size = 1
+    first = True
+    for item in items:
+        piece = encode_json(item) if first else b',' + encode_json(item)
+        first = False
+        buffer.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+def streamed_json_response(generate):
+    """
+    Wrap a generator of JSON chunks in a streaming response.
+
+    Errors after the first chunk can no longer change the status code, so
+    they are logged and the body is cut short (the client sees invalid JSON).
+    """
+    def guarded():
+        try:
+            yield from generate()
+        except Exception:
+            logger.exception("Error while streaming %s", request.path)
+
+    return Response(stream_with_context(guarded()), mimetype='application/json')
+
+
+def stream_iniciativas(legislature, fields):
+    """
+    Yield /api/iniciativas rows from a server-side cursor.
+
+    Events come from a second server-side cursor in the same order, so each
+    initiative's events are merged in as its row is read instead of being
+    grouped in a dict for the whole result.
+    """
+    where = ""
+    params = []
+    if legislature:
+        where = " WHERE i.legislature = %s"
+        params.append(legislature)
+    order = "i.start_date DESC NULLS LAST, i.id DESC"
+
+    with_events = fields is None or 'IniEventos' in fields
+
+    with db_connection() as (conn, cur):
+        ini_cur = server_side_cursor(conn, 'stream_iniciativas')
+        ini_cur.execute(f"SELECT {INICIATIVA_SELECT} FROM iniciativas i{where} ORDER BY {order}", params)
+
+        events = iter(())
+        if with_events:
+            events_cur = server_side_cursor(conn, 'stream_iniciativa_events')
+            events_cur.execute(f"""
+                SELECT e.iniciativa_id, e.phase_name, e.event_date, e.observations
+                FROM iniciativa_events e
+                JOIN iniciativas i ON i.id = e.iniciativa_id{where}
+                ORDER BY {order}, e.event_date
+            """, params)
+            events = iter(events_cur)
+
+        pending = next(events, None)
+        for ini in ini_cur:
+            ini_events = []
+            while pending is not None and pending['iniciativa_id'] == ini['id']:
+                ini_events.append({
+                    'Fase': pending['phase_name'],
+                    'DataFase': pending['event_date'],
+                    'DescFase': pending['observations']
+                })
+                pending = next(events, None)
+
+            try:
+                yield serialize_iniciativa(ini, {ini['id']: ini_events}, fields)
+            except Exception as e:
+                logger.warning("Error processing iniciativa %s: %s", ini['ini_id'], e)
+
+
 @app.route('/api/iniciativas', methods=['GET'])
+@rate_limited('read', READ_RATE_LIMIT, 60)
+@conditional_response()
+@cached_response
+@snapshot_response
 def get_iniciativas():
     """
     Get all iniciativas with their events.
@@ -98,6 +1202,16 @@ def get_iniciativas():
     Query parameters:
         legislature - Filter by legislature (e.g. XIV, XV, XVI, XVII)
                      If not specified, returns all legislatures
+        fields - Comma-separated output fields (e.g. IniId,IniTitulo,_currentStatus)
+                 Events are only queried if IniEventos is requested
+        limit - Page size (max 1000). Without it, all rows are returned
+        cursor - Value of X-Next-Cursor from the previous page
+        stream - If 1, stream the full result from server-side cursors
+                 (constant memory; can't be combined with limit/cursor)
+
+    Results are ordered newest first (start_date DESC, then id DESC).
+    When paginating, the next page is advertised in the X-Next-Cursor
+    and Link headers; both are absent on the last page.
 
     Returns data in format compatible with existing frontend:
     [
@@ -113,84 +1227,82 @@ def get_iniciativas():
     ]
     """
     try:
-        with db_connection() as (conn, cur):
-            # Get optional legislature filter
-            legislature = request.args.get('legislature')
+        legislature = request.args.get('legislature')
+        fields = parse_fields(request.args.get('fields'))
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        if cursor:
+            cursor = decode_cursor(cursor)
+            limit = limit or MAX_PAGE_SIZE
+        if wants_stream() and limit:
+            raise ValueError("stream can't be combined with limit or cursor")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if wants_stream():
+        return streamed_json_response(
+            lambda: stream_json_array(stream_iniciativas(legislature, fields)))
 
-            # Build query with optional filter
-            query = """
-                SELECT
-                    id, ini_id, legislature, number, type, type_description,
-                    title, author_type, author_name, start_date, end_date,
-                    current_status, is_completed, text_link, raw_data, summary
-                FROM iniciativas
-            """
+    try:
+        with db_connection() as (conn, cur):
+            # Build query with optional filter and keyset position
+            query = f"SELECT {INICIATIVA_SELECT} FROM iniciativas WHERE 1=1"
             params = []
 
             if legislature:
-                query += " WHERE legislature = %s"
+                query += " AND legislature = %s"
                 params.append(legislature)
 
-            query += " ORDER BY start_date DESC"
+            if cursor:
+                cursor_date, cursor_id = cursor
+                if cursor_date is None:
+                    query += " AND start_date IS NULL AND id < %s"
+                    params.append(cursor_id)
+                else:
+                    query += " AND ((start_date, id) < (%s, %s) OR start_date IS NULL)"
+                    params.extend([cursor_date, cursor_id])
+
+            query += " ORDER BY start_date DESC NULLS LAST, id DESC"
+
+            if limit:
+                # One extra row tells us whether there is a next page
+                query += " LIMIT %s"
+                params.append(limit + 1)
 
-            # Get iniciativas
             cur.execute(query, params)
             iniciativas = cur.fetchall()
 
-            # Get all initiative database IDs for batch event query
-            ini_db_ids = [ini['id'] for ini in iniciativas]
+            next_cursor = None
+            if limit and len(iniciativas) > limit:
+                iniciativas = iniciativas[:limit]
+                last = iniciativas[-1]
+                next_cursor = encode_cursor(last['start_date'], last['id'])
 
-            # Batch fetch all events (avoids N+1 query problem)
-            events_query = """
-                SELECT iniciativa_id, phase_name, event_date, observations
-                FROM iniciativa_events
-                WHERE iniciativa_id = ANY(%s)
-                ORDER BY iniciativa_id, event_date
-            """
-            cur.execute(events_query, (ini_db_ids,))
-            all_events = cur.fetchall()
-
-            # Group events by initiative database ID
+            # Skip the events query entirely unless events were requested
             events_by_ini_db_id = {}
-            for event in all_events:
-                ini_db_id = event['iniciativa_id']
-                if ini_db_id not in events_by_ini_db_id:
-                    events_by_ini_db_id[ini_db_id] = []
-                events_by_ini_db_id[ini_db_id].append({
-                    'Fase': event['phase_name'],
-                    'DataFase': event['event_date'].isoformat() if event['event_date'] else None,
-                    'DescFase': event['observations']
-                })
+            if fields is None or 'IniEventos' in fields:
+                events_by_ini_db_id = fetch_iniciativa_events(
+                    cur, [ini['id'] for ini in iniciativas])
 
             # Build response using normalized columns (no raw_data needed!)
-            # This reduces payload size by ~90% and uses single batch query for events
             result = []
             for ini in iniciativas:
                 try:
-                    raw_data = ini['raw_data'] or {}
-                    minimal_data = {
-                        'IniId': ini['ini_id'],
-                        'IniTitulo': ini['title'],
-                        'IniTipo': ini['type'],
-                        'IniDescTipo': ini['type_description'],
-                        'IniNr': ini['number'],
-                        'IniLeg': ini['legislature'],
-                        'IniLinkTexto': ini['text_link'],
-                        'IniEventos': events_by_ini_db_id.get(ini['id'], []),
-                        'IniAutorGruposParlamentares': raw_data.get('IniAutorGruposParlamentares'),
-                        'IniAutorOutros': raw_data.get('IniAutorOutros'),
-                        'DataInicioleg': ini['start_date'].isoformat() if ini['start_date'] else None,
-                        '_currentStatus': ini['current_status'],
-                        '_isCompleted': ini['is_completed'],
-                        '_summary': ini['summary']
-                    }
-
-                    result.append(minimal_data)
+                    result.append(serialize_iniciativa(ini, events_by_ini_db_id, fields))
                 except Exception as e:
                     logger.warning("Error processing iniciativa %s: %s", ini['ini_id'], e)
                     continue
 
-            return jsonify(result)
+            response = jsonify(result)
+            if next_cursor:
+                next_args = request.args.to_dict()
+                next_args['cursor'] = next_cursor
+                response.headers['X-Next-Cursor'] = next_cursor
+                response.headers['Link'] = f'<{request.base_url}?{urlencode(next_args)}>; rel="next"'
+            return response
 
     except Exception as e:
         logger.exception("Error fetching iniciativas")
@@ -198,6 +1310,7 @@ def get_iniciativas():
 
 
 @app.route('/api/iniciativas/<ini_id>', methods=['GET'])
+@conditional_response()
 def get_iniciativa(ini_id):
     """Get single iniciativa by ID."""
     try:
@@ -222,60 +1335,125 @@ def get_iniciativa(ini_id):
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/iniciativas/changes', methods=['GET'])
+@conditional_response()
+@cached_response
+def get_iniciativas_changes():
+    """
+    Initiatives changed or deleted since a point in time.
+
+    Query parameters:
+        since - ISO 8601 timestamp, or `next` from the previous response
+        limit - Max changes and max deletions per page (default 500, max 1000)
+
+    Returns:
+    {
+        "changes": [...],      # same format as /api/iniciativas
+        "deleted": ["315506", ...],
+        "next": "...",         # pass as since= on the next poll
+        "has_more": false      # true if another page is already available
+    }
+    """
+    try:
+        since, limit = change_feed_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        iniciativas, deleted, position, has_more = fetch_changes(
+            'iniciativas', 'iniciativas', INICIATIVA_SELECT, 'iniciativas', since, limit)
+
+        with db_connection() as (conn, cur):
+            events_by_ini_db_id = fetch_iniciativa_events(cur, [ini['id'] for ini in iniciativas])
+            changes = [serialize_iniciativa(ini, events_by_ini_db_id) for ini in iniciativas]
+
+            return change_feed_response(changes, deleted, position, has_more)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/phase-counts', methods=['GET'])
+@conditional_response()
 def get_phase_counts():
     """
     Get counts of iniciativas by current phase/status.
 
+    Query parameters:
+        legislature - Filter by legislature (optional)
+
     Returns: [{"phase": "Entrada", "count": 808}, ...]
     """
     try:
-        with db_connection() as (conn, cur):
-            # Get phase counts from events table
-            cur.execute("""
-                SELECT
-                    phase_name as phase,
-                    COUNT(DISTINCT iniciativa_id) as count
-                FROM iniciativa_events
-                GROUP BY phase_name
-                ORDER BY count DESC
-            """)
+        legislature = request.args.get('legislature')
 
-            phases = [{'phase': row['phase'], 'count': row['count']}
-                      for row in cur.fetchall()]
+        with db_connection() as (conn, cur):
+            # Precomputed at load time (pipeline/load_to_postgres.py). An
+            # initiative belongs to one legislature, so summing the
+            # per-legislature distinct counts gives the overall count.
+            if legislature:
+                cur.execute("""
+                    SELECT phase_name AS phase, iniciativas_count AS count
+                    FROM phase_histogram
+                    WHERE legislature = %s
+                    ORDER BY count DESC
+                """, (legislature,))
+            else:
+                cur.execute("""
+                    SELECT phase_name AS phase, SUM(iniciativas_count)::int AS count
+                    FROM phase_histogram
+                    GROUP BY phase_name
+                    ORDER BY count DESC
+                """)
 
-            return jsonify(phases)
+            return jsonify(cur.fetchall())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/agenda', methods=['GET'])
+@conditional_response()
+@cached_response
+@snapshot_response
 def get_agenda():
     """
     Get agenda events.
 
+    Query parameters:
+        start_date, end_date - Optional date range (YYYY-MM-DD)
+        stream - If 1, stream rows from a server-side cursor
+
     Returns data in format compatible with existing frontend.
     """
-    try:
-        with db_connection() as (conn, cur):
-            # Optional date filters
-            start_date = request.args.get('start_date')
-            end_date = request.args.get('end_date')
+    # Optional date filters
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
 
-            query = "SELECT raw_data FROM agenda_events WHERE 1=1"
-            params = []
+    query = "SELECT raw_data FROM agenda_events WHERE 1=1"
+    params = []
+
+    if start_date:
+        query += " AND start_date >= %s"
+        params.append(start_date)
 
-            if start_date:
-                query += " AND start_date >= %s"
-                params.append(start_date)
+    if end_date:
+        query += " AND start_date <= %s"
+        params.append(end_date)
 
-            if end_date:
-                query += " AND start_date <= %s"
-                params.append(end_date)
+    query += " ORDER BY start_date, start_time"
 
-            query += " ORDER BY start_date, start_time"
+    if wants_stream():
+        def generate():
+            with db_connection() as (conn, cur):
+                agenda_cur = server_side_cursor(conn, 'stream_agenda')
+                agenda_cur.execute(query, params)
+                yield from stream_json_array(row['raw_data'] for row in agenda_cur)
 
+        return streamed_json_response(generate)
+
+    try:
+        with db_connection() as (conn, cur):
             cur.execute(query, params)
 
             # raw_data is already a dict (JSONB)
@@ -287,7 +1465,34 @@ def get_agenda():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/agenda/changes', methods=['GET'])
+@conditional_response()
+@cached_response
+def get_agenda_changes():
+    """
+    Agenda events changed or deleted since a point in time.
+
+    Same parameters and envelope as /api/iniciativas/changes; changes are
+    in /api/agenda format and deletions are event Ids.
+    """
+    try:
+        since, limit = change_feed_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        rows, deleted, position, has_more = fetch_changes(
+            'agenda_events', 'agenda_events', 'raw_data', 'agenda_events', since, limit)
+
+        return change_feed_response([row['raw_data'] for row in rows],
+                                    [int(key) for key in deleted], position, has_more)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/agenda/<int:event_id>/initiatives', methods=['GET'])
+@conditional_response()
 def get_agenda_initiatives(event_id):
     """
     Get all initiatives linked to an agenda event.
@@ -381,37 +1586,27 @@ def get_agenda_initiatives(event_id):
 
 
 @app.route('/api/legislatures', methods=['GET'])
+@conditional_response()
 def get_legislatures():
     """Get list of available legislatures with counts."""
     try:
         with db_connection() as (conn, cur):
+            # Precomputed by pipeline/load_to_postgres.py (migration 007)
             cur.execute("""
-                SELECT
-                    legislature,
-                    COUNT(*) as count,
-                    MIN(start_date) as earliest_date,
-                    MAX(start_date) as latest_date
-                FROM iniciativas
-                GROUP BY legislature
+                SELECT legislature, count, earliest_date, latest_date
+                FROM mv_iniciativa_stats
+                WHERE dimension = 'total' AND legislature <> 'all'
                 ORDER BY legislature DESC
             """)
 
-            legislatures = []
-            for row in cur.fetchall():
-                legislatures.append({
-                    'legislature': row['legislature'],
-                    'count': row['count'],
-                    'earliest_date': row['earliest_date'].isoformat() if row['earliest_date'] else None,
-                    'latest_date': row['latest_date'].isoformat() if row['latest_date'] else None
-                })
-
-            return jsonify(legislatures)
+            return jsonify(cur.fetchall())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/stats', methods=['GET'])
+@conditional_response()
 def get_stats():
     """
     Get overall statistics.
@@ -424,59 +1619,43 @@ def get_stats():
             # Get optional legislature filter
             legislature = request.args.get('legislature')
 
-            stats = {}
-
-            # Build WHERE clause
-            where_clause = ""
-            params = []
-            if legislature:
-                where_clause = " WHERE legislature = %s"
-                params.append(legislature)
+            # One lookup in the precomputed stats (migration 007): the
+            # requested scope, plus per-legislature totals when unfiltered
+            cur.execute("""
+                SELECT legislature, dimension, value, count, completed
+                FROM mv_iniciativa_stats
+                WHERE legislature = %s
+                   OR dimension = 'agenda_events'
+                   OR (%s AND dimension = 'total')
+                ORDER BY count DESC
+            """, (legislature or 'all', not legislature))
 
-            # Total iniciativas
-            cur.execute(f"SELECT COUNT(*) as count FROM iniciativas{where_clause}", params)
-            stats['total'] = cur.fetchone()['count']
+            stats = {'total': 0, 'completed': 0}
+            if not legislature:
+                stats['by_legislature'] = []
+            by_type = []
+            by_status = []
+            agenda_events = 0
 
-            # Completed
-            cur.execute(f"SELECT COUNT(*) as count FROM iniciativas{where_clause} {'AND' if legislature else 'WHERE'} is_completed = TRUE",
-                       params + [] if not legislature else params)
-            stats['completed'] = cur.fetchone()['count']
+            scope = legislature or 'all'
+            for row in cur.fetchall():
+                if row['dimension'] == 'agenda_events':
+                    agenda_events = row['count']
+                elif row['dimension'] == 'total' and row['legislature'] == scope:
+                    stats['total'] = row['count']
+                    stats['completed'] = row['completed']
+                elif row['dimension'] == 'total':
+                    stats['by_legislature'].append({'legislature': row['legislature'], 'count': row['count']})
+                elif row['dimension'] == 'type':
+                    by_type.append({'type': row['value'] or None, 'count': row['count']})
+                elif row['dimension'] == 'status':
+                    by_status.append({'status': row['value'] or None, 'count': row['count']})
 
-            # By legislature (only if not filtered)
             if not legislature:
-                cur.execute("""
-                    SELECT legislature, COUNT(*) as count
-                    FROM iniciativas
-                    GROUP BY legislature
-                    ORDER BY legislature DESC
-                """)
-                stats['by_legislature'] = [{'legislature': row['legislature'], 'count': row['count']}
-                                           for row in cur.fetchall()]
-
-            # By type
-            cur.execute(f"""
-                SELECT type_description, COUNT(*) as count
-                FROM iniciativas{where_clause}
-                GROUP BY type_description
-                ORDER BY count DESC
-            """, params)
-            stats['by_type'] = [{'type': row['type_description'], 'count': row['count']}
-                               for row in cur.fetchall()]
-
-            # By status
-            cur.execute(f"""
-                SELECT current_status, COUNT(*) as count
-                FROM iniciativas{where_clause}
-                GROUP BY current_status
-                ORDER BY count DESC
-                LIMIT 10
-            """, params)
-            stats['by_status'] = [{'status': row['current_status'], 'count': row['count']}
-                                 for row in cur.fetchall()]
-
-            # Agenda count (no filter for agenda)
-            cur.execute("SELECT COUNT(*) as count FROM agenda_events")
-            stats['agenda_events'] = cur.fetchone()['count']
+                stats['by_legislature'].sort(key=lambda x: x['legislature'], reverse=True)
+            stats['by_type'] = by_type
+            stats['by_status'] = by_status[:10]
+            stats['agenda_events'] = agenda_events
 
             return jsonify(stats)
 
@@ -484,7 +1663,55 @@ def get_stats():
         return jsonify({'error': str(e)}), 500
 
 
+# 'postgres' (full-text search in the database) or 'memory' (api.search_index)
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'postgres')
+
+
+def load_search_documents():
+    """Load every iniciativa, pre-encoded, for the in-memory search index."""
+    if sqlite_snapshot is not None:
+        return sqlite_snapshot.search_documents()
+
+    with db_connection() as (conn, cur):
+        cur.execute(f"SELECT {INICIATIVA_SELECT} FROM iniciativas ORDER BY id")
+        iniciativas = cur.fetchall()
+        events_by_ini_db_id = fetch_iniciativa_events(cur, [ini['id'] for ini in iniciativas])
+
+    return [{
+        'title': ini['title'],
+        'summary': ini['summary'],
+        'legislature': ini['legislature'],
+        'body': encode_json(serialize_iniciativa(ini, events_by_ini_db_id)),
+    } for ini in iniciativas]
+
+
+search_engine = SearchEngine(load_search_documents)
+
+
+def search_in_memory(query, limit, legislature):
+    """
+    Run a search against the in-memory index.
+
+    Returns None when the index can't be used (no dataset version stamp to
+    tell when it goes stale, or the build failed), so the caller falls
+    back to the database.
+    """
+    version = dataset_version.get()
+    if version is None:
+        return None
+    try:
+        index = search_engine.get(version)
+    except Exception as e:
+        logger.error("Search index build failed, using database search: %s", e)
+        return None
+
+    bodies = index.search(query, limit=limit, legislature=legislature)
+    return Response(b'[' + b','.join(bodies) + b']', mimetype='application/json')
+
+
 @app.route('/api/search', methods=['GET'])
+@rate_limited('read', READ_RATE_LIMIT, 60)
+@conditional_response(max_age=CACHE_MAX_AGE_SEARCH)
 def search_iniciativas():
     """
     Full-text search on iniciativas titles and summaries.
@@ -503,21 +1730,23 @@ def search_iniciativas():
         if not query:
             return jsonify([])
 
+        if SEARCH_BACKEND == 'memory' or sqlite_snapshot is not None:
+            response = search_in_memory(query, limit, legislature)
+            if response is not None:
+                return response
+            if sqlite_snapshot is not None:
+                return jsonify({'error': 'Search index unavailable'}), 503
+
         with db_connection() as (conn, cur):
-            # Search in both title and summary using OR (allows index usage)
-            # Title matches ranked 2x higher than summary matches
-            sql_query = """
+            # Stored weighted vector (title = A, summary = B) with one GIN
+            # index (migration 009); ts_rank_cd ranks title hits higher
+            sql_query = f"""
                 SELECT
-                    id, ini_id, legislature, title, type, type_description, number,
-                    text_link, start_date, current_status, is_completed, summary, raw_data,
-                    GREATEST(
-                        ts_rank(to_tsvector('portuguese', COALESCE(title, '')), query) * 2,
-                        ts_rank(to_tsvector('portuguese', COALESCE(summary, '')), query)
-                    ) as rank
+                    {INICIATIVA_SELECT},
+                    ts_rank_cd(search_vector, query) as rank
                 FROM iniciativas,
                      to_tsquery('portuguese', %s) as query
-                WHERE (to_tsvector('portuguese', title) @@ query
-                   OR to_tsvector('portuguese', COALESCE(summary, '')) @@ query)
+                WHERE search_vector @@ query
             """
             params = [query]
 
@@ -537,53 +1766,14 @@ def search_iniciativas():
             if not iniciativas:
                 return jsonify([])
 
-            # Get all initiative database IDs for batch event query
-            ini_db_ids = [ini['id'] for ini in iniciativas]
-
-            # Batch fetch all events
-            events_query = """
-                SELECT iniciativa_id, phase_name, event_date, observations
-                FROM iniciativa_events
-                WHERE iniciativa_id = ANY(%s)
-                ORDER BY iniciativa_id, event_date
-            """
-            cur.execute(events_query, (ini_db_ids,))
-            all_events = cur.fetchall()
-
-            # Group events by initiative database ID
-            events_by_ini_db_id = {}
-            for event in all_events:
-                ini_db_id = event['iniciativa_id']
-                if ini_db_id not in events_by_ini_db_id:
-                    events_by_ini_db_id[ini_db_id] = []
-                events_by_ini_db_id[ini_db_id].append({
-                    'Fase': event['phase_name'],
-                    'DataFase': event['event_date'].isoformat() if event['event_date'] else None,
-                    'DescFase': event['observations']
-                })
+            events_by_ini_db_id = fetch_iniciativa_events(
+                cur, [ini['id'] for ini in iniciativas])
 
             # Build response in same format as /api/iniciativas
             result = []
             for ini in iniciativas:
                 try:
-                    raw_data = ini['raw_data'] or {}
-                    minimal_data = {
-                        'IniId': ini['ini_id'],
-                        'IniTitulo': ini['title'],
-                        'IniTipo': ini['type'],
-                        'IniDescTipo': ini['type_description'],
-                        'IniNr': ini['number'],
-                        'IniLeg': ini['legislature'],
-                        'IniLinkTexto': ini['text_link'],
-                        'IniEventos': events_by_ini_db_id.get(ini['id'], []),
-                        'IniAutorGruposParlamentares': raw_data.get('IniAutorGruposParlamentares'),
-                        'IniAutorOutros': raw_data.get('IniAutorOutros'),
-                        'DataInicioleg': ini['start_date'].isoformat() if ini['start_date'] else None,
-                        '_currentStatus': ini['current_status'],
-                        '_isCompleted': ini['is_completed'],
-                        '_summary': ini['summary']
-                    }
-                    result.append(minimal_data)
+                    result.append(serialize_iniciativa(ini, events_by_ini_db_id))
                 except Exception as e:
                     logger.warning("Error processing search result %s: %s", ini['ini_id'], e)
                     continue
@@ -594,7 +1784,92 @@ def search_iniciativas():
         return jsonify({'error': str(e)}), 500
 
 
+SUGGEST_MIN_CHARS = 2
+SUGGEST_DEFAULT_LIMIT = 5
+SUGGEST_MAX_LIMIT = 20
+
+# Top matches per kind in one round-trip. Names matching at the start rank
+# first, then by trigram similarity (pg_trgm, installed by load_to_postgres.py
+# from migrations/010_suggest_trigram_indexes.sql); committees and deputies
+# exist once per legislature, so only the most recent row per name is kept.
+SUGGEST_QUERY = """
+    SELECT
+        (SELECT COALESCE(json_agg(i), '[]'::json) FROM (
+            SELECT ini_id AS id, title, legislature
+            FROM iniciativas
+            WHERE title ILIKE %(pattern)s
+            ORDER BY title ILIKE %(prefix)s DESC, similarity(title, %(q)s) DESC, start_date DESC NULLS LAST
+            LIMIT %(limit)s
+        ) i) AS iniciativas,
+        (SELECT COALESCE(json_agg(o), '[]'::json) FROM (
+            SELECT org_id AS id, name, acronym FROM (
+                SELECT DISTINCT ON (name) org_id, name, acronym, legislature
+                FROM orgaos
+                WHERE name ILIKE %(pattern)s
+                ORDER BY name, legislature DESC
+            ) latest
+            ORDER BY name ILIKE %(prefix)s DESC, similarity(name, %(q)s) DESC
+            LIMIT %(limit)s
+        ) o) AS orgaos,
+        (SELECT COALESCE(json_agg(d), '[]'::json) FROM (
+            SELECT dep_id AS id, name, party FROM (
+                SELECT DISTINCT ON (name) dep_id, name, party, legislature
+                FROM deputados
+                WHERE name ILIKE %(pattern)s
+                ORDER BY name, legislature DESC
+            ) latest
+            ORDER BY name ILIKE %(prefix)s DESC, similarity(name, %(q)s) DESC
+            LIMIT %(limit)s
+        ) d) AS deputados
+"""
+
+
+def escape_like(value):
+    """Escape LIKE/ILIKE wildcards so user input matches literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+@app.route('/api/search/suggest', methods=['GET'])
+@conditional_response(max_age=CACHE_MAX_AGE_SEARCH)
+@cached_response
+def search_suggest():
+    """
+    Typeahead suggestions for the search box.
+
+    Query params:
+        q - typed text (at least 2 characters)
+        limit - max suggestions per kind (default 5, max 20)
+
+    Returns:
+        {"iniciativas": [{"id", "title", "legislature"}],
+         "orgaos": [{"id", "name", "acronym"}],
+         "deputados": [{"id", "name", "party"}]}
+    """
+    q = request.args.get('q', '').strip()
+    limit = request.args.get('limit', SUGGEST_DEFAULT_LIMIT, type=int)
+    if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+        return jsonify({'error': f"limit must be between 1 and {SUGGEST_MAX_LIMIT}"}), 400
+
+    if len(q) < SUGGEST_MIN_CHARS:
+        return jsonify({'iniciativas': [], 'orgaos': [], 'deputados': []})
+
+    try:
+        with db_connection() as (conn, cur):
+            escaped = escape_like(q)
+            cur.execute(SUGGEST_QUERY, {
+                'q': q,
+                'pattern': f"%{escaped}%",
+                'prefix': f"{escaped}%",
+                'limit': limit
+            })
+            return jsonify(cur.fetchone())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/orgaos', methods=['GET'])
+@conditional_response()
 def get_orgaos():
     """
     Get all parliamentary bodies (committees, working groups, etc.)
@@ -646,6 +1921,7 @@ def get_orgaos():
 
 
 @app.route('/api/orgaos/<int:org_id>', methods=['GET'])
+@conditional_response()
 def get_orgao(org_id):
     """
     Get a single parliamentary body with its members and party breakdown.
@@ -660,81 +1936,44 @@ def get_orgao(org_id):
                 FROM orgaos
                 WHERE org_id = %s
             """, (org_id,))
-
             row = cur.fetchone()
-            if not row:
-                return jsonify({'error': 'Not found'}), 404
 
-            db_id = row['id']
+        if not row:
+            return jsonify({'error': 'Not found'}), 404
 
-            orgao = {
-                'id': row['id'],
-                'org_id': row['org_id'],
-                'legislature': row['legislature'],
-                'name': row['name'],
-                'acronym': row['acronym'],
-                'type': row['org_type'],
-                'number': row['number']
-            }
+        db_id = row['id']
 
-            # Get members
-            cur.execute("""
+        orgao = {
+            'id': row['id'],
+            'org_id': row['org_id'],
+            'legislature': row['legislature'],
+            'name': row['name'],
+            'acronym': row['acronym'],
+            'type': row['org_type'],
+            'number': row['number']
+        }
+
+        # Members, agenda events (linked at load time, see
+        # pipeline/orgao_links.py) and initiatives linked through
+        # iniciativa_comissao don't depend on each other
+        member_rows, agenda_rows, initiative_rows = fetch_concurrently([
+            ("""
                 SELECT dep_id, deputy_name, party, role, member_type
                 FROM orgao_membros
                 WHERE orgao_id = %s
                 ORDER BY
                     CASE WHEN role IS NOT NULL THEN 0 ELSE 1 END,
                     party, deputy_name
-            """, (db_id,))
-
-            members = []
-            party_counts = {}
-
-            for row in cur.fetchall():
-                party = row['party'] or 'Sem partido'
-                party_counts[party] = party_counts.get(party, 0) + 1
-
-                members.append({
-                    'dep_id': row['dep_id'],
-                    'name': row['deputy_name'],
-                    'party': party,
-                    'role': row['role'],
-                    'member_type': row['member_type']
-                })
-
-            orgao['members'] = members
-            orgao['party_breakdown'] = party_counts
-            orgao['member_count'] = len(members)
-
-            # Get agenda events for this committee (by name match)
-            # Strip name to handle trailing spaces in data
-            committee_name = orgao['name'].strip()
-            cur.execute("""
+            """, (db_id,)),
+            ("""
                 SELECT event_id, title, subtitle, start_date, start_time,
                        location, description, meeting_number
                 FROM agenda_events
-                WHERE committee ILIKE %s
+                WHERE orgao_id = %s
                 ORDER BY start_date DESC, start_time DESC
                 LIMIT 20
-            """, (f"%{committee_name}%",))
-
-            agenda_events = []
-            for row in cur.fetchall():
-                agenda_events.append({
-                    'event_id': row['event_id'],
-                    'title': row['title'],
-                    'subtitle': row['subtitle'],
-                    'date': row['start_date'].isoformat() if row['start_date'] else None,
-                    'time': row['start_time'].strftime('%H:%M') if row['start_time'] else None,
-                    'location': row['location'],
-                    'description': row['description'],
-                    'meeting_number': row['meeting_number']
-                })
-
-            orgao['agenda_events'] = agenda_events
-
-            # Get initiatives linked to this committee (from iniciativa_comissao)
-            cur.execute("""
+            """, (db_id,)),
+            ("""
                 SELECT
                     ic.id,
                     ic.link_type,
@@ -761,43 +2000,81 @@ def get_orgao(org_id):
                     CASE ic.link_type WHEN 'lead' THEN 1 WHEN 'secondary' THEN 2 ELSE 3 END,
                     i.is_completed ASC,
                     ic.distribution_date DESC NULLS LAST
-            """, (db_id,))
+            """, (db_id,)),
+        ])
+
+        members = []
+        party_counts = {}
+
+        for row in member_rows:
+            party = row['party'] or 'Sem partido'
+            party_counts[party] = party_counts.get(party, 0) + 1
+
+            members.append({
+                'dep_id': row['dep_id'],
+                'name': row['deputy_name'],
+                'party': party,
+                'role': row['role'],
+                'member_type': row['member_type']
+            })
 
-            initiatives = []
-            for row in cur.fetchall():
-                initiatives.append({
-                    'link_id': row['id'],
-                    'link_type': row['link_type'],
-                    'phase_code': row['phase_code'],
-                    'phase_name': row['phase_name'],
-                    'has_vote': row['has_vote'],
-                    'vote_result': row['vote_result'],
-                    'vote_date': row['vote_date'].isoformat() if row['vote_date'] else None,
-                    'has_rapporteur': row['has_rapporteur'],
-                    'distribution_date': row['distribution_date'].isoformat() if row['distribution_date'] else None,
-                    'initiative': {
-                        'id': row['ini_db_id'],
-                        'ini_id': row['ini_id'],
-                        'number': row['number'],
-                        'type': row['type'],
-                        'type_description': row['type_description'],
-                        'title': row['title'],
-                        'current_status': row['current_status'],
-                        'is_completed': row['is_completed'],
-                        'author_name': row['author_name']
-                    }
-                })
+        orgao['members'] = members
+        orgao['party_breakdown'] = party_counts
+        orgao['member_count'] = len(members)
+
+        agenda_events = []
+        for row in agenda_rows:
+            agenda_events.append({
+                'event_id': row['event_id'],
+                'title': row['title'],
+                'subtitle': row['subtitle'],
+                'date': row['start_date'].isoformat() if row['start_date'] else None,
+                'time': row['start_time'].strftime('%H:%M') if row['start_time'] else None,
+                'location': row['location'],
+                'description': row['description'],
+                'meeting_number': row['meeting_number']
+            })
+
+        orgao['agenda_events'] = agenda_events
+
+        initiatives = []
+        for row in initiative_rows:
+            initiatives.append({
+                'link_id': row['id'],
+                'link_type': row['link_type'],
+                'phase_code': row['phase_code'],
+                'phase_name': row['phase_name'],
+                'has_vote': row['has_vote'],
+                'vote_result': row['vote_result'],
+                'vote_date': row['vote_date'].isoformat() if row['vote_date'] else None,
+                'has_rapporteur': row['has_rapporteur'],
+                'distribution_date': row['distribution_date'].isoformat() if row['distribution_date'] else None,
+                'initiative': {
+                    'id': row['ini_db_id'],
+                    'ini_id': row['ini_id'],
+                    'number': row['number'],
+                    'type': row['type'],
+                    'type_description': row['type_description'],
+                    'title': row['title'],
+                    'current_status': row['current_status'],
+                    'is_completed': row['is_completed'],
+                    'author_name': row['author_name']
+                }
+            })
 
-            orgao['initiatives'] = initiatives
-            orgao['initiative_count'] = len(initiatives)
+        orgao['initiatives'] = initiatives
+        orgao['initiative_count'] = len(initiatives)
 
-            return jsonify(orgao)
+        return jsonify(orgao)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/orgaos/summary', methods=['GET'])
+@conditional_response()
+@cached_response
+@snapshot_response
 def get_orgaos_summary():
     """
     Get summary of all committees with party composition.
@@ -806,119 +2083,208 @@ def get_orgaos_summary():
     """
     try:
         with db_connection() as (conn, cur):
-            # Get all committees (main ones only) with party breakdown
+            # One statement: party breakdown per committee plus initiative
+            # counts as conditional aggregates over the precomputed
+            # status_category, joined to each committee by database id
             cur.execute("""
+                WITH party_counts AS (
+                    SELECT orgao_id, COALESCE(party, 'Sem partido') AS party, COUNT(*) AS count
+                    FROM orgao_membros
+                    GROUP BY 1, 2
+                ),
+                parties AS (
+                    SELECT orgao_id,
+                           json_object_agg(party, count ORDER BY party) AS parties,
+                           SUM(count)::int AS total_members
+                    FROM party_counts
+                    GROUP BY orgao_id
+                ),
+                authored AS (
+                    -- Committees as authors (rare)
+                    SELECT orgao_id, COUNT(*) AS ini_authored
+                    FROM iniciativa_autores
+                    WHERE author_type = 'committee' AND orgao_id IS NOT NULL
+                    GROUP BY orgao_id
+                ),
+                lead AS (
+                    SELECT ic.orgao_id,
+                           COUNT(*) FILTER (WHERE i.status_category = 'in_progress') AS ini_in_progress,
+                           COUNT(*) FILTER (WHERE i.status_category = 'approved') AS ini_approved,
+                           COUNT(*) FILTER (WHERE i.status_category = 'rejected') AS ini_rejected
+                    FROM iniciativa_comissao ic
+                    JOIN iniciativas i ON ic.iniciativa_id = i.id
+                    WHERE ic.link_type = 'lead'
+                    GROUP BY ic.orgao_id
+                )
                 SELECT
-                    o.id, o.org_id, o.name, o.acronym, o.org_type,
-                    m.party,
-                    COUNT(*) as count
+                    o.id, o.org_id, o.name, o.acronym, o.org_type AS type,
+                    p.parties, p.total_members,
+                    COALESCE(a.ini_authored, 0) AS ini_authored,
+                    COALESCE(l.ini_in_progress, 0) AS ini_in_progress,
+                    COALESCE(l.ini_approved, 0) AS ini_approved,
+                    COALESCE(l.ini_rejected, 0) AS ini_rejected
                 FROM orgaos o
-                JOIN orgao_membros m ON o.id = m.orgao_id
+                JOIN parties p ON p.orgao_id = o.id
+                LEFT JOIN authored a ON a.orgao_id = o.id
+                LEFT JOIN lead l ON l.orgao_id = o.id
                 WHERE o.org_type = 'comissao'
-                GROUP BY o.id, o.org_id, o.name, o.acronym, o.org_type, m.party
-                ORDER BY o.name, m.party
+                ORDER BY o.name
             """)
 
-            # Build nested structure
-            committees = {}
-            for row in cur.fetchall():
-                org_id = row['org_id']
-                if org_id not in committees:
-                    committees[org_id] = {
-                        'id': row['id'],
-                        'org_id': org_id,
-                        'name': row['name'],
-                        'acronym': row['acronym'],
-                        'type': row['org_type'],
-                        'parties': {},
-                        'total_members': 0,
-                        'ini_authored': 0,
-                        'ini_in_progress': 0,
-                        'ini_approved': 0,
-                        'ini_rejected': 0
-                    }
-
-                party = row['party'] or 'Sem partido'
-                committees[org_id]['parties'][party] = row['count']
-                committees[org_id]['total_members'] += row['count']
-
-            # Get initiative statistics for each committee
-            # 1. Authored initiatives (rare - committees as authors)
-            cur.execute("""
-                SELECT orgao_id, COUNT(*) as count
-                FROM iniciativa_autores
-                WHERE author_type = 'committee' AND orgao_id IS NOT NULL
-                GROUP BY orgao_id
-            """)
-            for row in cur.fetchall():
-                db_id = row['orgao_id']
-                # Find committee by db id
-                for c in committees.values():
-                    if c['id'] == db_id:
-                        c['ini_authored'] = row['count']
-                        break
-
-            # 2. Lead initiatives in progress (not completed)
-            cur.execute("""
-                SELECT ic.orgao_id, COUNT(*) as count
-                FROM iniciativa_comissao ic
-                JOIN iniciativas i ON ic.iniciativa_id = i.id
-                WHERE ic.link_type = 'lead' AND i.is_completed = FALSE
-                GROUP BY ic.orgao_id
-            """)
-            for row in cur.fetchall():
-                db_id = row['orgao_id']
-                for c in committees.values():
-                    if c['id'] == db_id:
-                        c['ini_in_progress'] = row['count']
-                        break
+            return jsonify(cur.fetchall())
 
-            # 3. Approved initiatives (lead only)
-            cur.execute("""
-                SELECT ic.orgao_id, COUNT(*) as count
-                FROM iniciativa_comissao ic
-                JOIN iniciativas i ON ic.iniciativa_id = i.id
-                WHERE ic.link_type = 'lead'
-                  AND i.is_completed = TRUE
-                  AND i.current_status ILIKE '%publicação%'
-                GROUP BY ic.orgao_id
-            """)
-            for row in cur.fetchall():
-                db_id = row['orgao_id']
-                for c in committees.values():
-                    if c['id'] == db_id:
-                        c['ini_approved'] = row['count']
-                        break
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-            # 4. Rejected initiatives (lead only)
-            cur.execute("""
-                SELECT ic.orgao_id, COUNT(*) as count
-                FROM iniciativa_comissao ic
-                JOIN iniciativas i ON ic.iniciativa_id = i.id
-                WHERE ic.link_type = 'lead'
-                  AND i.is_completed = TRUE
-                  AND (i.current_status ILIKE '%rejeitad%'
-                       OR i.current_status ILIKE '%retirad%'
-                       OR i.current_status ILIKE '%caducad%')
-                GROUP BY ic.orgao_id
-            """)
-            for row in cur.fetchall():
-                db_id = row['orgao_id']
-                for c in committees.values():
-                    if c['id'] == db_id:
-                        c['ini_rejected'] = row['count']
-                        break
 
-            # Convert to list and sort by name
-            result = sorted(committees.values(), key=lambda x: x['name'])
+COMMITTEE_LINK_COLUMNS = """
+    ic.id, i.ini_id, o.org_id, ic.committee_name, ic.link_type,
+    ic.phase_code, ic.phase_name, ic.distribution_date, ic.event_date,
+    ic.has_rapporteur, ic.has_vote, ic.vote_result, ic.vote_date
+"""
+
 
-            return jsonify(result)
+@app.route('/api/orgaos/links/changes', methods=['GET'])
+@conditional_response()
+@cached_response
+def get_committee_links_changes():
+    """
+    Committee-initiative links changed or deleted since a point in time.
+
+    Same parameters and envelope as /api/iniciativas/changes. Each change
+    is one iniciativa_comissao row (org_id is null for committees not in
+    orgaos); deletions are link ids.
+    """
+    try:
+        since, limit = change_feed_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        rows, deleted, position, has_more = fetch_changes(
+            """iniciativa_comissao ic
+               JOIN iniciativas i ON i.id = ic.iniciativa_id
+               LEFT JOIN orgaos o ON o.id = ic.orgao_id""",
+            'ic', COMMITTEE_LINK_COLUMNS, 'iniciativa_comissao', since, limit)
+
+        changes = [{k: v for k, v in row.items() if not k.startswith('_changed')}
+                   for row in rows]
+        return change_feed_response(changes, [int(key) for key in deleted], position, has_more)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Serving situations = deputies currently in office (total 230)
+SERVING_SITUATIONS = ['Efetivo', 'Efetivo Temporário', 'Efetivo Definitivo']
+
+
+def deputados_filters():
+    """Effective (legislature, party, circulo, situation) of a /api/deputados request."""
+    return (
+        request.args.get('legislature', 'XVII'),
+        request.args.get('party') or None,
+        request.args.get('circulo') or None,
+        # Default to 'serving' - shows all 230 active deputies
+        request.args.get('situation', 'serving') or 'serving'
+    )
+
+
+def deputados_query_string():
+    """Canonical query string of a /api/deputados request, defaults included."""
+    names = ('legislature', 'party', 'circulo', 'situation')
+    return urlencode(sorted((name, value) for name, value in zip(names, deputados_filters()) if value))
+
+
+# Deputies plus membership lists and the summary breakdowns in one statement.
+# The breakdowns use the legislature/situation filter only (not party or
+# circulo), so the hemicycle always shows the whole chamber.
+DEPUTADOS_QUERY = """
+    WITH base AS (
+        SELECT
+            d.id, d.dep_id, d.dep_cad_id, d.name, d.full_name, d.party, d.circulo,
+            d.situation, b.gender, b.profession, b.education,
+            date_part('year', age(CURRENT_DATE, b.birth_date))::int AS age
+        FROM deputados d
+        LEFT JOIN deputados_bio b ON d.dep_cad_id = b.cad_id
+        WHERE d.legislature = %(legislature)s AND {situation_clause}
+    ),
+    memberships AS (
+        SELECT
+            m.dep_cad_id,
+            json_agg(json_build_object(
+                'name', o.name, 'acronym', o.acronym, 'role', m.role, 'member_type', m.member_type
+            ) ORDER BY o.name) FILTER (WHERE o.org_type = 'comissao') AS comissoes,
+            json_agg(json_build_object(
+                'name', o.name, 'acronym', o.acronym, 'role', m.role, 'member_type', m.member_type
+            ) ORDER BY o.name) FILTER (WHERE o.org_type = 'grupo_trabalho') AS grupos_trabalho
+        FROM orgao_membros m
+        JOIN orgaos o ON m.orgao_id = o.id
+        WHERE m.dep_cad_id IN (SELECT dep_cad_id FROM base)
+        GROUP BY m.dep_cad_id
+    ),
+    -- Efetivo Temporário deputies replace Suspenso(Eleito) deputies
+    -- from the same circulo and party
+    suspended AS (
+        SELECT circulo, party, json_agg(name ORDER BY name) AS names
+        FROM deputados
+        WHERE legislature = %(legislature)s AND situation = 'Suspenso(Eleito)'
+        GROUP BY circulo, party
+    ),
+    breakdowns AS (
+        SELECT
+            CASE
+                WHEN GROUPING(party) = 0 THEN 'party'
+                WHEN GROUPING(gender) = 0 THEN 'gender'
+                WHEN GROUPING(circulo) = 0 THEN 'circulo'
+                ELSE 'total'
+            END AS dimension,
+            COALESCE(party, gender, circulo) AS value,
+            COUNT(*) AS count
+        FROM base
+        GROUP BY GROUPING SETS ((party), (gender), (circulo), ())
+    )
+    SELECT
+        (
+            SELECT COALESCE(json_agg(json_build_object(
+                'id', b.id,
+                'dep_id', b.dep_id,
+                'dep_cad_id', b.dep_cad_id,
+                'name', b.name,
+                'full_name', b.full_name,
+                'party', b.party,
+                'circulo', b.circulo,
+                'gender', b.gender,
+                'age', b.age,
+                'profession', b.profession,
+                'education', b.education,
+                'situation', b.situation,
+                'comissoes', COALESCE(m.comissoes, '[]'::json),
+                'grupos_trabalho', COALESCE(m.grupos_trabalho, '[]'::json),
+                'replaces', CASE
+                    WHEN b.situation <> 'Efetivo Temporário' THEN NULL
+                    WHEN json_array_length(s.names) = 1 THEN s.names->0
+                    ELSE s.names
+                END
+            ) ORDER BY b.party, b.name), '[]'::json)
+            FROM base b
+            LEFT JOIN memberships m ON m.dep_cad_id = b.dep_cad_id
+            LEFT JOIN suspended s ON s.circulo = b.circulo AND s.party = b.party
+            WHERE (%(party)s::text IS NULL OR b.party = %(party)s)
+              AND (%(circulo)s::text IS NULL OR b.circulo = %(circulo)s)
+        ) AS deputados,
+        (
+            SELECT json_agg(json_build_object(
+                'dimension', dimension, 'value', value, 'count', count
+            ) ORDER BY count DESC)
+            FROM breakdowns
+        ) AS breakdowns
+"""
+
+
 @app.route('/api/deputados', methods=['GET'])
+@conditional_response(daily=True)
+@cached_response(key=deputados_filters, daily=True)
 def get_deputados():
     """
     Get all deputies with biographical and committee data.
@@ -934,293 +2300,233 @@ def get_deputados():
 
     Returns list of deputies with party composition summary.
     """
-    # Serving situations = deputies currently in office (total 230)
-    SERVING_SITUATIONS = ['Efetivo', 'Efetivo Temporário', 'Efetivo Definitivo']
-
     try:
+        legislature, party, circulo, situation = deputados_filters()
+
+        params = {'legislature': legislature, 'party': party, 'circulo': circulo}
+        if situation == 'serving':
+            situation_clause = "d.situation = ANY(%(situation)s)"
+            params['situation'] = SERVING_SITUATIONS
+        elif situation == 'all':
+            situation_clause = "TRUE"
+        else:
+            situation_clause = "d.situation = %(situation)s"
+            params['situation'] = situation
+
         with db_connection() as (conn, cur):
-            # Get optional filters
-            legislature = request.args.get('legislature', 'XVII')
-            party = request.args.get('party')
-            circulo = request.args.get('circulo')
-            # Default to 'serving' - shows all 230 active deputies
-            situation = request.args.get('situation', 'serving') or 'serving'
-
-            # Build query - JOIN with deputados_bio for biographical data
-            query = """
-                SELECT
-                    d.id, d.dep_id, d.dep_cad_id, d.legislature,
-                    d.name, d.full_name, d.party, d.circulo_id, d.circulo,
-                    b.gender, b.birth_date, b.profession, b.education,
-                    d.situation, d.situation_start, d.situation_end
-                FROM deputados d
-                LEFT JOIN deputados_bio b ON d.dep_cad_id = b.cad_id
-                WHERE d.legislature = %s
-            """
-            params = [legislature]
+            cur.execute(DEPUTADOS_QUERY.format(situation_clause=situation_clause), params)
+            row = cur.fetchone()
 
-            if party:
-                query += " AND d.party = %s"
-                params.append(party)
+        summary = {
+            'total': 0,
+            'party_composition': {},
+            'gender_breakdown': {},
+            'circulo_breakdown': {}
+        }
+        for item in row['breakdowns'] or []:
+            dimension, value, count = item['dimension'], item['value'], item['count']
+            if dimension == 'total':
+                summary['total'] = count
+            elif dimension == 'party':
+                summary['party_composition'][value or 'Sem partido'] = count
+            elif dimension == 'gender':
+                summary['gender_breakdown'][value or 'Unknown'] = count
+            else:
+                summary['circulo_breakdown'][value] = count
 
-            if circulo:
-                query += " AND d.circulo = %s"
-                params.append(circulo)
+        return jsonify({
+            'deputados': row['deputados'],
+            'summary': summary
+        })
 
-            # Handle situation filter
-            if situation == 'serving':
-                query += " AND d.situation = ANY(%s)"
-                params.append(SERVING_SITUATIONS)
-            elif situation != 'all':
-                query += " AND d.situation = %s"
-                params.append(situation)
+    except Exception as e:
+        logger.exception("Error fetching deputados")
+        return jsonify({'error': str(e)}), 500
 
-            query += " ORDER BY d.party, d.name"
 
-            cur.execute(query, params)
+# /api/batch limits
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+BATCH_MAX_SECONDS = float(os.environ.get('BATCH_MAX_SECONDS', 10))
 
-            # Build deputy list
-            deputados = []
-            dep_ids = []
 
-            for row in cur.fetchall():
-                dep_cad_id = row['dep_cad_id']
-                dep_ids.append(dep_cad_id)
+def parse_batch(data):
+    """
+    Validate a /api/batch body. Raises ValueError.
 
-                # Calculate age from birth_date
-                age = None
-                if row['birth_date']:
-                    today = datetime.now().date()
-                    birth = row['birth_date']
-                    age = today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
+    Returns:
+        list: [(id, path, params), ...]
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list):
+        raise ValueError("Expected {\"requests\": [...]}")
+
+    requests = data['requests']
+    if not requests:
+        raise ValueError("No requests")
+    if len(requests) > BATCH_MAX_REQUESTS:
+        raise ValueError(f"At most {BATCH_MAX_REQUESTS} requests per batch")
+
+    parsed = []
+    seen = set()
+    for item in requests:
+        if not isinstance(item, dict):
+            raise ValueError("Each request must be an object")
+        request_id = item.get('id')
+        path = item.get('path')
+        params = item.get('params') or {}
+        if not isinstance(request_id, str) or not request_id:
+            raise ValueError("Each request needs a string id")
+        if request_id in seen:
+            raise ValueError(f"Duplicate request id: {request_id}")
+        if not isinstance(path, str) or not path.startswith('/api/') or path.startswith('/api/batch'):
+            raise ValueError(f"{request_id}: path must be an /api/ read endpoint")
+        if item.get('method', 'GET').upper() != 'GET':
+            raise ValueError(f"{request_id}: only GET requests can be batched")
+        if not isinstance(params, dict):
+            raise ValueError(f"{request_id}: params must be an object")
+        seen.add(request_id)
+        parsed.append((request_id, path, params))
+    return parsed
+
+
+@app.route('/api/batch', methods=['POST'])
+@rate_limited('read', READ_RATE_LIMIT, 60)
+def batch():
+    """
+    Run several read requests in one call over one database connection.
 
-                deputados.append({
-                    'id': row['id'],
-                    'dep_id': row['dep_id'],
-                    'dep_cad_id': dep_cad_id,
-                    'name': row['name'],
-                    'full_name': row['full_name'],
-                    'party': row['party'],
-                    'circulo': row['circulo'],
-                    'gender': row['gender'],
-                    'age': age,
-                    'profession': row['profession'],
-                    'education': row['education'],
-                    'situation': row['situation'],
-                    'comissoes': [],  # Will be filled below
-                    'grupos_trabalho': []  # Will be filled below
-                })
+    Expected JSON body:
+    {
+        "requests": [
+            {"id": "summary", "path": "/api/orgaos/summary"},
+            {"id": "orgao", "path": "/api/orgaos/1234"},
+            {"id": "links", "path": "/api/agenda/42/initiatives", "params": {...}}
+        ]
+    }
 
-            # Get committee and working group memberships for all deputies
-            if dep_ids:
-                # Fetch comissões
-                cur.execute("""
-                    SELECT
-                        m.dep_cad_id,
-                        o.name as orgao_name,
-                        o.acronym,
-                        m.role,
-                        m.member_type
-                    FROM orgao_membros m
-                    JOIN orgaos o ON m.orgao_id = o.id
-                    WHERE m.dep_cad_id = ANY(%s)
-                      AND o.org_type = 'comissao'
-                    ORDER BY m.dep_cad_id, o.name
-                """, (dep_ids,))
-
-                # Group committees by deputy
-                comissoes_by_dep = {}
-                for row in cur.fetchall():
-                    dep_cad_id = row['dep_cad_id']
-                    if dep_cad_id not in comissoes_by_dep:
-                        comissoes_by_dep[dep_cad_id] = []
-                    comissoes_by_dep[dep_cad_id].append({
-                        'name': row['orgao_name'],
-                        'acronym': row['acronym'],
-                        'role': row['role'],
-                        'member_type': row['member_type']
-                    })
-
-                # Fetch grupos de trabalho
-                cur.execute("""
-                    SELECT
-                        m.dep_cad_id,
-                        o.name as orgao_name,
-                        o.acronym,
-                        m.role,
-                        m.member_type
-                    FROM orgao_membros m
-                    JOIN orgaos o ON m.orgao_id = o.id
-                    WHERE m.dep_cad_id = ANY(%s)
-                      AND o.org_type = 'grupo_trabalho'
-                    ORDER BY m.dep_cad_id, o.name
-                """, (dep_ids,))
-
-                # Group working groups by deputy
-                grupos_by_dep = {}
-                for row in cur.fetchall():
-                    dep_cad_id = row['dep_cad_id']
-                    if dep_cad_id not in grupos_by_dep:
-                        grupos_by_dep[dep_cad_id] = []
-                    grupos_by_dep[dep_cad_id].append({
-                        'name': row['orgao_name'],
-                        'acronym': row['acronym'],
-                        'role': row['role'],
-                        'member_type': row['member_type']
-                    })
-
-                # Add committees and working groups to each deputy
-                for dep in deputados:
-                    dep['comissoes'] = comissoes_by_dep.get(dep['dep_cad_id'], [])
-                    dep['grupos_trabalho'] = grupos_by_dep.get(dep['dep_cad_id'], [])
-
-            # Find who Efetivo Temporário deputies are replacing
-            # They replace Suspenso(Eleito) deputies from same circulo and party
-            temp_deputies = [d for d in deputados if d['situation'] == 'Efetivo Temporário']
-            if temp_deputies:
-                # Get all suspended deputies in same legislature
-                cur.execute("""
-                    SELECT name, party, circulo
-                    FROM deputados
-                    WHERE legislature = %s AND situation = 'Suspenso(Eleito)'
-                """, (legislature,))
+    Returns each sub-response keyed by id, in request order:
+    {"responses": {"summary": {"status": 200, "body": [...]}, ...}}
+
+    Sub-requests run sequentially. At most BATCH_MAX_REQUESTS are accepted;
+    those not started within BATCH_MAX_SECONDS get status 504, and each
+    query is limited to the time remaining. With the SQLite backend no
+    connection is opened; sub-requests are served from the snapshot file.
+    """
+    try:
+        sub_requests = parse_batch(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-                # Group suspended by (circulo, party)
-                suspended_by_location = {}
-                for row in cur.fetchall():
-                    key = (row['circulo'], row['party'])
-                    if key not in suspended_by_location:
-                        suspended_by_location[key] = []
-                    suspended_by_location[key].append(row['name'])
-
-                # Match temp deputies to who they're replacing
-                for dep in deputados:
-                    if dep['situation'] == 'Efetivo Temporário':
-                        key = (dep['circulo'], dep['party'])
-                        replacing = suspended_by_location.get(key, [])
-                        dep['replaces'] = replacing[0] if len(replacing) == 1 else replacing if replacing else None
+    deadline = time.monotonic() + BATCH_MAX_SECONDS
+    parts = []
+
+    try:
+        connection = db_connection() if sqlite_snapshot is None else nullcontext((None, None))
+        with connection as (conn, cur):
+            g.batch_connection = conn
+            try:
+                for request_id, path, params in sub_requests:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        status, body = 504, encode_json({'error': 'Batch time limit exceeded'})
                     else:
-                        dep['replaces'] = None
+                        if conn is not None:
+                            cur.execute("SELECT set_config('statement_timeout', %s, true)",
+                                        (str(int(remaining * 1000)),))
+                        with app.test_request_context(path, base_url=request.host_url,
+                                                      query_string=params,
+                                                      environ_overrides={'viriato.batch': True}):
+                            response = app.full_dispatch_request()
+                            status = response.status_code
+                            body = response.get_data() if response.is_json else b''
+                        if conn is not None:
+                            conn.rollback()  # Fresh transaction for the next sub-request
+
+                    parts.append(encode_json(request_id) + b':{"status":' + str(status).encode() +
+                                 b',"body":' + (body or b'null') + b'}')
+            finally:
+                g.pop('batch_connection', None)
 
-            # Get party composition summary (for hemicycle)
-            # Use same situation filter as main query for consistency
-            if situation == 'serving':
-                cur.execute("""
-                    SELECT party, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s AND situation = ANY(%s)
-                    GROUP BY party
-                    ORDER BY count DESC
-                """, (legislature, SERVING_SITUATIONS))
-            elif situation == 'all':
-                cur.execute("""
-                    SELECT party, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s
-                    GROUP BY party
-                    ORDER BY count DESC
-                """, (legislature,))
-            else:
-                cur.execute("""
-                    SELECT party, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s AND situation = %s
-                    GROUP BY party
-                    ORDER BY count DESC
-                """, (legislature, situation))
+    except Exception as e:
+        logger.exception("Batch error")
+        return jsonify({'error': str(e)}), 500
 
-            party_composition = {}
-            total_deputados = 0
-            for row in cur.fetchall():
-                party_name = row['party'] or 'Sem partido'
-                party_composition[party_name] = row['count']
-                total_deputados += row['count']
+    return Response(b'{"responses":{' + b','.join(parts) + b'}}', mimetype='application/json')
 
-            # Get gender breakdown (gender is in deputados_bio table)
-            if situation == 'serving':
-                cur.execute("""
-                    SELECT b.gender, COUNT(*) as count
-                    FROM deputados d
-                    LEFT JOIN deputados_bio b ON d.dep_cad_id = b.cad_id
-                    WHERE d.legislature = %s AND d.situation = ANY(%s)
-                    GROUP BY b.gender
-                """, (legislature, SERVING_SITUATIONS))
-            elif situation == 'all':
-                cur.execute("""
-                    SELECT b.gender, COUNT(*) as count
-                    FROM deputados d
-                    LEFT JOIN deputados_bio b ON d.dep_cad_id = b.cad_id
-                    WHERE d.legislature = %s
-                    GROUP BY b.gender
-                """, (legislature,))
-            else:
-                cur.execute("""
-                    SELECT b.gender, COUNT(*) as count
-                    FROM deputados d
-                    LEFT JOIN deputados_bio b ON d.dep_cad_id = b.cad_id
-                    WHERE d.legislature = %s AND d.situation = %s
-                    GROUP BY b.gender
-                """, (legislature, situation))
-
-            gender_breakdown = {}
-            for row in cur.fetchall():
-                gender_breakdown[row['gender'] or 'Unknown'] = row['count']
 
-            # Get circulo breakdown
-            if situation == 'serving':
-                cur.execute("""
-                    SELECT circulo, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s AND situation = ANY(%s)
-                    GROUP BY circulo
-                    ORDER BY count DESC
-                """, (legislature, SERVING_SITUATIONS))
-            elif situation == 'all':
-                cur.execute("""
-                    SELECT circulo, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s
-                    GROUP BY circulo
-                    ORDER BY count DESC
-                """, (legislature,))
-            else:
-                cur.execute("""
-                    SELECT circulo, COUNT(*) as count
-                    FROM deputados
-                    WHERE legislature = %s AND situation = %s
-                    GROUP BY circulo
-                    ORDER BY count DESC
-                """, (legislature, situation))
+FEEDBACK_RATE_LIMIT_MINUTES = 5
+FEEDBACK_RATE_LIMIT_MAX = 3  # Max 3 submissions per 5 minutes per IP
 
-            circulo_breakdown = {}
-            for row in cur.fetchall():
-                circulo_breakdown[row['circulo']] = row['count']
+# Feedback is queued in an outbox and sent to GitHub in the background (see
+# api/outbox.py). FEEDBACK_OUTBOX is where the queue lives: "postgres" (the
+# default) for the feedback_outbox table in the API's database, or a SQLite
+# file path for a host with persistent disk (Render wipes the filesystem on
+# every deploy). "off" opts out: the issue is then created within the
+# request. The SQLite data backend has no PostgreSQL, so it defaults to off.
+FEEDBACK_OUTBOX = os.environ.get('FEEDBACK_OUTBOX', 'postgres' if DATA_BACKEND == 'postgres' else 'off')
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
 
-            return jsonify({
-                'deputados': deputados,
-                'summary': {
-                    'total': total_deputados,
-                    'party_composition': party_composition,
-                    'gender_breakdown': gender_breakdown,
-                    'circulo_breakdown': circulo_breakdown
-                }
-            })
 
-    except Exception as e:
-        logger.exception("Error fetching deputados")
-        return jsonify({'error': str(e)}), 500
+def create_github_issue(issue_data):
+    """
+    Create an issue in GITHUB_REPO (the feedback outbox's sender).
 
+    Returns:
+        int: The new issue's number
 
-# Simple in-memory rate limiter for feedback
-feedback_rate_limit = {}
-FEEDBACK_RATE_LIMIT_MINUTES = 5
-FEEDBACK_RATE_LIMIT_MAX = 3  # Max 3 submissions per 5 minutes per IP
+    Raises:
+        PermanentError: GitHub rejected the issue (retrying won't help)
+    """
+    github_token = os.environ.get('GITHUB_TOKEN')
+    if not github_token:
+        raise RuntimeError("GITHUB_TOKEN not set")
+    github_repo = os.environ.get('GITHUB_REPO', 'loukach/viriato')
+
+    req = urllib.request.Request(
+        f'{GITHUB_API_URL}/repos/{github_repo}/issues',
+        data=json.dumps(issue_data).encode('utf-8'),
+        headers={
+            'Authorization': f'token {github_token}',
+            'Accept': 'application/vnd.github.v3+json',
+            'Content-Type': 'application/json',
+            'User-Agent': 'Viriato-Feedback-Bot'
+        },
+        method='POST'
+    )
+
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return json.loads(response.read().decode('utf-8')).get('number')
+    except urllib.error.HTTPError as e:
+        error_body = e.read().decode('utf-8', 'replace') if e.fp else str(e)
+        # 403/429 are GitHub's rate limits and 408 a timeout; other 4xx won't succeed on retry
+        if 400 <= e.code < 500 and e.code not in (403, 408, 429):
+            raise PermanentError(f"GitHub API error {e.code}: {error_body}") from e
+        raise RuntimeError(f"GitHub API error {e.code}: {error_body}") from e
+
+
+if FEEDBACK_OUTBOX == 'off':
+    feedback_outbox = None
+elif FEEDBACK_OUTBOX == 'postgres':
+    feedback_outbox = PostgresOutbox(db_connection)
+else:
+    feedback_outbox = Outbox(FEEDBACK_OUTBOX)
+feedback_drainer = OutboxDrainer(feedback_outbox, create_github_issue) if feedback_outbox is not None else None
+
+
+def start_feedback_drainer():
+    """Send queued feedback from this process, e.g. what was left by a restart."""
+    if feedback_drainer is not None and os.environ.get('GITHUB_TOKEN'):
+        feedback_drainer.start()
 
 
 @app.route('/api/feedback', methods=['POST'])
 def submit_feedback():
     """
-    Submit user feedback, creating a GitHub issue.
+    Submit user feedback as a GitHub issue.
+
+    Returns 202 once the issue is queued in the feedback outbox; a
+    background drainer creates it (see start_feedback_drainer()). With
+    FEEDBACK_OUTBOX=off, creates it before returning 200 instead.
 
     Expected JSON body:
     {
@@ -1244,8 +2550,9 @@ def submit_feedback():
 
         # Honeypot check (bot trap - this field should be empty)
         if data.get('honeypot'):
-            # Silently accept but don't create issue (it's a bot)
-            return jsonify({'success': True, 'message': 'Feedback received'})
+            # Silently accept, with the same status as real feedback, but don't create an issue (it's a bot)
+            return jsonify({'success': True, 'message': 'Feedback received'}), \
+                200 if feedback_outbox is None else 202
 
         # Validate required fields
         title = data.get('title', '').strip()
@@ -1263,28 +2570,14 @@ def submit_feedback():
         if len(description) > 5000:
             return jsonify({'error': 'Description too long (max 5000 characters)'}), 400
 
-        # Rate limiting by IP
-        client_ip = request.headers.get('X-Forwarded-For', request.remote_addr)
-        if client_ip:
-            client_ip = client_ip.split(',')[0].strip()
+        # Rate limiting by IP, counting accepted submissions only
+        limited = consume_rate_limit(
+            'feedback', FEEDBACK_RATE_LIMIT_MAX, FEEDBACK_RATE_LIMIT_MINUTES * 60,
+            message=f'Too many submissions. Please wait {FEEDBACK_RATE_LIMIT_MINUTES} minutes.')
+        if limited is not None:
+            return limited
 
         now = datetime.now()
-        cutoff = now - timedelta(minutes=FEEDBACK_RATE_LIMIT_MINUTES)
-
-        # Clean old entries and check rate limit
-        if client_ip in feedback_rate_limit:
-            feedback_rate_limit[client_ip] = [
-                t for t in feedback_rate_limit[client_ip] if t > cutoff
-            ]
-            if len(feedback_rate_limit[client_ip]) >= FEEDBACK_RATE_LIMIT_MAX:
-                return jsonify({
-                    'error': f'Too many submissions. Please wait {FEEDBACK_RATE_LIMIT_MINUTES} minutes.'
-                }), 429
-        else:
-            feedback_rate_limit[client_ip] = []
-
-        # Record this submission
-        feedback_rate_limit[client_ip].append(now)
 
         # Optional fields
         email = data.get('email', '').strip() or 'Anonymous'
@@ -1309,41 +2602,34 @@ def submit_feedback():
 *Submitted via Viriato feedback form*
 """
 
-        # Create GitHub issue via API
         issue_data = {
             'title': f'[Feedback] {title}',
             'body': issue_body,
             'labels': ['user-feedback']
         }
 
-        github_repo = os.environ.get('GITHUB_REPO', 'loukach/viriato')
-        github_url = f'https://api.github.com/repos/{github_repo}/issues'
-
-        req = urllib.request.Request(
-            github_url,
-            data=json.dumps(issue_data).encode('utf-8'),
-            headers={
-                'Authorization': f'token {github_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'Content-Type': 'application/json',
-                'User-Agent': 'Viriato-Feedback-Bot'
-            },
-            method='POST'
-        )
+        if feedback_outbox is None:
+            try:
+                issue_number = create_github_issue(issue_data)
+            except Exception as e:
+                logger.error("GitHub API error: %s", e)
+                return jsonify({'error': 'Failed to submit feedback'}), 500
+            return jsonify({
+                'success': True,
+                'message': 'Feedback submitted successfully',
+                'issue_number': issue_number
+            })
 
-        try:
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                issue_number = result.get('number')
-                return jsonify({
-                    'success': True,
-                    'message': 'Feedback submitted successfully',
-                    'issue_number': issue_number
-                })
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8') if e.fp else str(e)
-            logger.error("GitHub API error: %s - %s", e.code, error_body)
-            return jsonify({'error': 'Failed to submit feedback'}), 500
+        feedback_id = feedback_outbox.enqueue(issue_data)
+        if feedback_drainer is not None:
+            start_feedback_drainer()
+            feedback_drainer.wake()
+
+        return jsonify({
+            'success': True,
+            'message': 'Feedback received',
+            'id': feedback_id
+        }), 202
 
     except Exception as e:
         logger.exception("Feedback error")
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+ASGI entry point for the Viriato API.
+
+    uvicorn api.asgi:app --workers 2
+    gunicorn -k uvicorn.workers.UvicornWorker api.asgi:app
+
+Serves the Flask routes of api/app.py, so every endpoint, header and
+response body is the same as under WSGI. Each request's handler runs in a
+thread pool (ASGI_THREADS) while the event loop keeps accepting
+connections. A slow /api/iniciativas build or the /api/feedback call to
+GitHub then holds one thread instead of a whole sync worker. Streamed
+responses are sent chunk by chunk as the handler produces them.
+
+With asyncpg installed (DB_DRIVER=asyncpg, the default when it is
+importable), the worker's database pool is an asyncpg pool on the event
+loop (api/async_db.py); otherwise the usual psycopg2 pool is used. Only
+with asyncpg do handlers with independent queries (a committee's members,
+agenda and initiatives; the change feeds) run them concurrently.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from api import async_db
+from api.app import (DATA_BACKEND, DB_POOL_MAX, DB_POOL_MAX_AGE, DB_POOL_MIN, DB_POOL_TIMEOUT,
+                     app as flask_app, ensure_warm, install_db_pool, start_feedback_drainer)
+
+logger = logging.getLogger('viriato-api')
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 20))
+DB_DRIVER = os.environ.get('DB_DRIVER', 'asyncpg' if async_db.asyncpg is not None else 'psycopg2')
+
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope (PEP 3333 string handling)."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':  # Set from the body actually received
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+class AsgiApp:
+    """
+    ASGI application running a WSGI app in a thread pool.
+
+    Args:
+        wsgi_app: The Flask app
+        threads: Handlers that can run at once in this worker
+    """
+
+    def __init__(self, wsgi_app, threads=ASGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.threads = threads
+        self._executor = None
+        self._db_pool = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads,
+                                                thread_name_prefix='viriato-asgi')
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        else:
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.exception("ASGI startup failed")
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def startup(self):
+        """
+        Open this worker's asyncpg pool (unless serving from SQLite or using
+        psycopg2) and start warming it up; /api/ready answers 503 until done.
+        Also start draining the feedback outbox.
+        """
+        if DB_DRIVER == 'asyncpg' and DATA_BACKEND != 'sqlite':
+            await self.open_db_pool()
+        ensure_warm()
+        start_feedback_drainer()
+
+    async def open_db_pool(self):
+        database_url = os.environ.get('DATABASE_URL')
+        if not database_url:
+            raise RuntimeError("DATABASE_URL environment variable not set")
+
+        pool = await async_db.create_pool(database_url, min_size=DB_POOL_MIN, max_size=DB_POOL_MAX,
+                                          max_inactive_lifetime=DB_POOL_MAX_AGE)
+        self._db_pool = async_db.AsyncpgPool(pool, asyncio.get_running_loop(),
+                                             timeout=DB_POOL_TIMEOUT)
+        install_db_pool(self._db_pool)
+        logger.info("asyncpg pool ready (min=%s, max=%s)", DB_POOL_MIN, DB_POOL_MAX)
+
+    async def shutdown(self):
+        if self._db_pool is not None:
+            install_db_pool(None)
+            await self._db_pool.aclose()
+            self._db_pool = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def http(self, scope, receive, send):
+        body = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+
+        environ = build_environ(scope, b''.join(body))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._run_wsgi, environ, send, loop)
+
+    def _run_wsgi(self, environ, send, loop):
+        """Run the WSGI app in a pool thread, sending each chunk from the loop."""
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        started = False
+        result = self.wsgi_app(environ, start_response)
+        try:
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not started:
+                    send_from_thread({'type': 'http.response.start', 'status': response['status'],
+                                      'headers': response['headers']})
+                    started = True
+                send_from_thread({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                send_from_thread({'type': 'http.response.start', 'status': response['status'],
+                                  'headers': response['headers']})
+            send_from_thread({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+app = AsgiApp(flask_app)
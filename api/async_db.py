@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+asyncpg connection pool for the ASGI entry point (api/asgi.py).
+
+Under ASGI, every worker process keeps one asyncpg pool on its event loop
+instead of a psycopg2 ConnectionPool per thread. The route handlers in
+api/app.py are unchanged. They run in the ASGI thread pool and see this
+pool through the same getconn/putconn interface, with psycopg2-style
+connections and cursors:
+- `%s` / `%(name)s` placeholders are rewritten to asyncpg's `$1, $2...`
+- rows come back as dicts (like RealDictCursor); json/jsonb are decoded
+- a transaction is opened on the first statement and rolled back when
+  the connection is returned, as with psycopg2
+- named cursors are server-side and fetch `itersize` rows at a time
+
+Each statement is awaited on the event loop; only the calling handler
+thread waits for it. Handlers with several independent queries pass them
+to AsyncpgPool.fetch_concurrently() (through fetch_concurrently() in
+api/app.py), which awaits them together, each on its own connection, so
+the request takes as long as the slowest query rather than their sum.
+"""
+
+import asyncio
+import json
+import re
+import threading
+from datetime import date
+
+from api.db import PoolTimeout
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+_PLACEHOLDER_RE = re.compile(r'%\((\w+)\)s|%s|%%')
+
+
+def convert_query(query, params=None):
+    """
+    Rewrite a psycopg2-style query for asyncpg.
+
+    Returns:
+        tuple: (query with $n placeholders, list of arguments)
+    """
+    if params is None:
+        return query, []
+
+    args = []
+    numbers = {}
+    positional = None if isinstance(params, dict) else iter(params)
+
+    def replace(match):
+        if match.group(0) == '%%':
+            return '%'
+        name = match.group(1)
+        if name is None:
+            args.append(next(positional))
+            return f'${len(args)}'
+        if name not in numbers:
+            args.append(params[name])
+            numbers[name] = len(args)
+        return f'${numbers[name]}'
+
+    return _PLACEHOLDER_RE.sub(replace, query), args
+
+
+def _encode_date(value):
+    # psycopg2 lets handlers pass 'YYYY-MM-DD' strings for date columns
+    return value if isinstance(value, str) else value.isoformat()
+
+
+async def init_connection(conn):
+    """Type codecs matching what psycopg2 returns and accepts."""
+    for name in ('json', 'jsonb'):
+        await conn.set_type_codec(name, encoder=json.dumps, decoder=json.loads,
+                                  schema='pg_catalog')
+    await conn.set_type_codec('date', encoder=_encode_date, decoder=date.fromisoformat,
+                              schema='pg_catalog', format='text')
+
+
+async def create_pool(dsn, min_size=1, max_size=5, max_inactive_lifetime=1800):
+    """Open an asyncpg pool on the running event loop."""
+    if asyncpg is None:
+        raise RuntimeError("asyncpg is not installed")
+    return await asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size,
+                                     max_inactive_connection_lifetime=max_inactive_lifetime,
+                                     init=init_connection)
+
+
+class AsyncpgPool:
+    """
+    Blocking facade over an asyncpg pool, for handlers running in threads.
+
+    Args:
+        pool: asyncpg.Pool (or anything with acquire/release/close)
+        loop: Event loop the pool belongs to
+        timeout: Seconds to wait for a free connection before giving up
+    """
+
+    def __init__(self, pool, loop, timeout=10):
+        self._pool = pool
+        self._loop = loop
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._in_use = 0
+
+    def run(self, coro):
+        """Run a coroutine on the pool's loop and wait for its result."""
+        if self._loop.is_closed():
+            coro.close()
+            raise RuntimeError("Event loop is closed")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            raise RuntimeError("Blocking database call on the event loop thread")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def getconn(self):
+        """Check out a connection, waiting up to `timeout` seconds."""
+        try:
+            raw = self.run(self._pool.acquire(timeout=self.timeout))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout("No database connection available after %ss" % self.timeout)
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+        return AsyncpgConnection(raw, self)
+
+    def fetch_concurrently(self, queries):
+        """
+        Run independent read queries at the same time, each on its own
+        pooled connection, in one hop to the event loop.
+
+        Args:
+            queries: [(query, params), ...] with psycopg2-style placeholders
+
+        Returns:
+            list: Each query's rows (dicts), in order
+        """
+        try:
+            return self.run(self._fetch_all(queries))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout("No database connection available after %ss" % self.timeout)
+
+    async def _fetch_all(self, queries):
+        return await asyncio.gather(*(self._fetch(query, params) for query, params in queries))
+
+    async def _fetch(self, query, params):
+        sql, args = convert_query(query, params)
+        raw = await self._pool.acquire(timeout=self.timeout)
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+        try:
+            return [dict(record) for record in await raw.fetch(sql, *args)]
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            await self._pool.release(raw)
+
+    def putconn(self, conn, discard=False):
+        """Return a connection, rolling back any open transaction."""
+        try:
+            conn.rollback()
+        except Exception:
+            discard = True
+        try:
+            if discard:
+                conn.raw.terminate()
+            self.run(self._pool.release(conn.raw))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+
+    def closeall(self):
+        """Close the pool (scheduled if called on the loop itself)."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(self._pool.close())
+        elif not self._loop.is_closed():
+            self.run(self._pool.close())
+
+    async def aclose(self):
+        """Close the pool from the event loop (ASGI lifespan shutdown)."""
+        await self._pool.close()
+
+    def stats(self):
+        """Snapshot of pool counters for monitoring."""
+        with self._lock:
+            stats = {
+                'driver': 'asyncpg',
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'checked_out': self._in_use,
+            }
+        for key, method in (('size', 'get_size'), ('idle', 'get_idle_size'),
+                            ('min', 'get_min_size'), ('max', 'get_max_size')):
+            if hasattr(self._pool, method):
+                stats[key] = getattr(self._pool, method)()
+        return stats
+
+
+class AsyncpgConnection:
+    """psycopg2-like connection over one asyncpg connection."""
+
+    def __init__(self, raw, pool):
+        self.raw = raw
+        self._pool = pool
+        self._transaction = None
+
+    @property
+    def closed(self):
+        return self.raw.is_closed()
+
+    def cursor(self, name=None):
+        return AsyncpgCursor(self, name)
+
+    def begin(self):
+        """Open the implicit transaction psycopg2 starts on the first statement."""
+        if self._transaction is None:
+            transaction = self.raw.transaction()
+            self._pool.run(transaction.start())
+            self._transaction = transaction
+
+    def commit(self):
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            self._pool.run(transaction.commit())
+
+    def rollback(self):
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            self._pool.run(transaction.rollback())
+
+    def close(self):
+        self._pool.putconn(self)
+
+
+class AsyncpgCursor:
+    """psycopg2-like cursor returning dict rows; server-side when named."""
+
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.itersize = 2000
+        self.rowcount = -1
+        self._rows = []
+        self._position = 0
+        self._server_cursor = None
+
+    def execute(self, query, params=None):
+        conn = self.connection
+        conn.begin()
+        sql, args = convert_query(query, params)
+        self._rows = []
+        self._position = 0
+
+        if self.name is not None:
+            self._server_cursor = conn._pool.run(_open_cursor(conn.raw, sql, args))
+            self.rowcount = -1
+        else:
+            records = conn._pool.run(conn.raw.fetch(sql, *args))
+            self._rows = [dict(record) for record in records]
+            self.rowcount = len(self._rows)
+
+    def _fetch_server(self, count):
+        records = self.connection._pool.run(self._server_cursor.fetch(count))
+        return [dict(record) for record in records]
+
+    def fetchone(self):
+        if self._server_cursor is not None:
+            rows = self._fetch_server(1)
+            return rows[0] if rows else None
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = size or self.itersize
+        if self._server_cursor is not None:
+            return self._fetch_server(size)
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self._server_cursor is not None:
+            rows = []
+            while True:
+                batch = self._fetch_server(self.itersize)
+                if not batch:
+                    return rows
+                rows.extend(batch)
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._rows = []
+        self._server_cursor = None
+
+
+async def _open_cursor(raw, sql, args):
+    return await raw.cursor(sql, *args)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Server-side response cache for the Viriato API.
+
+The data behind the API only changes when the pipeline loaders run, and
+each loader bumps a version stamp in the `dataset_version` table when it
+finishes. Responses are cached as already-serialized bytes keyed by the
+request plus that version, so a cache hit costs one cheap version check
+(itself cached for a few seconds) and no query work.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from api.compression import COMPRESS_MIN_BYTES, compress, decompress
+
+logger = logging.getLogger('viriato-api')
+
+# version: integer stamp bumped by loaders, updated_at: when it was bumped
+Version = namedtuple('Version', ['version', 'updated_at'])
+
+
+def make_etag(version, path, args, *extra):
+    """
+    Build a strong entity tag for a response.
+
+    The body of a read endpoint is fully determined by the dataset version,
+    the path and the query parameters (plus any `extra` salt), so the tag
+    can be computed before running any SQL.
+    """
+    key = repr((version, path, tuple(sorted(args)), extra))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+
+
+class DatasetVersion:
+    """
+    Caches the dataset version stamp for `ttl` seconds.
+
+    Args:
+        fetch: Callable returning a Version, or None if no stamp exists
+        ttl: Seconds to reuse the last value before asking the database again
+    """
+
+    def __init__(self, fetch, ttl=5):
+        self._fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value = None
+        self._checked_at = None
+
+    def get(self):
+        """Return the current Version, or None if it can't be determined."""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.ttl:
+                return self._value
+
+        try:
+            value = self._fetch()
+        except Exception as e:
+            # Missing table or unreachable DB: serve uncached rather than fail
+            logger.debug("Could not read dataset version: %s", e)
+            value = None
+
+        with self._lock:
+            self._value = value
+            self._checked_at = now
+        return value
+
+    def reset(self):
+        """Forget the cached value so the next get() hits the database."""
+        with self._lock:
+            self._value = None
+            self._checked_at = None
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized response bodies, bounded by total size.
+
+    Each entry holds the identity body plus any compressed variants built
+    from it, so a body is compressed at most once per encoding and dataset
+    version no matter how many requests ask for it.
+
+    Args:
+        max_bytes: Total body bytes to keep (all variants); 0 disables the cache
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {content encoding or None: body}
+        self._bytes = 0
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the identity body for `key`, or None."""
+        found = self.get_encoded(key, None)
+        return found[0] if found else None
+
+    def get_encoded(self, key, encoding):
+        """
+        Return (body, content_encoding) for `key`, or None if not cached.
+
+        A missing variant is built from the stored ones and kept for the
+        next request. Bodies under COMPRESS_MIN_BYTES are returned
+        uncompressed (content_encoding None).
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self.encode(key, encoding)
+
+    def encode(self, key, encoding):
+        """Like get_encoded(), but without counting a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            variants = dict(entry)
+            version = self._version
+
+        if encoding in variants:
+            return variants[encoding], encoding
+
+        # Build the variant outside the lock; compression can be slow
+        identity = variants.get(None)
+        if identity is None:
+            stored, body = next(iter(variants.items()))
+            identity = decompress(body, stored)
+            self._add_variant(key, None, identity, version)
+        if encoding is None or len(identity) < COMPRESS_MIN_BYTES:
+            return identity, None
+
+        body = compress(identity, encoding, cached=True)
+        self._add_variant(key, encoding, body, version)
+        return body, encoding
+
+    def set(self, key, body, version, encoding=None):
+        """Store a body (optionally already compressed) produced for dataset `version`."""
+        if not self.max_bytes or len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if version != self._version:
+                # Data was reloaded: everything cached so far is stale
+                if self._version is not None and version < self._version:
+                    return
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= sum(len(b) for b in old.values())
+
+            self._entries[key] = {encoding: body}
+            self._bytes += len(body)
+            self._evict()
+
+    def _add_variant(self, key, encoding, body, version):
+        """Attach another encoding of an existing entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or version != self._version or encoding in entry:
+                return
+            entry[encoding] = body
+            self._bytes += len(body)
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= sum(len(b) for b in evicted.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = None
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Response compression for the Viriato API.
+
+Negotiates Accept-Encoding and compresses JSON bodies with brotli (if the
+optional `brotli` package is installed) or gzip. Bodies below a size
+threshold are sent as-is, since compressing them saves nothing.
+"""
+
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+
+# Levels for bodies compressed once and reused (cache, snapshots) versus
+# compressed for a single response
+CACHED_LEVELS = {'br': 9, 'gzip': 9}
+ON_THE_FLY_LEVELS = {'br': 4, 'gzip': 6}
+
+
+def available_encodings():
+    """Supported content codings, best first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encodings):
+    """
+    Pick the best content coding the client accepts.
+
+    Args:
+        accept_encodings: werkzeug Accept object (request.accept_encodings)
+
+    Returns:
+        'br', 'gzip' or None for identity
+    """
+    best = None
+    best_quality = 0
+    for encoding in available_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, cached=False):
+    """Compress `body` with the given content coding."""
+    levels = CACHED_LEVELS if cached else ON_THE_FLY_LEVELS
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=levels['gzip'])
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels['br'])
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def decompress(body, encoding):
+    """Inverse of compress()."""
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        return brotli.decompress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
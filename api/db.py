@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+PostgreSQL connection pool for the Viriato API.
+
+Each gunicorn worker keeps its own pool of open connections so requests
+don't pay TCP + TLS + auth setup against the managed database every time.
+Connections are health-checked before reuse and recycled after a maximum
+age, and the pool keeps counters that are exposed on /api/health.
+
+TimedCursor wraps the cursors handed to request handlers so query time
+and fetched rows can be reported per request, and slow statements logged.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+logger = logging.getLogger('viriato-api')
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the wait timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections.
+
+    Args:
+        connect: Callable returning a new DB-API connection
+        minconn: Connections opened up front and kept idle
+        maxconn: Hard limit on open connections (idle + checked out)
+        max_age: Seconds after which a connection is closed instead of reused
+        check_idle: Ping connections idle for longer than this before reuse
+        timeout: Seconds to wait for a free connection before giving up
+    """
+
+    def __init__(self, connect, minconn=1, maxconn=5, max_age=1800,
+                 check_idle=30, timeout=10):
+        if maxconn < 1 or minconn > maxconn:
+            raise ValueError("Invalid pool size: min=%s max=%s" % (minconn, maxconn))
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.max_age = max_age
+        self.check_idle = check_idle
+        self.timeout = timeout
+
+        self._lock = threading.Condition()
+        self._idle = []          # [(conn, created_at, last_used)], most recent last
+        self._in_use = {}        # id(conn) -> created_at
+        self._reserved = 0       # Slots of connections being opened, pinged or returned
+        self._filled = False
+        self._stats = {
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'connections_recycled': 0,
+            'health_check_failures': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'timeouts': 0,
+        }
+
+    @property
+    def size(self):
+        """Number of open connections (idle + checked out + reserved)."""
+        return len(self._idle) + len(self._in_use) + self._reserved
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _fill(self):
+        """Open the minimum number of idle connections (once per pool)."""
+        with self._lock:
+            if self._filled:
+                return
+            self._filled = True
+            missing = max(0, self.minconn - self.size)
+            self._reserved += missing
+
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._connect())
+        except Exception as e:
+            logger.warning("Could not pre-open pooled connection: %s", e)
+
+        with self._lock:
+            self._reserved -= missing
+            self._stats['connections_opened'] += len(opened)
+            now = time.monotonic()
+            self._idle.extend((conn, now, now) for conn in opened)
+            self._lock.notify_all()
+
+    def _ping(self, conn):
+        """Return True if an idle connection still answers."""
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.info("Discarding pooled connection that failed health check: %s", e)
+            return False
+
+    def getconn(self):
+        """
+        Check out a connection, waiting up to `timeout` seconds if the pool is full.
+
+        Connecting and health-checking happen outside the lock, so a slow
+        connect or a dead connection only holds up the thread that hit it.
+        Meanwhile its slot is reserved, which keeps the pool within maxconn.
+        """
+        self._fill()
+
+        waited_since = None
+        while True:
+            with self._lock:
+                while True:
+                    now = time.monotonic()
+
+                    if self._idle:
+                        conn, created_at, last_used = self._idle.pop()
+                        if conn.closed:
+                            self._stats['connections_closed'] += 1
+                            self._close(conn)
+                            continue
+                        if self.max_age and now - created_at > self.max_age:
+                            self._stats['connections_recycled'] += 1
+                            self._stats['connections_closed'] += 1
+                            self._close(conn)
+                            continue
+                        ping = self.check_idle is not None and now - last_used > self.check_idle
+                        break
+
+                    if self.size < self.maxconn:
+                        conn = created_at = None
+                        break
+
+                    if waited_since is None:
+                        waited_since = now
+                        self._stats['waits'] += 1
+
+                    remaining = self.timeout - (now - waited_since)
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        self._stats['wait_time_total'] += now - waited_since
+                        raise PoolTimeout(
+                            "No database connection available after %ss (max=%s)"
+                            % (self.timeout, self.maxconn)
+                        )
+                    self._lock.wait(remaining)
+
+                self._reserved += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._lock:
+                        self._reserved -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._reserved -= 1
+                    self._stats['connections_opened'] += 1
+                    return self._checkout(conn, time.monotonic(), waited_since)
+
+            if ping and not self._ping(conn):
+                self._close(conn)
+                with self._lock:
+                    self._reserved -= 1
+                    self._stats['health_check_failures'] += 1
+                    self._stats['connections_closed'] += 1
+                    self._lock.notify()
+                continue
+
+            with self._lock:
+                self._reserved -= 1
+                return self._checkout(conn, created_at, waited_since)
+
+    def _checkout(self, conn, created_at, waited_since):
+        self._in_use[id(conn)] = created_at
+        self._stats['checkouts'] += 1
+        if waited_since is not None:
+            self._stats['wait_time_total'] += time.monotonic() - waited_since
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool, rolling back any open transaction."""
+        with self._lock:
+            created_at = self._in_use.pop(id(conn), None)
+            if created_at is not None:
+                self._reserved += 1
+
+        if created_at is None:
+            # Not ours (or already returned) - just close it
+            self._close(conn)
+            with self._lock:
+                self._stats['connections_closed'] += 1
+            return
+
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        now = time.monotonic()
+        recycled = not discard and not conn.closed and bool(self.max_age) and now - created_at > self.max_age
+        keep = not discard and not conn.closed and not recycled
+        if not keep:
+            self._close(conn)
+
+        with self._lock:
+            self._reserved -= 1
+            if keep:
+                self._idle.append((conn, created_at, now))
+            else:
+                self._stats['connections_closed'] += 1
+                if recycled:
+                    self._stats['connections_recycled'] += 1
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it."""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close idle connections and forget checked-out ones."""
+        with self._lock:
+            while self._idle:
+                conn, _, _ = self._idle.pop()
+                self._stats['connections_closed'] += 1
+                self._close(conn)
+            self._in_use.clear()
+            self._filled = False
+            self._lock.notify_all()
+
+    def stats(self):
+        """Snapshot of pool counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['wait_time_total'] = round(stats['wait_time_total'], 4)
+            stats.update({
+                'size': self.size,
+                'idle': len(self._idle),
+                'checked_out': len(self._in_use),
+                'min': self.minconn,
+                'max': self.maxconn,
+            })
+            return stats
+
+
+class TimedCursor:
+    """
+    Cursor proxy that times execute() calls and counts fetched rows.
+
+    Everything else is delegated to the wrapped cursor.
+
+    Args:
+        cursor: DB-API cursor to wrap
+        stats: Dict whose 'db_seconds', 'db_queries' and 'db_rows' entries
+               are incremented, or None to only pass through
+        slow_log: api.query_log.SlowQueryLog for statements over its
+                  threshold, or None
+        context: Label recorded with slow statements (the request route)
+    """
+
+    def __init__(self, cursor, stats=None, slow_log=None, context=None):
+        self._cursor = cursor
+        self._stats = stats
+        self._slow_log = slow_log
+        self._context = context
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._count_rows(1)
+            yield row
+
+    def _count_rows(self, count):
+        if self._stats is not None:
+            self._stats['db_rows'] += count
+
+    def execute(self, query, params=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            if params is None:
+                return self._cursor.execute(query)
+            return self._cursor.execute(query, params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if self._stats is not None:
+                self._stats['db_seconds'] += elapsed
+                self._stats['db_queries'] += 1
+            if self._slow_log is not None and elapsed >= self._slow_log.threshold:
+                self._slow_log.record(self._cursor, query, params, elapsed, self._context, error)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count_rows(len(rows))
+        return rows
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+JSON encoding for the Viriato API.
+
+Serializes rows straight from the database: date, datetime and time
+values become ISO 8601 strings and Decimal becomes a number, so handlers
+don't need per-field conversions. Uses orjson when it is installed and
+the standard library otherwise; set JSON_ENCODER=stdlib to force the
+fallback.
+"""
+
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Encode types the encoders don't handle natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# ASCII-escaped output: the C encoder is faster than a UTF-8 encode() afterwards
+_stdlib_encoder = json.JSONEncoder(separators=(',', ':'), default=_default)
+
+
+def stdlib_dumps(obj):
+    """Serialize to UTF-8 JSON bytes with the json module."""
+    return _stdlib_encoder.encode(obj).encode('utf-8')
+
+
+def orjson_dumps(obj):
+    """Serialize to UTF-8 JSON bytes with orjson."""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+ENCODERS = {'stdlib': stdlib_dumps}
+if orjson is not None:
+    ENCODERS['orjson'] = orjson_dumps
+
+
+def get_encoder(name=None):
+    """
+    Look up an encoder by name ('orjson' or 'stdlib').
+
+    Without a name, JSON_ENCODER is used, defaulting to the fastest
+    available encoder.
+    """
+    name = name or os.environ.get('JSON_ENCODER') or ('orjson' if orjson else 'stdlib')
+    if name not in ENCODERS:
+        raise ValueError(f"JSON encoder {name!r} is not available (have: {', '.join(ENCODERS)})")
+    return ENCODERS[name]
+
+
+dumps = get_encoder()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Request metrics for the Viriato API, in Prometheus text format.
+
+Every gunicorn worker keeps its own counters and histograms and writes
+them to METRICS_DIR as one JSON file per worker PID (at most every few
+seconds, and on every scrape). /api/metrics is answered by whichever
+worker gets the scrape, so it merges all the files: totals cover every
+worker. Files of exited workers are kept so counters never go backwards
+when gunicorn recycles a worker; gunicorn.conf.py clears the directory
+when the server starts.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'viriato_http_request_duration_seconds': (
+        'histogram', 'Time spent handling a request, by route', LATENCY_BUCKETS),
+    'viriato_db_duration_seconds': (
+        'histogram', 'Time spent in database queries per request, by route', LATENCY_BUCKETS),
+    'viriato_serialization_duration_seconds': (
+        'histogram', 'Time spent encoding JSON per request, by route', LATENCY_BUCKETS),
+    'viriato_response_size_bytes': (
+        'histogram', 'Response body size (after compression), by route', SIZE_BUCKETS),
+    'viriato_db_queries_total': (
+        'counter', 'Database queries executed, by route', None),
+    'viriato_db_rows_fetched_total': (
+        'counter', 'Rows fetched from the database, by route', None),
+}
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), 'viriato-metrics')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metrics:
+    """
+    Per-process metric store with file-based aggregation across processes.
+
+    Args:
+        directory: Where each process writes its snapshot
+        flush_interval: Minimum seconds between snapshot writes
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._histograms = {}   # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self._counters = {}     # (name, labels) -> value
+        self._last_flush = 0.0
+
+    def _check_pid(self):
+        # Values inherited from a --preload master belong to the master
+        if self._pid != os.getpid():
+            self._reset()
+
+    def observe(self, name, value, **labels):
+        """Record one observation in a histogram."""
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_pid()
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+
+    def inc(self, name, value=1, **labels):
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_pid()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self):
+        """This process's values, JSON-serializable."""
+        with self._lock:
+            self._check_pid()
+            return {
+                'histograms': [[name, labels, counts] for (name, labels), counts in self._histograms.items()],
+                'counters': [[name, labels, value] for (name, labels), value in self._counters.items()],
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot, at most once per flush_interval unless forced."""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'worker-{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)  # Readers never see a partial file
+
+    def collect(self):
+        """
+        Merge the snapshots of all processes (including this one).
+
+        Returns:
+            tuple: ({(name, labels): counts}, {(name, labels): value})
+        """
+        self.flush(force=True)
+
+        histograms = {}
+        counters = {}
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Removed or being replaced; picked up on the next scrape
+
+            for name, labels, counts in snapshot['histograms']:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged = histograms.setdefault(key, [0] * len(counts))
+                for i, count in enumerate(counts):
+                    merged[i] += count
+            for name, labels, value in snapshot['counters']:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+
+        return histograms, counters
+
+    def render(self):
+        """All processes' metrics in Prometheus text exposition format."""
+        histograms, counters = self.collect()
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'histogram':
+                for (metric, labels), counts in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(buckets, counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(labels, ("le", bound))} {cumulative}')
+                    total = cumulative + counts[len(buckets)]
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {total}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(counts[-1])}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {total}')
+            else:
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+        return '\n'.join(lines) + '\n'
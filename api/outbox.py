@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+Durable outbox for work the API hands off to external services.
+
+Creating a GitHub issue inside /api/feedback would hold the worker for up
+to 10 seconds, so the issue is enqueued here instead and the request
+returns 202 at once. An OutboxDrainer thread in each worker process sends
+queued items in batches, retrying failures with exponential backoff.
+
+PostgresOutbox keeps items in the API's database, so they survive
+restarts and redeploys and are shared by every worker and host. Outbox
+keeps them in a SQLite file shared by the workers on one host, which is
+only as durable as the disk it is on.
+
+A drainer claims a batch by leasing it for `lease_seconds`, then renews
+each item's lease just before sending it. If the batch has run so long
+that another drainer took the item over, the renewal fails and the item
+is skipped, so two workers never send the same item. One send must
+finish within the lease (GitHub calls time out after 10 s). If a worker
+dies mid-send, its lease expires and another worker retries.
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('viriato-api')
+
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class PermanentError(Exception):
+    """Sending can never succeed (e.g. the request was rejected); don't retry."""
+
+
+class Outbox:
+    """
+    Queue of JSON payloads in a SQLite file.
+
+    Args:
+        path: Database file (created on first use)
+        max_attempts: Attempts before an item is marked failed
+        base_delay: Seconds before the first retry; doubled on each attempt
+        max_delay: Cap on the delay between retries
+        lease_seconds: How long a claimed item is hidden from other drainers
+    """
+
+    def __init__(self, path, max_attempts=8, base_delay=30, max_delay=3600, lease_seconds=60):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    lease_until REAL,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at)")
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def enqueue(self, payload, now=None):
+        """Queue a payload for sending. Returns its id."""
+        now = time.time() if now is None else now
+        cursor = self._connection().execute(
+            "INSERT INTO outbox (payload, next_attempt_at, created_at) VALUES (?, ?, ?)",
+            (json.dumps(payload, ensure_ascii=False), now, now))
+        return cursor.lastrowid
+
+    def claim(self, limit=10, now=None):
+        """
+        Lease up to `limit` due items.
+
+        Returns:
+            list: [(id, payload, attempts so far, lease), ...] oldest first;
+                  pass `lease` to renew() before sending the item
+        """
+        now = time.time() if now is None else now
+        lease = now + self.lease_seconds
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("""
+                SELECT id, payload, attempts FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                  AND (lease_until IS NULL OR lease_until <= ?)
+                ORDER BY id
+                LIMIT ?
+            """, (now, now, limit)).fetchall()
+            conn.executemany("UPDATE outbox SET lease_until = ? WHERE id = ?",
+                             [(lease, row[0]) for row in rows])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [(item_id, json.loads(payload), attempts, lease) for item_id, payload, attempts in rows]
+
+    def renew(self, item_id, lease, now=None):
+        """
+        Extend the lease taken by claim(), unless it ran out and another
+        drainer has claimed the item since.
+
+        Returns:
+            float or None: The new lease, or None if the item is no longer ours
+        """
+        now = time.time() if now is None else now
+        renewed = now + self.lease_seconds
+        cursor = self._connection().execute("""
+            UPDATE outbox SET lease_until = ?
+            WHERE id = ? AND status = 'pending' AND lease_until = ?
+        """, (renewed, item_id, lease))
+        return renewed if cursor.rowcount == 1 else None
+
+    def complete(self, item_id, result=None, now=None):
+        """Mark an item sent, keeping the service's result (e.g. the issue number)."""
+        now = time.time() if now is None else now
+        self._connection().execute("""
+            UPDATE outbox SET status = 'sent', attempts = attempts + 1, lease_until = NULL,
+                              result = ?, sent_at = ?, last_error = NULL
+            WHERE id = ?
+        """, (json.dumps(result), now, item_id))
+
+    def fail(self, item_id, error, permanent=False, now=None):
+        """
+        Record a failed attempt: schedule a retry with backoff, or mark the
+        item failed after max_attempts (or at once if `permanent`).
+
+        Returns:
+            str: The item's new status
+        """
+        now = time.time() if now is None else now
+        conn = self._connection()
+        attempts = conn.execute("SELECT attempts FROM outbox WHERE id = ?",
+                                (item_id,)).fetchone()[0] + 1
+        status, delay = self._retry(attempts, permanent)
+        conn.execute("""
+            UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, lease_until = NULL,
+                              last_error = ?
+            WHERE id = ?
+        """, (status, attempts, now + delay, str(error)[:1000], item_id))
+        return status
+
+    def _retry(self, attempts, permanent):
+        """(new status, seconds until the next attempt) after `attempts` failures."""
+        status = FAILED if permanent or attempts >= self.max_attempts else PENDING
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        delay *= random.uniform(0.8, 1.2)  # Spread retries of items that failed together
+        return status, delay
+
+    def get(self, item_id):
+        """One item as a dict, or None."""
+        conn = self._connection()
+        cursor = conn.execute("SELECT * FROM outbox WHERE id = ?", (item_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        item = dict(zip([column[0] for column in cursor.description], row))
+        item['payload'] = json.loads(item['payload'])
+        item['result'] = json.loads(item['result']) if item['result'] is not None else None
+        return item
+
+    def stats(self):
+        """Item counts by status (reported by /api/health)."""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+        counts = {PENDING: 0, SENT: 0, FAILED: 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+
+class PostgresOutbox(Outbox):
+    """
+    The same queue in a PostgreSQL table (created on first use), for hosts
+    without a persistent disk. Drainers in any worker or host claim items
+    with FOR UPDATE SKIP LOCKED, so two never lease the same item.
+
+    Args:
+        connection: Context manager yielding (conn, cursor) with dict rows,
+                    such as api.app.db_connection
+        table: Table holding the items
+        Others as for Outbox
+    """
+
+    def __init__(self, connection, table='feedback_outbox', **kwargs):
+        super().__init__(None, **kwargs)
+        self._db = connection
+        self.table = table
+        self._created = False
+
+    @contextmanager
+    def _cursor(self):
+        """Cursor in a transaction that is committed if the block succeeds."""
+        with self._db() as (conn, cur):
+            if not self._created:
+                # Serialize the first use by several workers
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self.table,))
+                cur.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {self.table} (
+                        id BIGSERIAL PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        next_attempt_at DOUBLE PRECISION NOT NULL,
+                        lease_until DOUBLE PRECISION,
+                        last_error TEXT,
+                        result TEXT,
+                        created_at DOUBLE PRECISION NOT NULL,
+                        sent_at DOUBLE PRECISION
+                    )
+                """)
+                cur.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{self.table}_due
+                        ON {self.table}(status, next_attempt_at)
+                """)
+            yield cur
+            conn.commit()
+        self._created = True
+
+    def enqueue(self, payload, now=None):
+        """Queue a payload for sending. Returns its id."""
+        now = time.time() if now is None else now
+        with self._cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO {self.table} (payload, next_attempt_at, created_at)
+                VALUES (%s, %s, %s)
+                RETURNING id
+            """, (json.dumps(payload, ensure_ascii=False), now, now))
+            return cur.fetchone()['id']
+
+    def claim(self, limit=10, now=None):
+        """Lease up to `limit` due items; see Outbox.claim()."""
+        now = time.time() if now is None else now
+        lease = now + self.lease_seconds
+        with self._cursor() as cur:
+            cur.execute(f"""
+                UPDATE {self.table} SET lease_until = %s
+                WHERE id IN (
+                    SELECT id FROM {self.table}
+                    WHERE status = 'pending' AND next_attempt_at <= %s
+                      AND (lease_until IS NULL OR lease_until <= %s)
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, payload, attempts
+            """, (lease, now, now, limit))
+            rows = sorted(cur.fetchall(), key=lambda row: row['id'])
+        return [(row['id'], json.loads(row['payload']), row['attempts'], lease) for row in rows]
+
+    def renew(self, item_id, lease, now=None):
+        """Extend a lease taken by claim(); see Outbox.renew()."""
+        now = time.time() if now is None else now
+        renewed = now + self.lease_seconds
+        with self._cursor() as cur:
+            cur.execute(f"""
+                UPDATE {self.table} SET lease_until = %s
+                WHERE id = %s AND status = 'pending' AND lease_until = %s
+                RETURNING id
+            """, (renewed, item_id, lease))
+            return renewed if cur.fetchone() is not None else None
+
+    def complete(self, item_id, result=None, now=None):
+        """Mark an item sent, keeping the service's result (e.g. the issue number)."""
+        now = time.time() if now is None else now
+        with self._cursor() as cur:
+            cur.execute(f"""
+                UPDATE {self.table} SET status = 'sent', attempts = attempts + 1, lease_until = NULL,
+                                        result = %s, sent_at = %s, last_error = NULL
+                WHERE id = %s
+            """, (json.dumps(result), now, item_id))
+
+    def fail(self, item_id, error, permanent=False, now=None):
+        """Record a failed attempt; see Outbox.fail()."""
+        now = time.time() if now is None else now
+        with self._cursor() as cur:
+            cur.execute(f"SELECT attempts FROM {self.table} WHERE id = %s FOR UPDATE", (item_id,))
+            attempts = cur.fetchone()['attempts'] + 1
+            status, delay = self._retry(attempts, permanent)
+            cur.execute(f"""
+                UPDATE {self.table} SET status = %s, attempts = %s, next_attempt_at = %s,
+                                        lease_until = NULL, last_error = %s
+                WHERE id = %s
+            """, (status, attempts, now + delay, str(error)[:1000], item_id))
+        return status
+
+    def get(self, item_id):
+        """One item as a dict, or None."""
+        with self._cursor() as cur:
+            cur.execute(f"SELECT * FROM {self.table} WHERE id = %s", (item_id,))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item['payload'] = json.loads(item['payload'])
+        item['result'] = json.loads(item['result']) if item['result'] is not None else None
+        return item
+
+    def stats(self):
+        """Item counts by status (reported by /api/health)."""
+        with self._cursor() as cur:
+            cur.execute(f"SELECT status, COUNT(*) AS count FROM {self.table} GROUP BY status")
+            rows = cur.fetchall()
+        counts = {PENDING: 0, SENT: 0, FAILED: 0}
+        counts.update({row['status']: row['count'] for row in rows})
+        return counts
+
+
+class OutboxDrainer:
+    """
+    Background thread that sends due outbox items.
+
+    Args:
+        outbox: The Outbox to drain
+        send: Callable(payload) -> result; raise to retry later, or
+              PermanentError to give up on the item
+        batch_size: Items claimed per round
+        interval: Seconds between rounds when not woken up
+    """
+
+    def __init__(self, outbox, send, batch_size=10, interval=30):
+        self.outbox = outbox
+        self.send = send
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def drain_once(self, now=None):
+        """
+        Send one batch of due items.
+
+        Returns:
+            int: Items claimed
+        """
+        items = self.outbox.claim(self.batch_size, now=now)
+        for item_id, payload, attempts, lease in items:
+            # Earlier sends may have outlasted the batch's lease
+            if self.outbox.renew(item_id, lease, now=now) is None:
+                logger.info("Outbox item %s was taken over by another drainer", item_id)
+                continue
+            try:
+                result = self.send(payload)
+            except PermanentError as e:
+                self.outbox.fail(item_id, e, permanent=True, now=now)
+                logger.error("Outbox item %s rejected, not retrying: %s", item_id, e)
+            except Exception as e:
+                status = self.outbox.fail(item_id, e, now=now)
+                logger.warning("Outbox item %s failed (attempt %d, now %s): %s",
+                               item_id, attempts + 1, status, e)
+            else:
+                self.outbox.complete(item_id, result, now=now)
+        return len(items)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # Keep going while full batches come back
+                while self.drain_once() == self.batch_size and not self._stop.is_set():
+                    pass
+            except Exception:
+                logger.exception("Outbox drain failed")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start the thread in this process (again after a fork); no-op if running."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='viriato-outbox', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def wake(self):
+        """Drain now instead of at the next interval."""
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        self._thread = None
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Slow-query log for the Viriato API.
+
+TimedCursor (api/db.py) reports every statement slower than
+SLOW_QUERY_MS here. Each one is written as a JSON line to a rotating log
+file, with its parameters and the route that ran it. A sample of them
+also gets an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) plan.
+
+EXPLAIN ANALYZE runs the statement a second time, on the same connection
+and inside a savepoint, so the sample rate bounds the extra load.
+"""
+
+import json
+import logging
+import logging.handlers
+import random
+from datetime import datetime, timezone
+
+from api.encoding import dumps as encode_json
+
+logger = logging.getLogger('viriato-api')
+
+# Only read statements are re-run for a plan
+EXPLAINABLE = ('select', 'with')
+
+
+def _params_for_log(params):
+    try:
+        return json.loads(encode_json(params))
+    except TypeError:
+        return repr(params)
+
+
+class SlowQueryLog:
+    """
+    Writes slow statements to a rotating file.
+
+    Args:
+        path: Log file (rotated at max_bytes, `backups` old files kept)
+        threshold_ms: Statements at least this slow are logged
+        explain_sample: Fraction of logged statements that get a plan (0-1)
+    """
+
+    def __init__(self, path, threshold_ms=500, explain_sample=0.1,
+                 max_bytes=10 * 1024 * 1024, backups=5):
+        self.path = path
+        self.threshold = threshold_ms / 1000
+        self.explain_sample = explain_sample
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._file_logger = None
+
+    def _writer(self):
+        # Opened on first use so importing the app never touches the filesystem
+        if self._file_logger is None:
+            file_logger = logging.getLogger(f'viriato-slow-queries.{id(self)}')
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self._max_bytes, backupCount=self._backups, encoding='utf-8')
+            file_logger.addHandler(handler)
+            self._file_logger = file_logger
+        return self._file_logger
+
+    def explain(self, cursor, query, params):
+        """EXPLAIN ANALYZE `query` on the cursor's connection, or None if not possible."""
+        if not isinstance(query, str) or not query.lstrip().lower().startswith(EXPLAINABLE):
+            return None
+
+        explain_cur = cursor.connection.cursor()
+        try:
+            explain_cur.execute("SAVEPOINT slow_query_explain")
+            try:
+                explain_cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params)
+                row = explain_cur.fetchone()
+                explain_cur.execute("RELEASE SAVEPOINT slow_query_explain")
+            except Exception:
+                # Leave the request's transaction usable
+                explain_cur.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                raise
+            return row[0] if isinstance(row, (list, tuple)) else next(iter(row.values()))
+        finally:
+            explain_cur.close()
+
+    def record(self, cursor, query, params, seconds, endpoint=None, error=None):
+        """
+        Log a statement that took `seconds` (called only above the threshold).
+
+        Failed statements (e.g. cancelled by statement_timeout) are logged
+        with their error and without a plan, since their transaction is
+        already aborted.
+        """
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(seconds * 1000, 1),
+            'endpoint': endpoint,
+            'query': ' '.join(query.split()) if isinstance(query, str) else repr(query),
+            'params': _params_for_log(params),
+        }
+
+        if error is not None:
+            entry['error'] = str(error)
+        elif random.random() < self.explain_sample:
+            try:
+                plan = self.explain(cursor, query, params)
+                if plan is not None:
+                    entry['plan'] = plan
+            except Exception as e:
+                entry['plan_error'] = str(e)
+
+        logger.warning("Slow query (%.0f ms) on %s: %.200s", entry['duration_ms'], endpoint, entry['query'])
+        try:
+            self._writer().info(encode_json(entry).decode('utf-8'))
+        except Exception:
+            logger.exception("Failed to write slow query log")
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Token-bucket rate limiting for the Viriato API.
+
+A bucket holds up to `capacity` tokens and refills continuously at
+capacity / period tokens per second; each request takes one token. A
+client can burst `capacity` requests, then one request per
+period / capacity seconds.
+
+Buckets live in a small SQLite file (RATE_LIMIT_DB) shared by every
+gunicorn worker on the host, so a limit applies per client rather than
+per client per worker. Each check is one primary-key lookup and upsert
+in a short write transaction. A bucket that has refilled completely is
+the same as no bucket, so rows are deleted once they are full again.
+The table only holds clients seen within the last period, and is capped
+at `max_keys` rows.
+
+MemoryBucketStore is the single-process equivalent, an LRU of at most
+`max_keys` buckets.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger('viriato-api')
+
+
+def _refill(tokens, updated, now, capacity, rate):
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _take(tokens, capacity, rate):
+    """Apply one request. Returns (allowed, tokens left, seconds until the next token)."""
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Token buckets for this process only, bounded by LRU eviction.
+
+    Args:
+        max_keys: Buckets kept; the least recently used is evicted first
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> (tokens, updated)
+
+    def take(self, key, capacity, period, now=None):
+        """
+        Take one token from `key`'s bucket.
+
+        Returns:
+            tuple: (allowed, seconds to wait before retrying)
+        """
+        now = time.time() if now is None else now
+        rate = capacity / period
+        with self._lock:
+            state = self._buckets.pop(key, None)
+            tokens = capacity if state is None else _refill(*state, now, capacity, rate)
+            allowed, tokens, retry_after = _take(tokens, capacity, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SqliteBucketStore:
+    """
+    Token buckets shared by all processes using the same SQLite file.
+
+    Args:
+        path: Database file (created on first use)
+        max_keys: Row cap enforced when expired buckets are purged
+        purge_every: Purge full buckets every this many checks (per process)
+        timeout: Seconds to wait for another process's write lock
+    """
+
+    def __init__(self, path, max_keys=100000, purge_every=1000, timeout=1.0):
+        self.path = path
+        self.max_keys = max_keys
+        self.purge_every = purge_every
+        self.timeout = timeout
+        self._local = threading.local()
+        self._checks = 0
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")  # Losing a few buckets on a crash is harmless
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    full_at REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets_full_at ON buckets(full_at)")
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def take(self, key, capacity, period, now=None):
+        """
+        Take one token from `key`'s bucket.
+
+        Returns:
+            tuple: (allowed, seconds to wait before retrying)
+        """
+        now = time.time() if now is None else now
+        rate = capacity / period
+        conn = self._connection()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else _refill(*row, now, capacity, rate)
+            allowed, tokens, retry_after = _take(tokens, capacity, rate)
+            conn.execute("""
+                INSERT INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE
+                SET tokens = excluded.tokens, updated = excluded.updated, full_at = excluded.full_at
+            """, (key, tokens, now, now + (capacity - tokens) / rate))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._checks += 1
+        if self._checks % self.purge_every == 0:
+            self.purge(now)
+        return allowed, retry_after
+
+    def purge(self, now=None):
+        """Delete buckets that have refilled, then the oldest beyond max_keys."""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute("""
+                DELETE FROM buckets WHERE key IN (
+                    SELECT key FROM buckets ORDER BY full_at LIMIT ?
+                )
+            """, (excess,))
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
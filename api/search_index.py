@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory full-text search over iniciativas.
+
+An optional alternative to PostgreSQL full-text search for /api/search
+(SEARCH_BACKEND=memory). The whole dataset is a few thousand initiatives,
+so each worker can hold an inverted index of titles and summaries and
+answer searches without a database round-trip.
+
+Text is lowercased, accent-folded (so 'habitacao' finds 'habitação') and
+stemmed (Snowball Portuguese, the algorithm behind PostgreSQL's
+'portuguese' configuration, when the optional `snowballstemmer` package
+is installed; a light suffix stripper otherwise). Documents are scored
+with BM25 over a weighted term frequency in which title occurrences
+count more than summary ones.
+"""
+
+import bisect
+import logging
+import math
+import re
+import threading
+import unicodedata
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+logger = logging.getLogger('viriato-api')
+
+STOPWORDS = frozenset("""
+    a ao aos as com da das de do dos e em na nas no nos o os ou para pela
+    pelas pelo pelos por que se sem sob sobre um uma umas uns
+""".split())
+
+# Light Portuguese stemming on accent-folded words, used when
+# snowballstemmer is not installed: strip the plural, then one derivational
+# suffix or the final vowel
+_PLURAL_SUFFIXES = [
+    ('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'),
+    ('ns', 'm'), ('res', 'r'), ('zes', 'z'), ('s', ''),
+]
+_SUFFIXES = [
+    ('amento', ''), ('imento', ''), ('acao', ''), ('icao', ''), ('idade', ''),
+    ('mente', ''), ('ismo', ''), ('ista', ''), ('avel', ''), ('ivel', ''),
+    ('a', ''), ('o', ''), ('e', ''),
+]
+_MIN_STEM = 3
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _strip_suffix(word, suffixes):
+    for suffix, replacement in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def _light_stem(word):
+    return _strip_suffix(_strip_suffix(word, _PLURAL_SUFFIXES), _SUFFIXES)
+
+
+if snowballstemmer is not None:
+    _stemmer = snowballstemmer.stemmer('portuguese')
+    stem = _stemmer.stemWord
+else:
+    stem = _light_stem
+
+
+def fold_accents(text):
+    """Remove diacritics: 'habitação' -> 'habitacao'."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def analyze(text):
+    """Split text into index terms (lowercased, accent-folded, stopwords dropped, stemmed)."""
+    terms = []
+    for word in _TOKEN_RE.findall(fold_accents((text or '').lower())):
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        terms.append(stem(word))
+    return terms
+
+
+def parse_query(query):
+    """
+    Parse a to_tsquery-style query into OR groups of terms.
+
+    Supports the operators /api/search clients already send: '&' (or
+    whitespace) for AND, '|' for OR, '!' for NOT and a ':*' suffix for
+    prefix matching. Parentheses are ignored.
+
+    Returns:
+        list: [(required, excluded, prefixes), ...] one tuple per OR group
+    """
+    groups = []
+    for part in query.replace('(', ' ').replace(')', ' ').split('|'):
+        required, excluded, prefixes = [], [], []
+        for raw in re.split(r'[&\s]+', part):
+            negate = raw.startswith('!')
+            raw = raw.lstrip('!')
+            is_prefix = raw.endswith(':*')
+            raw = raw[:-2] if is_prefix else raw.split(':')[0]
+            # Prefixes are stemmed too, as in PostgreSQL
+            for term in analyze(raw):
+                (excluded if negate else prefixes if is_prefix else required).append(term)
+        if required or prefixes:
+            groups.append((required, excluded, prefixes))
+    return groups
+
+
+class SearchIndex:
+    """
+    Immutable inverted index with BM25 scoring.
+
+    Args:
+        documents: Iterable of dicts with 'title', 'summary', 'legislature'
+                   and 'body' (the pre-encoded JSON returned for a hit)
+        title_boost: Weight of a title occurrence relative to a summary one
+        k1, b: BM25 parameters
+    """
+
+    def __init__(self, documents, title_boost=2.5, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._bodies = []
+        self._legislatures = []
+        self._postings = {}     # term -> {doc: weighted term frequency}
+        lengths = []
+
+        for doc, document in enumerate(documents):
+            self._bodies.append(document['body'])
+            self._legislatures.append(document['legislature'])
+
+            frequencies = {}
+            for term in analyze(document['title']):
+                frequencies[term] = frequencies.get(term, 0) + title_boost
+            for term in analyze(document.get('summary')):
+                frequencies[term] = frequencies.get(term, 0) + 1
+            lengths.append(sum(frequencies.values()))
+
+            for term, tf in frequencies.items():
+                self._postings.setdefault(term, {})[doc] = tf
+
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self):
+        return len(self._bodies)
+
+    def _idf(self, term):
+        n = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._bodies) - n + 0.5) / (n + 0.5))
+
+    def _expand(self, prefix):
+        """Vocabulary terms starting with `prefix`."""
+        terms = []
+        for term in self._vocabulary[bisect.bisect_left(self._vocabulary, prefix):]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _score(self, term, docs):
+        idf = self._idf(term)
+        postings = self._postings.get(term, {})
+        scores = {}
+        for doc in docs:
+            tf = postings.get(doc)
+            if tf:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / self._avg_length)
+                scores[doc] = idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query, limit=20, legislature=None):
+        """
+        Rank documents matching a to_tsquery-style query.
+
+        Returns:
+            list: Pre-encoded bodies of the top `limit` hits, best first
+        """
+        scores = {}
+        for required, excluded, prefixes in parse_query(query):
+            # Every required term (and at least one expansion per prefix) must match
+            alternatives = [[term] for term in required]
+            alternatives += [self._expand(prefix) for prefix in prefixes]
+
+            candidates = None
+            for terms in alternatives:
+                docs = set()
+                for term in terms:
+                    docs.update(self._postings.get(term, ()))
+                candidates = docs if candidates is None else candidates & docs
+                if not candidates:
+                    break
+            if not candidates:
+                continue
+
+            for term in excluded:
+                candidates -= set(self._postings.get(term, ()))
+            if legislature:
+                candidates = {doc for doc in candidates if self._legislatures[doc] == legislature}
+
+            for terms in alternatives:
+                for term in terms:
+                    for doc, score in self._score(term, candidates).items():
+                        scores[doc] = scores.get(doc, 0.0) + score
+
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))[:limit]
+        return [self._bodies[doc] for doc in ranked]
+
+
+class SearchEngine:
+    """
+    Holds the current SearchIndex and rebuilds it when the data changes.
+
+    The first request that sees a new dataset version builds the new index
+    and swaps it in with a single reference assignment. Meanwhile other
+    requests keep searching the old index, so they always see one complete
+    index or the other.
+
+    Args:
+        load_documents: Callable returning the documents for SearchIndex
+    """
+
+    def __init__(self, load_documents):
+        self._load_documents = load_documents
+        self._build_lock = threading.Lock()
+        self._index = None
+        self._version = None
+
+    def get(self, version):
+        """Return an index for dataset `version`, building one if needed."""
+        index, built_for = self._index, self._version
+        if index is not None and built_for == version:
+            return index
+
+        if index is not None:
+            if not self._build_lock.acquire(blocking=False):
+                return index  # Another request is rebuilding; serve the old index
+        else:
+            self._build_lock.acquire()
+
+        try:
+            # Another thread may have built it while we waited
+            if self._index is not None and self._version == version:
+                return self._index
+
+            index = SearchIndex(self._load_documents())
+            self._index, self._version = index, version
+            logger.info("Built search index: %d documents (dataset version %s)", len(index), version)
+            return index
+        finally:
+            self._build_lock.release()
+
+    def reset(self):
+        with self._build_lock:
+            self._index = None
+            self._version = None
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Read-only SQLite snapshot backend for the Viriato API.
+
+pipeline/export_sqlite.py writes one SQLite file holding the rendered
+bodies of the responses the frontend loads, each initiative's raw data
+and the search index documents. With DATA_BACKEND=sqlite the API serves
+from that file instead of PostgreSQL, so replicas need no database at
+all. Only those requests can be answered; anything else gets 501.
+
+Each worker thread opens the file read-only and immutable (SQLite takes
+no locks and never checks for writers) and memory-maps it, so every
+worker shares the OS page cache. The exporter replaces the file with an
+atomic rename; the inode is checked every few seconds and connections
+are reopened on the new file when it changes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from api.cache import Version
+
+MMAP_SIZE = 1024 * 1024 * 1024  # Upper bound; SQLite maps at most the file size
+
+
+class SqliteSnapshot:
+    """
+    Per-thread read-only connections to a snapshot file.
+
+    Args:
+        path: SQLite file written by pipeline/export_sqlite.py
+        check_interval: Seconds between checks for a replaced file
+    """
+
+    def __init__(self, path, check_interval=5):
+        self.path = path
+        self.check_interval = check_interval
+        self._local = threading.local()
+        self._inode = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _check_replaced(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                inode = os.stat(self.path).st_ino
+            except OSError:
+                return  # Keep serving the open file until a new one appears
+            if inode != self._inode:
+                self._inode = inode
+                self._generation += 1
+
+    def connection(self):
+        """This thread's connection, reopened if the file was replaced or the process forked."""
+        self._check_replaced()
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'conn', None) is None or local.generation != self._generation or local.pid != pid:
+            if getattr(local, 'conn', None) is not None and local.pid == pid:
+                local.conn.close()
+            uri = f"file:{quote(os.path.abspath(self.path))}?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True)
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            local.conn, local.generation, local.pid = conn, self._generation, pid
+        return local.conn
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def version(self):
+        """Dataset version the file was exported from, as an api.cache.Version."""
+        rows = dict(self.connection().execute("SELECT key, value FROM snapshot_meta"))
+        updated_at = rows.get('dataset_updated_at')
+        return Version(int(rows['dataset_version']),
+                       datetime.fromisoformat(updated_at) if updated_at else None)
+
+    def response(self, path, query, gzipped=False):
+        """Pre-rendered body for (path, canonical query string), or None."""
+        column = 'body_gzip' if gzipped else 'body'
+        row = self.connection().execute(
+            f"SELECT {column} FROM api_responses WHERE path = ? AND query = ?",
+            (path, query)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def iniciativa_raw(self, ini_id):
+        """raw_data JSON (as stored text) of one iniciativa, or None."""
+        row = self.connection().execute(
+            "SELECT raw_data FROM iniciativas WHERE ini_id = ?", (ini_id,)).fetchone()
+        return row[0].encode('utf-8') if row and row[0] is not None else None
+
+    def search_documents(self):
+        """Documents for api.search_index.SearchIndex."""
+        return [{'title': title, 'summary': summary, 'legislature': legislature, 'body': bytes(body)}
+                for title, summary, legislature, body in self.connection().execute(
+                    "SELECT title, summary, legislature, body FROM search_documents ORDER BY rowid")]
+
+    def stats(self):
+        """Summary for /api/health."""
+        conn = self.connection()
+        meta = dict(conn.execute("SELECT key, value FROM snapshot_meta"))
+        return {
+            'path': self.path,
+            'dataset_version': int(meta['dataset_version']),
+            'exported_at': meta.get('exported_at'),
+            'iniciativas_count': conn.execute("SELECT COUNT(*) FROM iniciativas").fetchone()[0],
+            'responses': conn.execute("SELECT COUNT(*) FROM api_responses").fetchone()[0],
+        }
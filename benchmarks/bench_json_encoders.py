@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the API's JSON encoders on real payload shapes.
+
+Builds payloads shaped like the API responses from the sample data in
+data/ and times each encoder in api/encoding.py against the previous
+path (isoformat() per date in the handler + Flask's default json.dumps).
+
+Payloads:
+- iniciativas: /api/iniciativas rows with events (sample scaled to ~6,000 rows)
+- search: 20 /api/iniciativas rows (one /api/search page)
+- agenda: /api/agenda raw_data objects (scaled to ~2,000 events)
+
+Usage:
+    python benchmarks/bench_json_encoders.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Configure UTF-8 output for Windows
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api.encoding import ENCODERS  # noqa: E402
+
+SAMPLE_INICIATIVAS = ROOT / "data" / "samples" / "IniciativasSample.json"
+SAMPLE_AGENDA = ROOT / "data" / "raw" / "AgendaParlamentar_json.txt"
+
+
+def parse_date(value):
+    return date.fromisoformat(value[:10]) if value else None
+
+
+def iniciativa_rows(count):
+    """Rows as the handlers now build them: date objects, no conversion."""
+    with open(SAMPLE_INICIATIVAS, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+
+    rows = []
+    while len(rows) < count:
+        for ini in sample:
+            rows.append({
+                'IniId': ini['IniId'],
+                'IniTitulo': ini['IniTitulo'],
+                'IniTipo': ini['IniTipo'],
+                'IniDescTipo': ini['IniDescTipo'],
+                'IniNr': ini['IniNr'],
+                'IniLeg': ini['IniLeg'],
+                'IniLinkTexto': ini.get('IniLinkTexto'),
+                'IniEventos': [{
+                    'Fase': e.get('Fase'),
+                    'DataFase': parse_date(e.get('DataFase')),
+                    'DescFase': e.get('ObsFase')
+                } for e in ini.get('IniEventos') or []],
+                'IniAutorGruposParlamentares': ini.get('IniAutorGruposParlamentares'),
+                'IniAutorOutros': ini.get('IniAutorOutros'),
+                'DataInicioleg': parse_date(ini.get('DataInicioleg')),
+                '_currentStatus': (ini.get('IniEventos') or [{}])[-1].get('Fase'),
+                '_isCompleted': False,
+                '_summary': None
+            })
+    return rows[:count]
+
+
+def agenda_rows(count):
+    with open(SAMPLE_AGENDA, 'r', encoding='utf-8-sig') as f:
+        sample = json.load(f)
+    return (sample * (count // len(sample) + 1))[:count]
+
+
+def legacy_iniciativas(rows):
+    """What handlers used to do: convert every date before jsonify."""
+    return [dict(row,
+                 DataInicioleg=row['DataInicioleg'].isoformat() if row['DataInicioleg'] else None,
+                 IniEventos=[dict(e, DataFase=e['DataFase'].isoformat() if e['DataFase'] else None)
+                             for e in row['IniEventos']])
+            for row in rows]
+
+
+def legacy_dumps(obj):
+    """Flask's DefaultJSONProvider settings (sorted keys, ASCII-escaped)."""
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def timed(func, repeat):
+    """Best wall time of `repeat` runs, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API JSON encoders")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    iniciativas = iniciativa_rows(6000)
+    payloads = {
+        'iniciativas': (iniciativas, lambda: legacy_iniciativas(iniciativas)),
+        'search': (iniciativas[:20], lambda: legacy_iniciativas(iniciativas[:20])),
+        'agenda': (agenda_rows(2000), None),
+    }
+
+    print("=" * 60)
+    print("JSON Encoder Benchmark")
+    print("=" * 60)
+    print(f"Encoders: {', '.join(ENCODERS)} (best of {args.repeat})\n")
+
+    for name, (payload, legacy_convert) in payloads.items():
+        print(f"{name} ({len(payload):,} rows)")
+
+        if legacy_convert is not None:
+            ms, body = timed(lambda: legacy_dumps(legacy_convert()), args.repeat)
+        else:
+            ms, body = timed(lambda: legacy_dumps(payload), args.repeat)
+        baseline = ms
+        print(f"  {'legacy jsonify':<16} {ms:9.2f} ms  {len(body):>11,} bytes")
+
+        for encoder_name, encode in ENCODERS.items():
+            ms, body = timed(lambda: encode(payload), args.repeat)
+            print(f"  {encoder_name:<16} {ms:9.2f} ms  {len(body):>11,} bytes  "
+                  f"({baseline / ms:.1f}x)")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn settings for the Viriato API.
+
+    gunicorn -c gunicorn.conf.py api.app:app
+
+With preload (the default), the master imports the app and warms it up
+once before forking: it reads the dataset version, fills the response
+cache for the heaviest endpoints and builds the search index (see
+warm_up() in api/app.py). gc.freeze() then moves everything into the
+permanent generation, so the garbage collector in the workers doesn't
+touch those objects and their pages stay shared copy-on-write. Workers
+start ready; /api/ready reports 503 in any worker that hasn't reached the
+database yet.
+
+Environment variables:
+    PORT                - Listen port (default: 8000)
+    WEB_CONCURRENCY     - Worker processes (default: 2)
+    GUNICORN_THREADS    - Threads per worker (default: 1)
+    GUNICORN_PRELOAD    - 1 to warm up once in the master (default), 0 per worker
+"""
+
+import gc
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+timeout = 60
+
+
+def on_starting(server):
+    """Start metrics from zero: drop per-worker files of the previous run (api/metrics.py)."""
+    from api.metrics import DEFAULT_DIRECTORY
+    shutil.rmtree(os.environ.get('METRICS_DIR', DEFAULT_DIRECTORY), ignore_errors=True)
+
+
+def when_ready(server):
+    """Warm up in the master before the first worker is forked."""
+    if not server.cfg.preload_app:
+        return
+    from api.app import warm_up
+    warm_up(close_connections=True)
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    """
+    Workers that didn't inherit a warm master (no preload, or it failed) warm
+    up in the background. Each worker also drains the feedback outbox.
+    """
+    from api.app import ensure_warm, start_feedback_drainer
+    ensure_warm()
+    start_feedback_drainer()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build pre-rendered API snapshots.
+
+Renders the heaviest API payloads once per data load and stores them in
+the api_snapshots table, serialized and gzip-compressed:
+- /api/iniciativas (all legislatures and one per legislature)
+- /api/agenda
+- /api/orgaos/summary
+
+Payloads are rendered through the API's own routes (with snapshots
+disabled), so they are byte-for-byte what the live endpoint would return.
+The API serves a snapshot only while its version matches dataset_version,
+so run this after the loaders:
+
+Usage:
+    python pipeline/load_to_postgres.py
+    python pipeline/load_orgaos.py
+    ...
+    python pipeline/build_snapshots.py
+
+Environment variables:
+    DATABASE_URL - PostgreSQL connection string (required)
+"""
+
+import gzip
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Configure UTF-8 output for Windows
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+import psycopg2
+
+# Try to load .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# The API package lives at the repository root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MIGRATION_FILE = Path(__file__).parent / "migrations" / "005_api_snapshots.sql"
+
+
+def get_db_connection():
+    """Get PostgreSQL database connection from environment."""
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL environment variable not set")
+        sys.exit(1)
+
+    try:
+        conn = psycopg2.connect(database_url)
+        return conn
+    except psycopg2.Error as e:
+        print(f"ERROR: Failed to connect to database: {e}")
+        sys.exit(1)
+
+
+def get_snapshot_targets(conn):
+    """
+    List the (path, params) requests to pre-render.
+
+    Returns:
+        list: [(path, dict of query parameters), ...]
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT DISTINCT legislature FROM iniciativas ORDER BY legislature")
+    legislatures = [row[0] for row in cur.fetchall()]
+    cur.close()
+
+    targets = [('/api/iniciativas', {})]
+    targets.extend(('/api/iniciativas', {'legislature': leg}) for leg in legislatures)
+    targets.append(('/api/agenda', {}))
+    targets.append(('/api/orgaos/summary', {}))
+    return targets
+
+
+def render_snapshots(targets):
+    """
+    Render each target through the Flask app.
+
+    Returns:
+        list: [(path, query, body bytes), ...]
+    """
+    from api.app import app
+
+    app.config['SNAPSHOTS_ENABLED'] = False  # Render live, not from old snapshots
+    client = app.test_client()
+
+    rendered = []
+    for path, params in targets:
+        response = client.get(path, query_string=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} {params} returned {response.status_code}: "
+                               f"{response.get_data(as_text=True)[:200]}")
+
+        query = urlencode(sorted(params.items()))
+        rendered.append((path, query, response.get_data()))
+    return rendered
+
+
+def store_snapshots(conn, version, rendered):
+    """Replace all snapshots with the freshly rendered ones."""
+    cur = conn.cursor()
+
+    with open(MIGRATION_FILE, 'r', encoding='utf-8') as f:
+        cur.execute(f.read())
+
+    cur.execute("DELETE FROM api_snapshots")
+
+    total_raw = 0
+    total_gzip = 0
+    for path, query, body in rendered:
+        body_gzip = gzip.compress(body, compresslevel=9)
+        total_raw += len(body)
+        total_gzip += len(body_gzip)
+
+        cur.execute("""
+            INSERT INTO api_snapshots (path, query, version, body, body_gzip)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (path, query, version, psycopg2.Binary(body), psycopg2.Binary(body_gzip)))
+
+        label = f"{path}?{query}" if query else path
+        print(f"  ✓ {label}: {len(body):,} bytes ({len(body_gzip):,} gzipped)")
+
+    conn.commit()
+    cur.close()
+
+    print(f"\n  TOTAL: {total_raw:,} bytes ({total_gzip:,} gzipped)")
+
+
+def main():
+    """Main entry point."""
+    print("=" * 60)
+    print("Building API Snapshots")
+    print("=" * 60)
+
+    conn = get_db_connection()
+    print("Connected to database")
+
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT version FROM dataset_version WHERE id = 1")
+        row = cur.fetchone()
+        cur.close()
+        if not row:
+            print("ERROR: No dataset version found - run the loaders first")
+            sys.exit(1)
+        version = row[0]
+        print(f"Dataset version: {version}")
+
+        targets = get_snapshot_targets(conn)
+        print(f"\nRendering {len(targets)} snapshots...")
+        rendered = render_snapshots(targets)
+
+        print("\nStoring snapshots...")
+        store_snapshots(conn, version, rendered)
+
+        print("\nDone!")
+
+    except Exception as e:
+        print(f"ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Dataset version stamp shared by the pipeline loaders.
+
+The API caches responses per dataset version (see api/cache.py), so every
+loader that changes data the API serves must call bump_dataset_version()
+after committing its changes.
+"""
+
+
+def bump_dataset_version(conn, source):
+    """
+    Increment the dataset version so API caches are invalidated.
+
+    Args:
+        conn: Open psycopg2 connection
+        source: Name of the loader, recorded for debugging
+
+    Returns:
+        int: The new version number
+    """
+    cur = conn.cursor()
+
+    # Same DDL as migrations/003_dataset_version.sql, in case it wasn't applied
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS dataset_version (
+            id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            version BIGINT NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            source VARCHAR(100)
+        )
+    """)
+    cur.execute("""
+        INSERT INTO dataset_version (id, version, updated_at, source)
+        VALUES (1, 1, NOW(), %s)
+        ON CONFLICT (id) DO UPDATE SET
+            version = dataset_version.version + 1,
+            updated_at = NOW(),
+            source = EXCLUDED.source
+        RETURNING version
+    """, (source,))
+    version = cur.fetchone()[0]
+
+    conn.commit()
+    cur.close()
+
+    print(f"✓ Dataset version bumped to {version} ({source})")
+    return version
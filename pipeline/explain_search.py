@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare /api/search query plans before and after the stored search vector.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the previous query (to_tsvector() on
+title and summary in WHERE and ts_rank) and the current one (stored
+search_vector, single GIN index, ts_rank_cd) over a few search terms, and
+prints execution time and the top plan node of each.
+
+For a fair "before" number, run it once before applying
+migrations/009_iniciativas_search_vector.sql (the old expression indexes
+still exist; the "after" query is skipped if search_vector is missing),
+then again after.
+
+Usage:
+    python pipeline/explain_search.py [--runs 5] [term ...]
+
+Environment variables:
+    DATABASE_URL - PostgreSQL connection string (required)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+
+# Configure UTF-8 output for Windows
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+import psycopg2
+
+# Try to load .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+DEFAULT_TERMS = ['saude', 'habitacao', 'ensino & superior', 'trabalho', 'ambiente']
+
+BEFORE_QUERY = """
+    SELECT id,
+           GREATEST(
+               ts_rank(to_tsvector('portuguese', COALESCE(title, '')), query) * 2,
+               ts_rank(to_tsvector('portuguese', COALESCE(summary, '')), query)
+           ) AS rank
+    FROM iniciativas, to_tsquery('portuguese', %s) AS query
+    WHERE (to_tsvector('portuguese', title) @@ query
+       OR to_tsvector('portuguese', COALESCE(summary, '')) @@ query)
+    ORDER BY rank DESC
+    LIMIT 20
+"""
+
+AFTER_QUERY = """
+    SELECT id, ts_rank_cd(search_vector, query) AS rank
+    FROM iniciativas, to_tsquery('portuguese', %s) AS query
+    WHERE search_vector @@ query
+    ORDER BY rank DESC
+    LIMIT 20
+"""
+
+
+def get_db_connection():
+    """Get PostgreSQL database connection from environment."""
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL environment variable not set")
+        sys.exit(1)
+
+    try:
+        return psycopg2.connect(database_url)
+    except psycopg2.Error as e:
+        print(f"ERROR: Failed to connect to database: {e}")
+        sys.exit(1)
+
+
+def explain(cur, query, term, runs):
+    """
+    Run EXPLAIN ANALYZE `runs` times.
+
+    Returns:
+        tuple: (median execution ms, top plan node description)
+    """
+    times = []
+    node = None
+    for _ in range(runs):
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, (term,))
+        plan = cur.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plan = plan[0]
+        times.append(plan['Execution Time'])
+        node = describe_scan(plan['Plan'])
+    return statistics.median(times), node
+
+
+def describe_scan(plan):
+    """Find the scan over iniciativas in a plan tree."""
+    if plan.get('Relation Name') == 'iniciativas':
+        index = plan.get('Index Name')
+        return f"{plan['Node Type']}" + (f" using {index}" if index else "")
+    for child in plan.get('Plans', []):
+        found = describe_scan(child)
+        if found:
+            return found
+    return plan['Node Type']
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE /api/search queries")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per query (median reported)")
+    parser.add_argument('terms', nargs='*', default=DEFAULT_TERMS, help="tsquery terms")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    cur.execute("SELECT COUNT(*), string_agg(DISTINCT legislature, ',') FROM iniciativas")
+    count, legislatures = cur.fetchone()
+    cur.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'iniciativas' AND column_name = 'search_vector'
+    """)
+    has_vector = cur.fetchone() is not None
+
+    print("=" * 60)
+    print("/api/search EXPLAIN ANALYZE")
+    print("=" * 60)
+    print(f"{count:,} iniciativas ({legislatures}), median of {args.runs} runs\n")
+
+    for term in args.terms:
+        before_ms, before_node = explain(cur, BEFORE_QUERY, term, args.runs)
+        print(f"'{term}'")
+        print(f"  before: {before_ms:8.2f} ms  {before_node}")
+        if has_vector:
+            after_ms, after_node = explain(cur, AFTER_QUERY, term, args.runs)
+            print(f"  after:  {after_ms:8.2f} ms  {after_node}  ({before_ms / after_ms:.1f}x)")
+        else:
+            print("  after:  skipped (apply migrations/009_iniciativas_search_vector.sql)")
+        conn.rollback()
+
+    cur.close()
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export a read-only SQLite snapshot for the API.
+
+Writes one SQLite file that lets the API run with DATA_BACKEND=sqlite and
+no PostgreSQL connection at all:
+- the rendered body (plain and gzipped) of every response the frontend
+  loads: the build_snapshots.py payloads plus legislatures, stats, phase
+  counts, committees (list, by type, summary, and each committee page),
+  each agenda event's linked initiatives, and deputies for every
+  legislature and situation, alone or with one party or circulo filter
+- each initiative's raw_data, for /api/iniciativas/<ini_id>
+- the pre-encoded documents for the in-memory search index
+
+That is all the backend serves: requests with other parameters
+(pagination, fields=, agenda date ranges, party and circulo together,
+change feeds, suggestions) get 501, so it can stand in for PostgreSQL
+behind the frontend but not for every API client.
+
+Responses are rendered through the API's own routes, so they are
+byte-for-byte what the live endpoint returns. The file is built next to
+the target and moved into place atomically, so workers serving the old
+file are never interrupted. Run it after the loaders:
+
+Usage:
+    python pipeline/load_to_postgres.py
+    ...
+    python pipeline/export_sqlite.py [output path]
+
+Environment variables:
+    DATABASE_URL    - PostgreSQL connection string (required)
+    SQLITE_SNAPSHOT - Output path (default: data/api_snapshot.sqlite3)
+"""
+
+import gzip
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Configure UTF-8 output for Windows
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+from build_snapshots import get_db_connection, get_snapshot_targets, render_snapshots
+
+# Try to load .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# Responses are rendered from PostgreSQL, never from a previous export
+os.environ['DATA_BACKEND'] = 'postgres'
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "data" / "api_snapshot.sqlite3"
+
+
+def export_iniciativas(pg_conn, db):
+    """Copy each iniciativa's raw_data, served as /api/iniciativas/<ini_id>."""
+    db.execute("CREATE TABLE iniciativas (ini_id TEXT PRIMARY KEY, raw_data TEXT) WITHOUT ROWID")
+
+    pg_cur = pg_conn.cursor()
+    pg_cur.execute("SELECT ini_id, raw_data::text FROM iniciativas")
+    count = 0
+    while True:
+        rows = pg_cur.fetchmany(5000)
+        if not rows:
+            break
+        db.executemany("INSERT INTO iniciativas VALUES (?, ?)", rows)
+        count += len(rows)
+    pg_cur.close()
+    print(f"  ✓ {count:,} iniciativas")
+
+
+def get_export_targets(pg_conn):
+    """
+    Requests to pre-render: the build_snapshots.py targets plus the other
+    pages the frontend loads.
+
+    Returns:
+        list: [(path, dict of query parameters), ...]
+    """
+    targets = get_snapshot_targets(pg_conn)
+    legislatures = [params['legislature'] for path, params in targets
+                    if path == '/api/iniciativas' and params]
+
+    targets.append(('/api/legislatures', {}))
+    targets.append(('/api/stats', {}))
+    targets.extend(('/api/stats', {'legislature': leg}) for leg in legislatures)
+    targets.append(('/api/phase-counts', {}))
+    targets.extend(('/api/phase-counts', {'legislature': leg}) for leg in legislatures)
+    targets.append(('/api/orgaos', {}))
+
+    cur = pg_conn.cursor()
+    cur.execute("SELECT DISTINCT org_type FROM orgaos WHERE org_type IS NOT NULL ORDER BY org_type")
+    targets.extend(('/api/orgaos', {'type': row[0]}) for row in cur.fetchall())
+    targets.extend(get_deputados_targets(cur))
+    cur.execute("SELECT org_id FROM orgaos ORDER BY org_id")
+    targets.extend((f'/api/orgaos/{row[0]}', {}) for row in cur.fetchall())
+    cur.execute("SELECT event_id FROM agenda_events ORDER BY event_id")
+    targets.extend((f'/api/agenda/{row[0]}/initiatives', {}) for row in cur.fetchall())
+    cur.close()
+
+    return targets
+
+
+def get_deputados_targets(cur):
+    """
+    /api/deputados filter variants: every legislature and situation, and
+    each party or circulo on its own for the serving and all situations.
+    Parameters are spelled out in full, defaults included, as the API's
+    deputados_query_string() looks them up.
+    """
+    cur.execute("""
+        SELECT legislature, 'situation' AS name, situation AS value FROM deputados
+        UNION SELECT legislature, 'party', party FROM deputados
+        UNION SELECT legislature, 'circulo', circulo FROM deputados
+        ORDER BY 1, 2, 3
+    """)
+    values = {}
+    for legislature, name, value in cur.fetchall():
+        if value:
+            values.setdefault(legislature, {}).setdefault(name, []).append(value)
+
+    targets = []
+    for legislature, by_name in values.items():
+        for situation in ['serving', 'all'] + by_name.get('situation', []):
+            targets.append(('/api/deputados', {'legislature': legislature, 'situation': situation}))
+        for situation in ('serving', 'all'):
+            for name in ('party', 'circulo'):
+                targets.extend(('/api/deputados', {'legislature': legislature, 'situation': situation,
+                                                   name: value})
+                               for value in by_name.get(name, []))
+    return targets
+
+
+def export_responses(db, rendered):
+    """Store rendered responses as (path, query) -> body, body_gzip."""
+    db.execute("""
+        CREATE TABLE api_responses (
+            path TEXT NOT NULL,
+            query TEXT NOT NULL,
+            body BLOB NOT NULL,
+            body_gzip BLOB NOT NULL,
+            PRIMARY KEY (path, query)
+        )
+    """)
+    total = 0
+    for path, query, body in rendered:
+        db.execute("INSERT INTO api_responses VALUES (?, ?, ?, ?)",
+                   (path, query, body, gzip.compress(body, compresslevel=9)))
+        total += len(body)
+    print(f"  ✓ {len(rendered):,} responses ({total:,} bytes)")
+
+
+def export_search_documents(db):
+    """Store the in-memory search index documents, encoded by the API."""
+    from api.app import load_search_documents
+
+    db.execute("""
+        CREATE TABLE search_documents (
+            title TEXT, summary TEXT, legislature TEXT, body BLOB NOT NULL
+        )
+    """)
+    documents = load_search_documents()
+    db.executemany("INSERT INTO search_documents VALUES (?, ?, ?, ?)",
+                   [(d['title'], d['summary'], d['legislature'], d['body']) for d in documents])
+    print(f"  ✓ {len(documents):,} search documents")
+
+
+def main():
+    """Main entry point."""
+    output = Path(sys.argv[1] if len(sys.argv) > 1 else os.environ.get('SQLITE_SNAPSHOT', DEFAULT_OUTPUT))
+
+    print("=" * 60)
+    print("Exporting SQLite API Snapshot")
+    print("=" * 60)
+
+    pg_conn = get_db_connection()
+    print("Connected to database")
+
+    tmp_output = output.with_name(output.name + '.tmp')
+    if tmp_output.exists():
+        tmp_output.unlink()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(tmp_output)
+
+    try:
+        cur = pg_conn.cursor()
+        cur.execute("SELECT version, updated_at FROM dataset_version WHERE id = 1")
+        row = cur.fetchone()
+        cur.close()
+        if not row:
+            print("ERROR: No dataset version found - run the loaders first")
+            sys.exit(1)
+        version, updated_at = row
+        print(f"Dataset version: {version}")
+
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+        db.executemany("INSERT INTO snapshot_meta VALUES (?, ?)", [
+            ('dataset_version', str(version)),
+            ('dataset_updated_at', updated_at.isoformat()),
+            ('exported_at', datetime.now().isoformat()),
+        ])
+
+        print("\nCopying initiatives...")
+        export_iniciativas(pg_conn, db)
+
+        targets = get_export_targets(pg_conn)
+        print(f"\nRendering {len(targets):,} responses...")
+        export_responses(db, render_snapshots(targets))
+
+        print("\nEncoding search documents...")
+        export_search_documents(db)
+
+        db.commit()
+        db.execute("ANALYZE")
+        db.execute("VACUUM")
+        db.close()
+
+        os.replace(tmp_output, output)
+        print(f"\n✓ Wrote {output} ({output.stat().st_size:,} bytes)")
+
+    except Exception as e:
+        print(f"ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        db.close()
+        if tmp_output.exists():
+            tmp_output.unlink()
+        sys.exit(1)
+    finally:
+        pg_conn.close()
+
+
+if __name__ == '__main__':
+    main()
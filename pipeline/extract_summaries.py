@@ -23,6 +23,7 @@ import re
 import sys
 import time
 from datetime import datetime
+from pathlib import Path
 
 # Try to load .env file
 try:
@@ -33,6 +34,8 @@ except ImportError:
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+
+from dataset_version import bump_dataset_version
 import requests
 
 try:
@@ -42,6 +45,8 @@ except ImportError:
     sys.exit(1)
 
 
+SEARCH_VECTOR_MIGRATION = Path(__file__).parent / "migrations" / "009_iniciativas_search_vector.sql"
+
 # Placeholder for failed extractions
 EXTRACTION_FAILED_PLACEHOLDER = "[Extracao nao disponivel] - consulte o link para o documento oficial abaixo."
 
@@ -82,20 +87,10 @@ def ensure_schema(conn):
             conn.commit()
             print("Schema updated.")
 
-        # Check if FTS index exists
-        cur.execute("""
-            SELECT indexname FROM pg_indexes
-            WHERE tablename = 'iniciativas' AND indexname = 'idx_ini_summary_fts'
-        """)
-
-        if not cur.fetchone():
-            print("Creating full-text search index on summary...")
-            cur.execute("""
-                CREATE INDEX idx_ini_summary_fts
-                ON iniciativas USING GIN(to_tsvector('portuguese', COALESCE(summary, '')));
-            """)
-            conn.commit()
-            print("FTS index created.")
+        # Stored search vector + GIN index used by /api/search (idempotent)
+        with open(SEARCH_VECTOR_MIGRATION, 'r', encoding='utf-8') as f:
+            cur.execute(f.read())
+        conn.commit()
 
 
 def get_initiatives_to_process(conn, legislature=None, limit=None):
@@ -226,7 +221,7 @@ def update_initiative_summary(conn, initiative_id: int, summary: str):
     with conn.cursor() as cur:
         cur.execute("""
             UPDATE iniciativas
-            SET summary = %s, summary_extracted_at = %s
+            SET summary = %s, summary_extracted_at = %s, updated_at = NOW()
             WHERE id = %s
         """, (summary, datetime.now(), initiative_id))
     conn.commit()
@@ -344,6 +339,10 @@ def main():
         for error_type, count in sorted(stats['errors'].items(), key=lambda x: -x[1]):
             print(f"  {error_type}: {count}")
 
+    # Summaries are served by /api/iniciativas - invalidate API caches
+    if not args.dry_run:
+        bump_dataset_version(conn, 'extract_summaries')
+
     conn.close()
     print("\nDone!")
 
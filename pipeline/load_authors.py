@@ -28,6 +28,8 @@ if sys.platform == 'win32':
 
 import psycopg2
 
+from dataset_version import bump_dataset_version
+
 # Try to load .env file
 try:
     from dotenv import load_dotenv
@@ -391,6 +393,9 @@ def main():
         # Print summary
         print_summary(conn)
 
+        # Invalidate API response caches
+        bump_dataset_version(conn, 'load_authors')
+
         print("\nDone!")
 
     except Exception as e:
@@ -30,6 +30,8 @@ if sys.platform == 'win32':
 import psycopg2
 from psycopg2.extras import Json
 
+from dataset_version import bump_dataset_version
+
 # Try to load .env file
 try:
     from dotenv import load_dotenv
@@ -39,6 +41,7 @@ except ImportError:
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data" / "raw"
+CHANGE_FEED_MIGRATION = Path(__file__).parent / "migrations" / "012_change_feed.sql"
 
 # Only XVII for now - other legislatures on hold
 LEGISLATURE_FILES = {
@@ -260,7 +263,21 @@ def insert_committee_links(conn, links):
                     vote_date = EXCLUDED.vote_date,
                     has_documents = EXCLUDED.has_documents,
                     document_count = EXCLUDED.document_count,
-                    raw_data = EXCLUDED.raw_data
+                    raw_data = EXCLUDED.raw_data,
+                    updated_at = NOW()
+                WHERE (
+                    iniciativa_comissao.orgao_id, iniciativa_comissao.distribution_date,
+                    iniciativa_comissao.has_rapporteur, iniciativa_comissao.has_vote,
+                    iniciativa_comissao.vote_result, iniciativa_comissao.vote_date,
+                    iniciativa_comissao.has_documents, iniciativa_comissao.document_count,
+                    iniciativa_comissao.raw_data
+                ) IS DISTINCT FROM (
+                    EXCLUDED.orgao_id, EXCLUDED.distribution_date,
+                    EXCLUDED.has_rapporteur, EXCLUDED.has_vote,
+                    EXCLUDED.vote_result, EXCLUDED.vote_date,
+                    EXCLUDED.has_documents, EXCLUDED.document_count,
+                    EXCLUDED.raw_data
+                )
             """, (
                 link['iniciativa_id'], link['orgao_id'], link['committee_name'],
                 link['committee_api_id'], link['link_type'], link['phase_code'],
@@ -450,6 +467,13 @@ def main():
     print("Connected to database")
 
     try:
+        # updated_at on iniciativa_comissao (idempotent)
+        cur = conn.cursor()
+        with open(CHANGE_FEED_MIGRATION, 'r', encoding='utf-8') as f:
+            cur.execute(f.read())
+        conn.commit()
+        cur.close()
+
         # Load mappings
         print("\nLoading reference data...")
         orgao_map = load_orgao_id_map(conn)
@@ -465,6 +489,9 @@ def main():
         # Print summary
         print_summary(conn)
 
+        # Invalidate API response caches
+        bump_dataset_version(conn, 'load_committee_links')
+
         print("\nDone!")
 
     except Exception as e:
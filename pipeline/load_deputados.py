@@ -32,6 +32,8 @@ if sys.platform == 'win32':
 import psycopg2
 from psycopg2.extras import execute_values
 
+from dataset_version import bump_dataset_version
+
 # Try to load .env file
 try:
     from dotenv import load_dotenv
@@ -429,6 +431,9 @@ def main():
         # Print summary
         print_summary(conn)
 
+        # Invalidate API response caches
+        bump_dataset_version(conn, 'load_deputados')
+
     finally:
         conn.close()
 
@@ -29,6 +29,9 @@ if sys.platform == 'win32':
 import psycopg2
 from psycopg2.extras import execute_values, Json
 
+from dataset_version import bump_dataset_version
+from orgao_links import relink_agenda_orgaos
+
 # Try to load .env file
 try:
     from dotenv import load_dotenv
@@ -403,9 +406,17 @@ def main():
         # Insert members
         insert_members(conn, orgaos, org_id_map)
 
+        # Link agenda events loaded before these committees
+        linked, unresolved = relink_agenda_orgaos(conn)
+        conn.commit()
+        print(f"Agenda events linked to orgaos: {linked} ({len(unresolved)} committee names unresolved)")
+
         # Print summary
         print_summary(conn)
 
+        # Invalidate API response caches
+        bump_dataset_version(conn, 'load_orgaos')
+
         print("\nDone!")
 
     except Exception as e:
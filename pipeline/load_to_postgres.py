@@ -9,7 +9,10 @@ Loads data from JSON files in data/raw/ into PostgreSQL tables:
 - agenda_events
 
 Usage:
-    python scripts/load_to_postgres.py
+    python scripts/load_to_postgres.py [--prune]
+
+    --prune  Also delete initiatives that are no longer in their
+             legislature's source file
 
 Environment variables:
     DATABASE_URL - PostgreSQL connection string (required)
@@ -20,6 +23,7 @@ Example:
     python scripts/load_to_postgres.py
 """
 
+import argparse
 import json
 import os
 import sys
@@ -38,6 +42,9 @@ import psycopg2
 from psycopg2.extras import execute_values
 from psycopg2 import sql
 
+from dataset_version import bump_dataset_version
+from orgao_links import build_orgao_lookup, ensure_agenda_orgao_column, resolve_orgao_id
+
 # Try to load .env file
 try:
     from dotenv import load_dotenv
@@ -119,6 +126,29 @@ def extract_author(ini_json):
     return (None, None)
 
 
+# Final phases and the category they put an initiative in; any other
+# phase means the initiative is still in progress
+STATUS_CATEGORIES = {
+    'Lei (Publicação DR)': 'approved',
+    'Resolução da AR (Publicação DR)': 'approved',
+    'Rejeitado': 'rejected',
+    'Retirada da iniciativa': 'rejected',
+    'Caducado': 'rejected'
+}
+
+KEYSET_INDEX_MIGRATION = Path(__file__).parent / "migrations" / "004_iniciativas_keyset_index.sql"
+STATUS_CATEGORY_MIGRATION = Path(__file__).parent / "migrations" / "006_iniciativas_status_category.sql"
+STATS_VIEW_MIGRATION = Path(__file__).parent / "migrations" / "007_stats_materialized_view.sql"
+PHASE_HISTOGRAM_MIGRATION = Path(__file__).parent / "migrations" / "008_phase_histogram.sql"
+SEARCH_VECTOR_MIGRATION = Path(__file__).parent / "migrations" / "009_iniciativas_search_vector.sql"
+SUGGEST_INDEX_MIGRATION = Path(__file__).parent / "migrations" / "010_suggest_trigram_indexes.sql"
+CHANGE_FEED_MIGRATION = Path(__file__).parent / "migrations" / "012_change_feed.sql"
+
+# --prune deletes nothing in a legislature whose file is missing more than
+# this share of the initiatives in the database
+PRUNE_MAX_SHARE = 0.1
+
+
 def transform_iniciativa(ini_json):
     """
     Transform IniciativasXVII JSON to database row.
@@ -134,21 +164,14 @@ def transform_iniciativa(ini_json):
 
     current_status = None
     current_phase_code = None
-    is_completed = False
 
     if latest_event:
         current_status = latest_event.get('Fase')
         current_phase_code = latest_event.get('CodigoFase')
 
-        # Check if completed
-        completed_phases = [
-            'Lei (Publicação DR)',
-            'Resolução da AR (Publicação DR)',
-            'Rejeitado',
-            'Retirada da iniciativa',
-            'Caducado'
-        ]
-        is_completed = current_status in completed_phases
+    # Completed = reached one of the final phases
+    status_category = STATUS_CATEGORIES.get(current_status, 'in_progress')
+    is_completed = current_status in STATUS_CATEGORIES
 
     return {
         'ini_id': ini_json['IniId'],
@@ -164,6 +187,7 @@ def transform_iniciativa(ini_json):
         'current_status': current_status,
         'current_phase_code': current_phase_code,
         'is_completed': is_completed,
+        'status_category': status_category,
         'text_link': ini_json.get('IniLinkTexto'),
         'raw_data': json.dumps(ini_json)
     }
@@ -207,6 +231,31 @@ def transform_iniciativa_events(ini_id, ini_json):
     return rows
 
 
+def build_phase_histogram(events, legislature_by_ini_id):
+    """
+    Count distinct initiatives per (legislature, phase).
+
+    Args:
+        events: Rows from transform_iniciativa_events()
+        legislature_by_ini_id: ini_id -> legislature
+
+    Returns:
+        dict: {(legislature, phase_name): number of initiatives}
+    """
+    seen = set()
+    histogram = {}
+    for event in events:
+        legislature = legislature_by_ini_id.get(event['ini_id'])
+        if legislature is None:
+            continue
+        key = (legislature, event['phase_name'])
+        if (key, event['ini_id']) in seen:
+            continue
+        seen.add((key, event['ini_id']))
+        histogram[key] = histogram.get(key, 0) + 1
+    return histogram
+
+
 def transform_agenda_event(agenda_json):
     """
     Transform AgendaParlamentar JSON to database row.
@@ -257,15 +306,40 @@ def transform_agenda_event(agenda_json):
     }
 
 
-def load_iniciativas(conn):
-    """Load iniciativas and their events from all legislature files."""
+def load_iniciativas(conn, prune=False):
+    """
+    Load iniciativas and their events from all legislature files.
+
+    With prune=True, also delete initiatives missing from their
+    legislature's file (unless too many are missing, see PRUNE_MAX_SHARE).
+    """
     print(f"\n=== Loading Iniciativas (All Legislatures) ===")
 
     cur = conn.cursor()
 
+    # Make sure the keyset pagination indexes behind /api/iniciativas?cursor=,
+    # the status_category column, the search_vector column behind
+    # /api/search (built from the summary columns that extract_summaries.py
+    # fills in), the pg_trgm indexes behind /api/search/suggest and change
+    # feed support exist (idempotent; 012 replaces the status trigger from
+    # 006, so order matters)
+    cur.execute("""
+        ALTER TABLE iniciativas ADD COLUMN IF NOT EXISTS summary TEXT;
+        ALTER TABLE iniciativas ADD COLUMN IF NOT EXISTS summary_extracted_at TIMESTAMP;
+    """)
+    for migration in (KEYSET_INDEX_MIGRATION, STATUS_CATEGORY_MIGRATION, SEARCH_VECTOR_MIGRATION,
+                      SUGGEST_INDEX_MIGRATION, CHANGE_FEED_MIGRATION):
+        with open(migration, 'r', encoding='utf-8') as f:
+            cur.execute(f.read())
+
+    # Events are reloaded wholesale below and the status is set from the
+    # source data, so the per-event status trigger only adds noise
+    cur.execute("SET LOCAL viriato.bulk_load = 'on'")
+
     # Prepare data for all legislatures
     all_iniciativas_data = []
     all_events = []
+    loaded_legislatures = []
 
     # Process each legislature file
     for iniciativas_file in INICIATIVAS_FILES:
@@ -295,6 +369,7 @@ def load_iniciativas(conn):
             legislature_count += 1
 
         print(f"  ✓ Processed {legislature_count:,} iniciativas from {legislature}")
+        loaded_legislatures.append(legislature)
 
     print(f"\n  TOTAL: {len(all_iniciativas_data):,} iniciativas across all legislatures")
     print(f"  TOTAL: {len(all_events):,} events")
@@ -306,7 +381,8 @@ def load_iniciativas(conn):
         INSERT INTO iniciativas (
             ini_id, legislature, number, type, type_description,
             title, author_type, author_name, start_date, end_date,
-            current_status, current_phase_code, is_completed, text_link, raw_data
+            current_status, current_phase_code, is_completed, status_category,
+            text_link, raw_data
         ) VALUES %s
         ON CONFLICT (ini_id)
         DO UPDATE SET
@@ -322,10 +398,26 @@ def load_iniciativas(conn):
             current_status = EXCLUDED.current_status,
             current_phase_code = EXCLUDED.current_phase_code,
             is_completed = EXCLUDED.is_completed,
+            status_category = EXCLUDED.status_category,
             text_link = EXCLUDED.text_link,
             raw_data = EXCLUDED.raw_data,
             updated_at = NOW()
-        RETURNING id, ini_id
+        -- Unchanged rows keep their updated_at (the change feed relies on it)
+        WHERE (
+            iniciativas.legislature, iniciativas.number, iniciativas.type,
+            iniciativas.type_description, iniciativas.title, iniciativas.author_type,
+            iniciativas.author_name, iniciativas.start_date, iniciativas.end_date,
+            iniciativas.current_status, iniciativas.current_phase_code,
+            iniciativas.is_completed, iniciativas.status_category,
+            iniciativas.text_link, iniciativas.raw_data
+        ) IS DISTINCT FROM (
+            EXCLUDED.legislature, EXCLUDED.number, EXCLUDED.type,
+            EXCLUDED.type_description, EXCLUDED.title, EXCLUDED.author_type,
+            EXCLUDED.author_name, EXCLUDED.start_date, EXCLUDED.end_date,
+            EXCLUDED.current_status, EXCLUDED.current_phase_code,
+            EXCLUDED.is_completed, EXCLUDED.status_category,
+            EXCLUDED.text_link, EXCLUDED.raw_data
+        )
     """
 
     values = [
@@ -334,13 +426,45 @@ def load_iniciativas(conn):
             row['type_description'], row['title'], row['author_type'],
             row['author_name'], row['start_date'], row['end_date'],
             row['current_status'], row['current_phase_code'], row['is_completed'],
-            row['text_link'], row['raw_data']
+            row['status_category'], row['text_link'], row['raw_data']
         )
         for row in all_iniciativas_data
     ]
 
     execute_values(cur, insert_query, values)
 
+    # Initiatives that disappeared from their legislature's file. Deleting
+    # them cascades to their events and agenda/committee links, so it needs
+    # --prune, and a legislature whose file lacks more than PRUNE_MAX_SHARE
+    # of its rows (most likely a truncated download) is left alone.
+    # Deletions are recorded in change_tombstones for the change feed.
+    file_ids = [row['ini_id'] for row in all_iniciativas_data]
+    cur.execute("""
+        SELECT legislature, COUNT(*), COUNT(*) FILTER (WHERE NOT (ini_id = ANY(%s)))
+        FROM iniciativas
+        WHERE legislature = ANY(%s)
+        GROUP BY legislature
+    """, (file_ids, loaded_legislatures))
+    prunable = []
+    for legislature, total, missing in sorted(cur.fetchall()):
+        if not missing:
+            continue
+        if not prune:
+            print(f"  ⚠ {legislature}: {missing:,} iniciativas no longer in the source file "
+                  f"(run with --prune to delete them)")
+        elif missing > total * PRUNE_MAX_SHARE:
+            print(f"  ⚠ {legislature}: not deleting {missing:,} of {total:,} iniciativas missing "
+                  f"from the source file (over {PRUNE_MAX_SHARE:.0%}, truncated download?)")
+        else:
+            prunable.append(legislature)
+
+    if prunable:
+        cur.execute("""
+            DELETE FROM iniciativas
+            WHERE legislature = ANY(%s) AND NOT (ini_id = ANY(%s))
+        """, (prunable, file_ids))
+        print(f"  ✓ Removed {cur.rowcount:,} iniciativas no longer in the source files")
+
     # Get mapping of ini_id -> id
     cur.execute("SELECT id, ini_id FROM iniciativas")
     ini_id_map = {row[1]: row[0] for row in cur.fetchall()}
@@ -374,6 +498,23 @@ def load_iniciativas(conn):
     execute_values(cur, event_insert_query, event_values)
     print(f"  ✓ Inserted {len(event_values):,} events")
 
+    # Phase histogram for /api/phase-counts, from the same events
+    print("  Rebuilding phase histogram...")
+    with open(PHASE_HISTOGRAM_MIGRATION, 'r', encoding='utf-8') as f:
+        cur.execute(f.read())
+    cur.execute("DELETE FROM phase_histogram")
+
+    legislature_by_ini_id = {
+        row['ini_id']: row['legislature']
+        for row in all_iniciativas_data
+        if row['ini_id'] in ini_id_map
+    }
+    histogram = build_phase_histogram(all_events, legislature_by_ini_id)
+    execute_values(cur, """
+        INSERT INTO phase_histogram (legislature, phase_name, iniciativas_count) VALUES %s
+    """, [(leg, phase, count) for (leg, phase), count in histogram.items()])
+    print(f"  ✓ Stored {len(histogram):,} (legislature, phase) counts")
+
     cur.close()
     conn.commit()
     print("\n✓ All iniciativas and events loaded successfully")
@@ -399,12 +540,21 @@ def load_agenda(conn):
     # Transform data
     agenda_data = [transform_agenda_event(item) for item in data]
 
+    # Resolve OrgDes to orgaos.id by normalized name (see orgao_links.py)
+    ensure_agenda_orgao_column(conn)
+    orgao_lookup = build_orgao_lookup(conn)
+    unresolved = set()
+    for row in agenda_data:
+        row['orgao_id'] = resolve_orgao_id(orgao_lookup, row['legislature'], row['committee'])
+        if row['committee'] and row['orgao_id'] is None:
+            unresolved.add(row['committee'].strip())
+
     # Insert (UPSERT)
     insert_query = """
         INSERT INTO agenda_events (
             event_id, legislature, title, subtitle, section, theme,
             location, start_date, start_time, end_date, end_time,
-            is_all_day, description, committee, meeting_number,
+            is_all_day, description, committee, orgao_id, meeting_number,
             session_number, raw_data
         ) VALUES %s
         ON CONFLICT (event_id)
@@ -422,10 +572,26 @@ def load_agenda(conn):
             is_all_day = EXCLUDED.is_all_day,
             description = EXCLUDED.description,
             committee = EXCLUDED.committee,
+            orgao_id = EXCLUDED.orgao_id,
             meeting_number = EXCLUDED.meeting_number,
             session_number = EXCLUDED.session_number,
             raw_data = EXCLUDED.raw_data,
             updated_at = NOW()
+        WHERE (
+            agenda_events.legislature, agenda_events.title, agenda_events.subtitle,
+            agenda_events.section, agenda_events.theme, agenda_events.location,
+            agenda_events.start_date, agenda_events.start_time, agenda_events.end_date,
+            agenda_events.end_time, agenda_events.is_all_day, agenda_events.description,
+            agenda_events.committee, agenda_events.orgao_id, agenda_events.meeting_number,
+            agenda_events.session_number, agenda_events.raw_data
+        ) IS DISTINCT FROM (
+            EXCLUDED.legislature, EXCLUDED.title, EXCLUDED.subtitle,
+            EXCLUDED.section, EXCLUDED.theme, EXCLUDED.location,
+            EXCLUDED.start_date, EXCLUDED.start_time, EXCLUDED.end_date,
+            EXCLUDED.end_time, EXCLUDED.is_all_day, EXCLUDED.description,
+            EXCLUDED.committee, EXCLUDED.orgao_id, EXCLUDED.meeting_number,
+            EXCLUDED.session_number, EXCLUDED.raw_data
+        )
     """
 
     values = [
@@ -433,8 +599,8 @@ def load_agenda(conn):
             row['event_id'], row['legislature'], row['title'], row['subtitle'],
             row['section'], row['theme'], row['location'], row['start_date'],
             row['start_time'], row['end_date'], row['end_time'], row['is_all_day'],
-            row['description'], row['committee'], row['meeting_number'],
-            row['session_number'], row['raw_data']
+            row['description'], row['committee'], row['orgao_id'],
+            row['meeting_number'], row['session_number'], row['raw_data']
         )
         for row in agenda_data
     ]
@@ -442,6 +608,12 @@ def load_agenda(conn):
     execute_values(cur, insert_query, values)
     print(f"Inserted/updated {len(values)} agenda events")
 
+    linked = sum(1 for row in agenda_data if row['orgao_id'])
+    print(f"Linked {linked} events to orgaos")
+    if unresolved:
+        print(f"  ⚠ {len(unresolved)} committee name(s) not found in orgaos "
+              f"(run load_orgaos.py to link them): {', '.join(sorted(unresolved)[:5])}")
+
     cur.close()
     conn.commit()
     print("✓ Agenda loaded successfully")
@@ -630,6 +802,27 @@ def link_agenda_to_initiatives_committee_date(conn):
     print(f"  Total potential matches: {potential_matches}")
 
 
+def refresh_stats_views(conn):
+    """Refresh the materialized statistics served by /api/stats and /api/legislatures."""
+    print("\n=== Refreshing Statistics Views ===")
+
+    cur = conn.cursor()
+
+    # Creates the view on first run (already populated, so no refresh needed)
+    cur.execute("SELECT to_regclass('mv_iniciativa_stats') IS NOT NULL")
+    exists = cur.fetchone()[0]
+    with open(STATS_VIEW_MIGRATION, 'r', encoding='utf-8') as f:
+        cur.execute(f.read())
+
+    if exists:
+        # CONCURRENTLY keeps the view readable by the API during the refresh
+        cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_iniciativa_stats")
+
+    conn.commit()
+    cur.close()
+    print(f"  ✓ mv_iniciativa_stats {'refreshed' if exists else 'created'}")
+
+
 def print_stats(conn):
     """Print database statistics."""
     print(f"\n=== Database Statistics ===")
@@ -709,6 +902,11 @@ def print_stats(conn):
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load Portuguese Parliament data into PostgreSQL")
+    parser.add_argument('--prune', action='store_true',
+                        help="Delete initiatives no longer in their legislature's source file")
+    args = parser.parse_args()
+
     print("="*80)
     print("Viriato - Load Portuguese Parliament Data to PostgreSQL")
     print("  Multi-Legislature Support: XIV, XV, XVI, XVII")
@@ -741,7 +939,7 @@ def main():
 
     try:
         # Load data
-        load_iniciativas(conn)
+        load_iniciativas(conn, prune=args.prune)
 
         if AGENDA_FILE.exists():
             load_agenda(conn)
@@ -752,9 +950,14 @@ def main():
         else:
             print("\n⚠ Skipping agenda load (file not found)")
 
+        refresh_stats_views(conn)
+
         # Print stats
         print_stats(conn)
 
+        # Invalidate API response caches
+        bump_dataset_version(conn, 'load_to_postgres')
+
         print("\n" + "="*80)
         print("✓ All data loaded successfully!")
         print("="*80)
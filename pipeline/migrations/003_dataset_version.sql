@@ -0,0 +1,17 @@
+-- Migration: Add dataset version stamp
+-- Date: 2026-10-17
+-- Purpose: Let the API cache responses until the pipeline reloads data.
+--          Every loader bumps the version when it finishes.
+
+CREATE TABLE IF NOT EXISTS dataset_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),   -- Single-row table
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    source VARCHAR(100)                                 -- Loader that last bumped it
+);
+
+INSERT INTO dataset_version (id, version, updated_at, source)
+VALUES (1, 1, NOW(), 'migration')
+ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE dataset_version IS 'Single-row version stamp bumped by pipeline loaders; used by the API to invalidate cached responses';
@@ -0,0 +1,11 @@
+-- Migration: Index for keyset pagination on /api/iniciativas
+-- Date: 2026-10-17
+-- Purpose: /api/iniciativas?limit=&cursor= pages by (start_date DESC, id DESC),
+--          optionally within a legislature. These indexes match that order
+--          so each page is a short index range scan.
+
+CREATE INDEX IF NOT EXISTS idx_ini_keyset
+    ON iniciativas(start_date DESC NULLS LAST, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_ini_legislature_keyset
+    ON iniciativas(legislature, start_date DESC NULLS LAST, id DESC);
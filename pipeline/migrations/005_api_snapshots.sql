@@ -0,0 +1,18 @@
+-- Migration: Pre-rendered API response snapshots
+-- Date: 2026-10-17
+-- Purpose: pipeline/build_snapshots.py renders the heaviest API payloads once
+--          per data load. The API serves them verbatim (no SQL aggregation,
+--          no JSON encoding) while their version matches dataset_version.
+
+CREATE TABLE IF NOT EXISTS api_snapshots (
+    path VARCHAR(200) NOT NULL,             -- e.g. /api/iniciativas
+    query VARCHAR(500) NOT NULL DEFAULT '', -- Canonical (sorted) query string, e.g. legislature=XVII
+    version BIGINT NOT NULL,                -- dataset_version.version it was built from
+    body BYTEA NOT NULL,                    -- Serialized JSON
+    body_gzip BYTEA,                        -- Same body, gzip-compressed
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (path, query)
+);
+
+COMMENT ON TABLE api_snapshots IS 'Pre-serialized API responses built by pipeline/build_snapshots.py';
+COMMENT ON COLUMN api_snapshots.version IS 'Snapshot is only served while this equals dataset_version.version';
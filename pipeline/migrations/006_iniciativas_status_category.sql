@@ -0,0 +1,60 @@
+-- Migration: Precomputed status category on iniciativas
+-- Date: 2026-10-17
+-- Purpose: /api/orgaos/summary counted approved/rejected initiatives with
+--          ILIKE '%publicação%' / '%rejeitad%' scans on current_status.
+--          load_to_postgres.py now stores the category directly; this
+--          backfills rows loaded before it did.
+
+ALTER TABLE iniciativas ADD COLUMN IF NOT EXISTS status_category VARCHAR(20);
+
+-- Same mapping as STATUS_CATEGORIES in pipeline/load_to_postgres.py
+UPDATE iniciativas
+SET status_category = CASE
+    WHEN current_status IN ('Lei (Publicação DR)', 'Resolução da AR (Publicação DR)') THEN 'approved'
+    WHEN current_status IN ('Rejeitado', 'Retirada da iniciativa', 'Caducado') THEN 'rejected'
+    ELSE 'in_progress'
+END
+WHERE status_category IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_ini_status_category ON iniciativas(status_category);
+
+-- Lead-committee links, the only ones /api/orgaos/summary aggregates
+CREATE INDEX IF NOT EXISTS idx_ini_com_lead
+    ON iniciativa_comissao(orgao_id, iniciativa_id) WHERE link_type = 'lead';
+
+-- Keep the category in sync when the events trigger recomputes the status
+CREATE OR REPLACE FUNCTION update_iniciativa_current_status()
+RETURNS TRIGGER AS $$
+DECLARE
+    latest RECORD;
+BEGIN
+    SELECT phase_name, phase_code INTO latest
+    FROM iniciativa_events
+    WHERE iniciativa_id = NEW.iniciativa_id
+    ORDER BY order_index DESC
+    LIMIT 1;
+
+    UPDATE iniciativas
+    SET
+        current_status = latest.phase_name,
+        current_phase_code = latest.phase_code,
+        is_completed = COALESCE(latest.phase_name IN (
+            'Lei (Publicação DR)',
+            'Resolução da AR (Publicação DR)',
+            'Rejeitado',
+            'Retirada da iniciativa',
+            'Caducado'
+        ), FALSE),
+        status_category = CASE
+            WHEN latest.phase_name IN ('Lei (Publicação DR)', 'Resolução da AR (Publicação DR)') THEN 'approved'
+            WHEN latest.phase_name IN ('Rejeitado', 'Retirada da iniciativa', 'Caducado') THEN 'rejected'
+            ELSE 'in_progress'
+        END,
+        updated_at = NOW()
+    WHERE id = NEW.iniciativa_id;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON COLUMN iniciativas.status_category IS 'approved | rejected | in_progress, derived from current_status at load time';
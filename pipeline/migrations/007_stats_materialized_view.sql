@@ -0,0 +1,58 @@
+-- Migration: Materialized statistics behind /api/stats and /api/legislatures
+-- Date: 2026-10-17
+-- Purpose: Both endpoints ran several COUNT/GROUP BY scans over iniciativas
+--          on every call. The counts only change when the loaders run, so
+--          they are computed once here and refreshed (CONCURRENTLY) at the
+--          end of pipeline/load_to_postgres.py.
+--
+-- One row per (legislature, dimension, value), none of them NULL so the
+-- unique index below really is unique:
+--   legislature  'all' for the whole dataset, otherwise e.g. 'XVII'
+--   dimension    'total'          - all initiatives (value '')
+--                'type'           - per type_description ('' if unset)
+--                'status'         - per current_status ('' if unset)
+--                'agenda_events'  - agenda_events row count (legislature 'all')
+
+-- The first version of this view told the totals apart with COALESCE and
+-- kept NULL values, so its unique index didn't prevent duplicates; the only
+-- version with NULL values (the total rows always have one), rebuild it
+DO $$
+BEGIN
+    IF to_regclass('mv_iniciativa_stats') IS NOT NULL THEN
+        IF EXISTS (SELECT 1 FROM mv_iniciativa_stats WHERE value IS NULL) THEN
+            DROP MATERIALIZED VIEW mv_iniciativa_stats;
+        END IF;
+    END IF;
+END $$;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_iniciativa_stats AS
+SELECT
+    CASE WHEN GROUPING(legislature) = 1 THEN 'all' ELSE legislature END AS legislature,
+    CASE
+        WHEN GROUPING(type_description) = 0 THEN 'type'
+        WHEN GROUPING(current_status) = 0 THEN 'status'
+        ELSE 'total'
+    END AS dimension,
+    COALESCE(CASE
+        WHEN GROUPING(type_description) = 0 THEN type_description
+        WHEN GROUPING(current_status) = 0 THEN current_status
+    END, '') AS value,
+    COUNT(*) AS count,
+    COUNT(*) FILTER (WHERE is_completed) AS completed,
+    MIN(start_date) AS earliest_date,
+    MAX(start_date) AS latest_date
+FROM iniciativas
+GROUP BY GROUPING SETS (
+    (legislature), (),
+    (legislature, type_description), (type_description),
+    (legislature, current_status), (current_status)
+)
+UNION ALL
+SELECT 'all', 'agenda_events', '', COUNT(*), 0, MIN(start_date), MAX(start_date)
+FROM agenda_events;
+
+-- Required for REFRESH ... CONCURRENTLY, and serves the per-legislature lookups
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_iniciativa_stats
+    ON mv_iniciativa_stats(legislature, dimension, value);
+
+COMMENT ON MATERIALIZED VIEW mv_iniciativa_stats IS 'Precomputed counts for /api/stats and /api/legislatures; refreshed by load_to_postgres.py';
@@ -0,0 +1,15 @@
+-- Migration: Per-legislature phase histogram for /api/phase-counts
+-- Date: 2026-10-17
+-- Purpose: /api/phase-counts ran COUNT(DISTINCT iniciativa_id) over all of
+--          iniciativa_events on every request. pipeline/load_to_postgres.py
+--          now computes the histogram while loading the events and stores
+--          it here, replacing the contents on each load.
+
+CREATE TABLE IF NOT EXISTS phase_histogram (
+    legislature VARCHAR(10) NOT NULL,
+    phase_name TEXT NOT NULL,
+    iniciativas_count INTEGER NOT NULL,     -- Distinct initiatives with an event in this phase
+    PRIMARY KEY (legislature, phase_name)
+);
+
+COMMENT ON TABLE phase_histogram IS 'Distinct initiatives per (legislature, phase), rebuilt by load_to_postgres.py';
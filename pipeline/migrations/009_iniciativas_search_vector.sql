@@ -0,0 +1,23 @@
+-- Migration: Stored weighted tsvector for /api/search
+-- Date: 2026-10-17
+-- Purpose: /api/search re-tokenized title and summary with to_tsvector() in
+--          both WHERE and ts_rank, and OR-ed two separately indexed
+--          expressions. One stored, weighted vector (title = A,
+--          summary = B) with a single GIN index replaces both, and ranking
+--          uses ts_rank_cd over the stored vector.
+-- Note: Adding a stored generated column rewrites the table once.
+
+ALTER TABLE iniciativas ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('portuguese', COALESCE(summary, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_ini_search_vector
+    ON iniciativas USING GIN(search_vector);
+
+-- Superseded by idx_ini_search_vector
+DROP INDEX IF EXISTS idx_ini_title_fts;
+DROP INDEX IF EXISTS idx_ini_summary_fts;
+
+COMMENT ON COLUMN iniciativas.search_vector IS 'Weighted full-text vector: title (A) + summary (B); generated';
@@ -0,0 +1,17 @@
+-- Migration: Trigram indexes for /api/search/suggest
+-- Date: 2026-10-17
+-- Purpose: Typeahead suggestions match a typed prefix anywhere in initiative
+--          titles, committee names and deputy names with ILIKE. pg_trgm GIN
+--          indexes turn those into index scans (for 3+ characters) and
+--          provide similarity() for ranking.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_ini_title_trgm
+    ON iniciativas USING GIN(title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_orgaos_name_trgm
+    ON orgaos USING GIN(name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_deputados_name_trgm
+    ON deputados USING GIN(name gin_trgm_ops);
@@ -0,0 +1,14 @@
+-- Migration: Link agenda events to orgaos by foreign key
+-- Date: 2026-10-17
+-- Purpose: /api/orgaos/<id> used to find a committee's agenda with
+--          committee ILIKE '%<name>%', which can't use an index and can
+--          match similarly named committees. The loaders now resolve
+--          OrgDes to orgaos.id by normalized name (pipeline/orgao_links.py).
+
+ALTER TABLE agenda_events
+    ADD COLUMN IF NOT EXISTS orgao_id INTEGER REFERENCES orgaos(id) ON DELETE SET NULL;
+
+-- Serves the committee page: latest events for one orgao
+CREATE INDEX IF NOT EXISTS idx_agenda_orgao
+    ON agenda_events(orgao_id, start_date DESC, start_time DESC)
+    WHERE orgao_id IS NOT NULL;
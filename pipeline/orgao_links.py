@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Agenda event -> orgao resolution shared by the pipeline loaders.
+
+Agenda events name their committee in free text (OrgDes), which doesn't
+always match orgaos.name exactly: trailing spaces, en dashes versus
+hyphens and differing case all occur in the source data. Names are
+normalized on both sides and matched within the same legislature.
+
+load_to_postgres.py resolves events as it loads them; load_orgaos.py
+re-resolves existing events after loading committees, since either loader
+can run first.
+"""
+
+import re
+import unicodedata
+from pathlib import Path
+
+from psycopg2.extras import execute_values
+
+MIGRATION_FILE = Path(__file__).parent / "migrations" / "011_agenda_orgao_id.sql"
+
+
+def normalize_orgao_name(name):
+    """Fold case, accents, dashes, punctuation and whitespace: 'Comissão de Saúde ' -> 'comissao de saude'."""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name.lower())
+    folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[\W_]+', ' ', folded).split())
+
+
+def ensure_agenda_orgao_column(conn):
+    """Apply migrations/011_agenda_orgao_id.sql (idempotent)."""
+    cur = conn.cursor()
+    with open(MIGRATION_FILE, 'r', encoding='utf-8') as f:
+        cur.execute(f.read())
+    cur.close()
+
+
+def build_orgao_lookup(conn):
+    """
+    Map (legislature, normalized name) -> orgaos.id.
+
+    Names shared by more than one orgao in a legislature are left out, so
+    an ambiguous event stays unlinked rather than linked to the wrong body.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT id, legislature, name FROM orgaos")
+
+    lookup = {}
+    ambiguous = set()
+    for orgao_id, legislature, name in cur.fetchall():
+        key = (legislature, normalize_orgao_name(name))
+        if key in lookup:
+            ambiguous.add(key)
+        lookup[key] = orgao_id
+    cur.close()
+
+    for key in ambiguous:
+        del lookup[key]
+    return lookup
+
+
+def resolve_orgao_id(lookup, legislature, committee):
+    """orgaos.id for an agenda event's committee, or None."""
+    if not committee:
+        return None
+    return lookup.get((legislature, normalize_orgao_name(committee)))
+
+
+def relink_agenda_orgaos(conn):
+    """
+    Re-resolve orgao_id for all agenda events with a committee.
+
+    Only rows whose link changes are updated. Does not commit.
+
+    Returns:
+        tuple: (linked events, committee names left unresolved)
+    """
+    ensure_agenda_orgao_column(conn)
+    lookup = build_orgao_lookup(conn)
+
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT id, legislature, committee, orgao_id
+        FROM agenda_events
+        WHERE committee IS NOT NULL AND committee != ''
+    """)
+
+    changes = []
+    linked = 0
+    unresolved = set()
+    for agenda_id, legislature, committee, current in cur.fetchall():
+        orgao_id = resolve_orgao_id(lookup, legislature, committee)
+        if orgao_id is None:
+            unresolved.add(committee.strip())
+        else:
+            linked += 1
+        if orgao_id != current:
+            changes.append((agenda_id, orgao_id))
+
+    if changes:
+        # Stamp updated_at so the agenda change feed reports the relink
+        execute_values(cur, """
+            UPDATE agenda_events SET orgao_id = v.orgao_id, updated_at = NOW()
+            FROM (VALUES %s) AS v(id, orgao_id)
+            WHERE agenda_events.id = v.id
+              AND agenda_events.orgao_id IS DISTINCT FROM v.orgao_id
+        """, changes, template='(%s, %s::integer)')
+    cur.close()
+
+    return linked, sorted(unresolved)
@@ -5,9 +5,10 @@ Uses mocked database connections to test API behavior without requiring
 a real PostgreSQL database.
 """
 
+import json
 import pytest
 from unittest.mock import patch, MagicMock
-from datetime import date, time
+from datetime import date, datetime, time
 
 
 class TestHealthEndpoint:
@@ -40,6 +41,73 @@ class TestHealthEndpoint:
         assert 'Connection failed' in data['message']
 
 
+class TestReadiness:
+    """Tests for warm-up and /api/ready."""
+
+    def test_warm_up_fills_cache(self, client, mock_db_connection):
+        """warm_up() caches the warm-up paths and marks the process ready."""
+        from api.app import response_cache, warm_up
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = [{'org_id': 100, 'name': 'Comissão de Saúde'}]
+        mock_cursor.fetchone.return_value = None  # No snapshot
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(5, None)), \
+                patch('api.app.WARMUP_PATHS', ['/api/orgaos/summary']):
+            assert warm_up() is True
+
+            response = client.get('/api/ready')
+            assert response.status_code == 200
+            assert response.get_json()['status'] == 'ready'
+
+            cached = client.get('/api/orgaos/summary')
+
+        assert response_cache.stats()['entries'] == 1
+        assert cached.headers['X-Cache'] == 'HIT'
+
+    def test_warm_up_failure_stays_not_ready(self, client):
+        """A worker that can't reach the database stays out of rotation and reports why."""
+        from api.app import warm_up
+
+        with patch('api.app.get_db_connection', side_effect=Exception('Connection failed')), \
+                patch('api.app.WARMUP_PATHS', ['/api/legislatures']), \
+                patch('api.app.WARMUP_RETRY_SECONDS', 3600):
+            assert warm_up() is False
+            response = client.get('/api/ready')
+
+        assert response.status_code == 503
+        assert 'Connection failed' in response.get_json()['error']
+
+    def test_failing_warm_up_path_is_best_effort(self, client, mock_db_connection):
+        """An endpoint failing during warm-up is reported, but the worker is ready."""
+        from api.app import warm_up
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.side_effect = Exception('relation "deputados" is empty')
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.WARMUP_PATHS', ['/api/legislatures']):
+            assert warm_up() is True
+            response = client.get('/api/ready')
+
+        assert response.status_code == 200
+        assert response.get_json()['failures'] == ['/api/legislatures returned 500']
+
+    def test_ready_starts_warm_up(self, client, mock_db_connection):
+        """A cold worker warms up in the background when probed."""
+        import time
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = []
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.WARMUP_PATHS', ['/api/legislatures']):
+            assert client.get('/api/ready').status_code == 503
+            deadline = time.monotonic() + 5
+            while client.get('/api/ready').status_code != 200:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+
 class TestIniciativasEndpoint:
     """Tests for /api/iniciativas endpoint."""
 
@@ -73,6 +141,80 @@ class TestIniciativasEndpoint:
         call_args = mock_cursor.execute.call_args_list[0]
         assert 'XVII' in call_args[0][1]
 
+    def test_get_iniciativas_shape(self, client, mock_db_connection, mock_iniciativas_data):
+        """Rows are returned in the frontend format with their events."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.side_effect = [
+            mock_iniciativas_data,
+            [{'iniciativa_id': 1, 'phase_name': 'Entrada',
+              'event_date': date(2025, 3, 26), 'observations': None}]
+        ]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas')
+
+        data = response.get_json()
+        assert data[0]['IniId'] == '315506'
+        assert data[0]['DataInicioleg'] == '2025-03-26'
+        assert data[0]['IniAutorOutros'] == {'nome': 'Governo'}
+        assert data[0]['IniEventos'] == [
+            {'Fase': 'Entrada', 'DataFase': '2025-03-26', 'DescFase': None}
+        ]
+
+    def test_sparse_fields_skip_events_query(self, client, mock_db_connection, mock_iniciativas_data):
+        """fields= without IniEventos returns only those keys and skips the events query."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.side_effect = [mock_iniciativas_data]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas?fields=IniId,IniTitulo,_currentStatus')
+
+        assert response.status_code == 200
+        assert response.get_json() == [
+            {'IniId': '315506', 'IniTitulo': 'Test Initiative', '_currentStatus': 'Entrada'}
+        ]
+        assert mock_cursor.execute.call_count == 1
+
+    def test_unknown_field_rejected(self, client):
+        response = client.get('/api/iniciativas?fields=IniId,Bogus')
+
+        assert response.status_code == 400
+        assert 'Bogus' in response.get_json()['error']
+
+    def test_keyset_pagination(self, client, mock_db_connection, mock_iniciativas_data):
+        """A full page advertises a cursor that resumes after its last row."""
+        from api.app import decode_cursor
+        mock_conn, mock_cursor = mock_db_connection
+        second = dict(mock_iniciativas_data[0], id=2, ini_id='315507',
+                      start_date=date(2025, 3, 20))
+        third = dict(mock_iniciativas_data[0], id=3, ini_id='315508',
+                     start_date=date(2025, 3, 1))
+        mock_cursor.fetchall.side_effect = [
+            [mock_iniciativas_data[0], second, third],  # limit + 1 rows
+            [],  # events
+            [third],  # next page
+            []
+        ]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas?legislature=XVII&limit=2')
+            cursor = response.headers['X-Next-Cursor']
+            assert 'rel="next"' in response.headers['Link']
+            assert [r['IniId'] for r in response.get_json()] == ['315506', '315507']
+            assert decode_cursor(cursor) == (date(2025, 3, 20), 2)
+
+            last_page = client.get(f'/api/iniciativas?legislature=XVII&limit=2&cursor={cursor}')
+
+        query, params = mock_cursor.execute.call_args_list[2][0]
+        assert '(start_date, id) < (%s, %s)' in query
+        assert params == ['XVII', date(2025, 3, 20), 2, 3]
+        assert 'X-Next-Cursor' not in last_page.headers
+
+    def test_invalid_pagination_params(self, client):
+        assert client.get('/api/iniciativas?limit=0').status_code == 400
+        assert client.get('/api/iniciativas?limit=5000').status_code == 400
+        assert client.get('/api/iniciativas?cursor=not-a-cursor').status_code == 400
+
     def test_get_iniciativas_db_error(self, client):
         """Get iniciativas returns 500 on database error."""
         with patch('api.app.get_db_connection', side_effect=Exception('DB error')):
@@ -81,6 +223,383 @@ class TestIniciativasEndpoint:
         assert response.status_code == 500
 
 
+class TestStreamingMode:
+    """Tests for ?stream=1 on the large list endpoints."""
+
+    @staticmethod
+    def _named_cursors(mock_conn, mock_cursor, rows_by_name):
+        """Make conn.cursor(name=...) return iterable server-side cursor mocks."""
+        named = {}
+
+        def cursor(name=None):
+            if name is None:
+                return mock_cursor
+            named[name] = MagicMock()
+            named[name].__iter__.return_value = iter(rows_by_name[name])
+            return named[name]
+
+        mock_conn.cursor.side_effect = cursor
+        return named
+
+    def test_stream_iniciativas_merges_events(self, client, mock_db_connection, mock_iniciativas_data):
+        """Events from the ordered event cursor are merged into each initiative."""
+        mock_conn, mock_cursor = mock_db_connection
+        second = dict(mock_iniciativas_data[0], id=2, ini_id='315507')
+        named = self._named_cursors(mock_conn, mock_cursor, {
+            'stream_iniciativas': [mock_iniciativas_data[0], second],
+            'stream_iniciativa_events': [
+                {'iniciativa_id': 1, 'phase_name': 'Entrada',
+                 'event_date': date(2025, 3, 26), 'observations': None},
+                {'iniciativa_id': 2, 'phase_name': 'Entrada',
+                 'event_date': date(2025, 3, 27), 'observations': None},
+                {'iniciativa_id': 2, 'phase_name': 'Admissão',
+                 'event_date': date(2025, 3, 28), 'observations': 'ok'},
+            ]
+        })
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas?stream=1&legislature=XVII')
+            assert response.is_streamed
+            data = response.get_json()
+
+        assert [d['IniId'] for d in data] == ['315506', '315507']
+        assert len(data[0]['IniEventos']) == 1
+        assert [e['Fase'] for e in data[1]['IniEventos']] == ['Entrada', 'Admissão']
+        assert named['stream_iniciativas'].itersize > 0
+        assert named['stream_iniciativas'].execute.call_args[0][1] == ['XVII']
+        mock_cursor.fetchall.assert_not_called()
+
+    def test_stream_without_events(self, client, mock_db_connection, mock_iniciativas_data):
+        """Streaming with fields= that exclude events opens no event cursor."""
+        mock_conn, mock_cursor = mock_db_connection
+        named = self._named_cursors(mock_conn, mock_cursor, {
+            'stream_iniciativas': mock_iniciativas_data,
+        })
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            data = client.get('/api/iniciativas?stream=1&fields=IniId').get_json()
+
+        assert data == [{'IniId': '315506'}]
+        assert list(named) == ['stream_iniciativas']
+
+    def test_stream_with_limit_rejected(self, client):
+        response = client.get('/api/iniciativas?stream=1&limit=10')
+        assert response.status_code == 400
+
+    def test_stream_agenda(self, client, mock_db_connection):
+        mock_conn, mock_cursor = mock_db_connection
+        self._named_cursors(mock_conn, mock_cursor, {
+            'stream_agenda': [{'raw_data': {'Id': 1}}, {'raw_data': {'Id': 2}}]
+        })
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/agenda?stream=1')
+            data = response.get_json()
+
+        assert data == [{'Id': 1}, {'Id': 2}]
+
+    def test_stream_json_array_chunks(self):
+        """Large arrays are emitted in multiple chunks that join to valid JSON."""
+        import json
+        from api.app import stream_json_array
+
+        items = [{'n': i, 'pad': 'x' * 1000} for i in range(200)]
+        chunks = list(stream_json_array(items))
+
+        assert len(chunks) > 1
+        assert json.loads(b''.join(chunks)) == items
+        assert json.loads(b''.join(stream_json_array([]))) == []
+
+
+class TestSnapshots:
+    """Tests for serving pipeline-built snapshots."""
+
+    def test_snapshot_served_verbatim(self, client, mock_db_connection):
+        """A current snapshot is returned without running the endpoint's queries."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'body': memoryview(b'[{"IniId": "1"}]')}
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            response = client.get('/api/iniciativas?legislature=XVII',
+                                  headers={'Accept-Encoding': 'identity'})
+
+        assert response.status_code == 200
+        assert response.get_json() == [{'IniId': '1'}]
+        assert response.headers['X-Snapshot'] == '7'
+        query, params = mock_cursor.execute.call_args[0]
+        assert 'api_snapshots' in query
+        assert params == ('/api/iniciativas', 'legislature=XVII', 7)
+        mock_cursor.fetchall.assert_not_called()
+
+    def test_gzip_snapshot(self, client, mock_db_connection):
+        """Clients accepting gzip get the pre-compressed blob."""
+        import gzip
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'body': gzip.compress(b'[]')}
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            response = client.get('/api/orgaos/summary', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == b'[]'
+        assert 'body_gzip' in mock_cursor.execute.call_args[0][0]
+
+    def test_falls_back_without_snapshot(self, client, mock_db_connection):
+        """Without a matching snapshot the live query runs."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None
+        mock_cursor.fetchall.return_value = [{'raw_data': {'Id': 1}}]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            response = client.get('/api/agenda')
+
+        assert response.get_json() == [{'Id': 1}]
+        assert 'X-Snapshot' not in response.headers
+
+
+    def test_batch_without_snapshot_table(self, client, mock_db_connection):
+        """A missing api_snapshots table doesn't abort the batch's shared transaction."""
+        from psycopg2 import errors
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        state = {'aborted': False}
+
+        def execute(query, params=None):
+            if state['aborted'] and 'ROLLBACK TO SAVEPOINT' not in query:
+                raise errors.InFailedSqlTransaction('current transaction is aborted')
+            state['aborted'] = False
+            if 'api_snapshots' in query:
+                state['aborted'] = True
+                raise errors.UndefinedTable('relation "api_snapshots" does not exist')
+
+        mock_cursor.execute.side_effect = execute
+        mock_cursor.fetchall.return_value = [{'raw_data': {'Id': 1}}]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            response = client.post('/api/batch', json={'requests': [
+                {'id': 'agenda', 'path': '/api/agenda'}
+            ]})
+
+        assert response.get_json()['responses']['agenda'] == {'status': 200, 'body': [{'Id': 1}]}
+
+class TestIniciativasCache:
+    """Tests for the versioned response cache on /api/iniciativas."""
+
+    def test_cache_hit_skips_queries(self, client, mock_db_connection, mock_iniciativas_data):
+        """Second identical request is served from cache without SQL."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.side_effect = [mock_iniciativas_data, []]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            first = client.get('/api/iniciativas?legislature=XVII')
+            executed = mock_cursor.execute.call_count
+            second = client.get('/api/iniciativas?legislature=XVII')
+
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.get_data() == first.get_data()
+        assert mock_cursor.execute.call_count == executed
+
+    def test_version_bump_invalidates(self, client, mock_db_connection, mock_iniciativas_data):
+        """A new dataset version forces the query to run again."""
+        from api.app import dataset_version
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.side_effect = [mock_iniciativas_data, [], [], []]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            with patch('api.app.read_dataset_version', return_value=Version(7, None)):
+                client.get('/api/iniciativas')
+            dataset_version.reset()
+            with patch('api.app.read_dataset_version', return_value=Version(8, None)):
+                response = client.get('/api/iniciativas')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json() == []
+
+    def test_errors_not_cached(self, client):
+        """Failed responses are not stored."""
+        from api.cache import Version
+
+        with patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            with patch('api.app.get_db_connection', side_effect=Exception('DB error')):
+                client.get('/api/iniciativas')
+            with patch('api.app.get_db_connection', side_effect=Exception('DB error')):
+                response = client.get('/api/iniciativas')
+
+        assert response.status_code == 500
+        assert response.headers['X-Cache'] == 'MISS'
+
+
+class TestCompression:
+    """Tests for Accept-Encoding negotiation and reused compressed variants."""
+
+    BIG_ROWS = [{'raw_data': {'Id': i, 'Titulo': 'Reunião plenária ' * 5}} for i in range(50)]
+
+    def test_large_response_gzipped(self, client, mock_db_connection):
+        """Uncached JSON above the threshold is compressed per request."""
+        import gzip
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = self.BIG_ROWS
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/agenda', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(json.loads(gzip.decompress(response.get_data()))) == 50
+
+    def test_small_response_not_compressed(self, client, mock_db_connection):
+        """Bodies under COMPRESS_MIN_BYTES go out as-is."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = [{'raw_data': {'Id': 1}}]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/agenda', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json() == [{'Id': 1}]
+
+    def test_cached_variant_compressed_once(self, client, mock_db_connection):
+        """Repeated requests reuse the gzip body built on the first one."""
+        from api.cache import Version
+        from api.compression import compress as real_compress
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.return_value = self.BIG_ROWS
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)), \
+                patch('api.cache.compress', wraps=real_compress) as compress:
+            first = client.get('/api/agenda', headers={'Accept-Encoding': 'gzip'})
+            second = client.get('/api/agenda', headers={'Accept-Encoding': 'gzip'})
+            identity = client.get('/api/agenda')
+
+        assert compress.call_count == 1
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.headers['Content-Encoding'] == 'gzip'
+        assert second.get_data() == first.get_data()
+        assert 'Content-Encoding' not in identity.headers
+        assert len(identity.get_json()) == 50
+
+    def test_etag_per_encoding(self, client, mock_db_connection):
+        """Encoded responses get their own ETag, which revalidates with 304."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.return_value = self.BIG_ROWS
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            plain = client.get('/api/agenda').headers['ETag']
+            gzipped = client.get('/api/agenda', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+            response = client.get('/api/agenda', headers={
+                'Accept-Encoding': 'gzip', 'If-None-Match': gzipped
+            })
+
+        assert gzipped == plain[:-1] + '-gzip"'
+        assert response.status_code == 304
+        assert response.headers['ETag'] == gzipped
+
+
+class TestConditionalGet:
+    """Tests for ETag / Last-Modified / 304 handling on read endpoints."""
+
+    VERSION_TIME = datetime(2026, 1, 10, 12, 0, 0)
+
+    def _version(self, number=7):
+        from api.cache import Version
+        return Version(number, self.VERSION_TIME)
+
+    def test_validators_present(self, client, mock_db_connection):
+        """Successful responses carry ETag, Last-Modified and Cache-Control."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.return_value = []
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=self._version()):
+            response = client.get('/api/agenda')
+
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert response.headers['Last-Modified'] == 'Sat, 10 Jan 2026 12:00:00 GMT'
+        assert 'max-age=' in response.headers['Cache-Control']
+
+    def test_if_none_match_returns_304_without_sql(self, client, mock_db_connection):
+        """A matching ETag is answered with 304 before any query runs."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.return_value = []
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=self._version()):
+            etag = client.get('/api/orgaos?type=comissao').headers['ETag']
+            executed = mock_cursor.execute.call_count
+            response = client.get('/api/orgaos?type=comissao', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.get_data() == b''
+        assert mock_cursor.execute.call_count == executed
+
+    def test_etag_depends_on_params_and_version(self, client, mock_db_connection):
+        """Different query parameters or a new dataset version change the ETag."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None  # no snapshot
+        mock_cursor.fetchall.return_value = []
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            with patch('api.app.read_dataset_version', return_value=self._version(7)):
+                a = client.get('/api/agenda?start_date=2025-01-01').headers['ETag']
+                b = client.get('/api/agenda?start_date=2025-02-01').headers['ETag']
+            from api.app import dataset_version
+            dataset_version.reset()
+            with patch('api.app.read_dataset_version', return_value=self._version(8)):
+                c = client.get('/api/agenda?start_date=2025-01-01').headers['ETag']
+
+        assert len({a, b, c}) == 3
+
+    def test_if_modified_since(self, client, mock_db_connection):
+        """If-Modified-Since at or after the load time returns 304."""
+        with patch('api.app.read_dataset_version', return_value=self._version()):
+            response = client.get('/api/stats', headers={
+                'If-Modified-Since': 'Sat, 10 Jan 2026 12:00:00 GMT'
+            })
+
+        assert response.status_code == 304
+
+    def test_errors_not_cacheable(self, client):
+        """Error responses are marked no-store and carry no ETag."""
+        with patch('api.app.read_dataset_version', return_value=self._version()), \
+                patch('api.app.get_db_connection', side_effect=Exception('DB error')):
+            response = client.get('/api/legislatures')
+
+        assert response.status_code == 500
+        assert response.headers['Cache-Control'] == 'no-store'
+        assert 'ETag' not in response.headers
+
+    def test_health_not_cached(self, client, mock_db_connection):
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'count': 1}
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/health')
+
+        assert response.headers['Cache-Control'] == 'no-store'
+
+
 class TestSingleIniciativaEndpoint:
     """Tests for /api/iniciativas/<ini_id> endpoint."""
 
@@ -109,6 +628,71 @@ class TestSingleIniciativaEndpoint:
         assert response.status_code == 404
 
 
+class TestChangeFeeds:
+    """Tests for the /changes endpoints."""
+
+    def test_since_required(self, client):
+        response = client.get('/api/iniciativas/changes')
+        assert response.status_code == 400
+
+        response = client.get('/api/iniciativas/changes?since=yesterday')
+        assert response.status_code == 400
+
+    def test_iniciativas_changes(self, client, mock_db_connection, mock_iniciativas_data):
+        """Changed rows in /api/iniciativas format, deletions and a next token."""
+        mock_conn, mock_cursor = mock_db_connection
+        changed_at = datetime(2026, 1, 5, 2, 0)
+        row = dict(mock_iniciativas_data[0], _changed_at=changed_at, _changed_id=1)
+        mock_cursor.fetchall.side_effect = [
+            [row],
+            [{'id': 7, 'record_key': '300001', 'deleted_at': changed_at}],
+            []  # events
+        ]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas/changes?since=2026-01-01T00:00:00')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['changes'][0]['IniId'] == '315506'
+        assert '_changed_at' not in data['changes'][0]
+        assert data['deleted'] == ['300001']
+        assert data['has_more'] is False
+
+        # A timestamp means strictly after it
+        query, params = mock_cursor.execute.call_args_list[0][0]
+        assert 'updated_at > %s' in query
+        assert params == [datetime(2026, 1, 1), 501]
+
+        # The token resumes after the last row and tombstone seen
+        mock_cursor.reset_mock()
+        mock_cursor.fetchall.side_effect = [[], []]
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/iniciativas/changes', query_string={'since': data['next']})
+
+        assert response.get_json()['changes'] == []
+        query, params = mock_cursor.execute.call_args_list[0][0]
+        assert '(iniciativas.updated_at, iniciativas.id) > (%s, %s)' in query
+        assert params == [changed_at, 1, 501]
+        assert mock_cursor.execute.call_args_list[1][0][1] == ['iniciativas', changed_at, 7, 501]
+
+    def test_agenda_changes_has_more(self, client, mock_db_connection):
+        """A full page sets has_more."""
+        mock_conn, mock_cursor = mock_db_connection
+        changed_at = datetime(2026, 1, 5, 2, 0)
+        mock_cursor.fetchall.side_effect = [
+            [{'raw_data': {'Id': i}, '_changed_at': changed_at, '_changed_id': i} for i in range(3)],
+            []
+        ]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/agenda/changes?since=2026-01-01&limit=2')
+
+        data = response.get_json()
+        assert [event['Id'] for event in data['changes']] == [0, 1]
+        assert data['has_more'] is True
+
+
 class TestPhaseCountsEndpoint:
     """Tests for /api/phase-counts endpoint."""
 
@@ -128,6 +712,20 @@ class TestPhaseCountsEndpoint:
         assert len(data) == 2
         assert data[0]['phase'] == 'Entrada'
         assert data[0]['count'] == 808
+        assert 'phase_histogram' in mock_cursor.execute.call_args[0][0]
+
+    def test_get_phase_counts_by_legislature(self, client, mock_db_connection):
+        """The legislature filter is a primary-key lookup on the histogram."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = [{'phase': 'Entrada', 'count': 120}]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/phase-counts?legislature=XVII')
+
+        assert response.get_json() == [{'phase': 'Entrada', 'count': 120}]
+        query, params = mock_cursor.execute.call_args[0]
+        assert 'WHERE legislature = %s' in query
+        assert params == ('XVII',)
 
 
 class TestAgendaEndpoint:
@@ -239,44 +837,43 @@ class TestLegislaturesEndpoint:
 class TestStatsEndpoint:
     """Tests for /api/stats endpoint."""
 
+    STATS_ROWS = [
+        {'legislature': 'all', 'dimension': 'total', 'value': None, 'count': 1000, 'completed': 200},
+        {'legislature': 'XVI', 'dimension': 'total', 'value': None, 'count': 500, 'completed': 150},
+        {'legislature': 'XVII', 'dimension': 'total', 'value': None, 'count': 500, 'completed': 50},
+        {'legislature': 'all', 'dimension': 'agenda_events', 'value': None, 'count': 500, 'completed': 0},
+        {'legislature': 'all', 'dimension': 'status', 'value': 'Entrada', 'count': 400, 'completed': 0},
+        {'legislature': 'all', 'dimension': 'type', 'value': 'Proposta de Lei', 'count': 300, 'completed': 80}
+    ]
+
     def test_get_stats(self, client, mock_db_connection):
-        """Get stats returns aggregated statistics."""
+        """Get stats returns aggregated statistics from one lookup."""
         mock_conn, mock_cursor = mock_db_connection
-
-        # Multiple sequential queries
-        mock_cursor.fetchone.side_effect = [
-            {'count': 1000},  # total
-            {'count': 200},   # completed
-            {'count': 500}    # agenda_events
-        ]
-        mock_cursor.fetchall.side_effect = [
-            [{'legislature': 'XVII', 'count': 500}],  # by_legislature
-            [{'type_description': 'Proposta de Lei', 'count': 300}],  # by_type
-            [{'current_status': 'Entrada', 'count': 400}]  # by_status
-        ]
+        mock_cursor.fetchall.return_value = self.STATS_ROWS
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
             response = client.get('/api/stats')
 
         assert response.status_code == 200
         data = response.get_json()
-        assert 'total' in data
-        assert 'completed' in data
-        assert 'by_type' in data
-        assert 'by_status' in data
+        assert data['total'] == 1000
+        assert data['completed'] == 200
+        assert data['by_legislature'] == [
+            {'legislature': 'XVII', 'count': 500},
+            {'legislature': 'XVI', 'count': 500}
+        ]
+        assert data['by_type'] == [{'type': 'Proposta de Lei', 'count': 300}]
+        assert data['by_status'] == [{'status': 'Entrada', 'count': 400}]
+        assert data['agenda_events'] == 500
+        assert mock_cursor.execute.call_count == 1
+        assert 'mv_iniciativa_stats' in mock_cursor.execute.call_args[0][0]
 
     def test_get_stats_with_legislature_filter(self, client, mock_db_connection):
         """Get stats filters by legislature."""
         mock_conn, mock_cursor = mock_db_connection
-
-        mock_cursor.fetchone.side_effect = [
-            {'count': 500},   # total (filtered)
-            {'count': 100},   # completed (filtered)
-            {'count': 500}    # agenda_events
-        ]
-        mock_cursor.fetchall.side_effect = [
-            [{'type_description': 'Proposta de Lei', 'count': 200}],  # by_type
-            [{'current_status': 'Entrada', 'count': 300}]  # by_status
+        mock_cursor.fetchall.return_value = [
+            {'legislature': 'XVII', 'dimension': 'total', 'value': None, 'count': 500, 'completed': 100},
+            {'legislature': 'all', 'dimension': 'agenda_events', 'value': None, 'count': 500, 'completed': 0}
         ]
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
@@ -286,6 +883,9 @@ class TestStatsEndpoint:
         data = response.get_json()
         # by_legislature should NOT be present when filtered
         assert 'by_legislature' not in data
+        assert data['total'] == 500
+        assert data['completed'] == 100
+        assert mock_cursor.execute.call_args[0][1] == ('XVII', False)
 
 
 class TestSearchEndpoint:
@@ -294,16 +894,27 @@ class TestSearchEndpoint:
     def test_search_with_query(self, client, mock_db_connection):
         """Search returns matching iniciativas."""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = [
-            {
-                'ini_id': '315506',
-                'legislature': 'XVII',
-                'title': 'Test Initiative',
-                'type_description': 'Proposta de Lei',
-                'current_status': 'Entrada',
-                'start_date': date(2025, 3, 26),
-                'rank': 0.95
-            }
+        mock_cursor.fetchall.side_effect = [
+            [
+                {
+                    'id': 1,
+                    'ini_id': '315506',
+                    'legislature': 'XVII',
+                    'number': '28',
+                    'type': 'P',
+                    'title': 'Test Initiative',
+                    'type_description': 'Proposta de Lei',
+                    'current_status': 'Entrada',
+                    'is_completed': False,
+                    'start_date': date(2025, 3, 26),
+                    'text_link': None,
+                    'summary': None,
+                    'author_groups': None,
+                    'author_others': None,
+                    'rank': 0.95
+                }
+            ],
+            []  # events query
         ]
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
@@ -312,7 +923,31 @@ class TestSearchEndpoint:
         assert response.status_code == 200
         data = response.get_json()
         assert len(data) == 1
-        assert data[0]['ini_id'] == '315506'
+        # Same shape as /api/iniciativas
+        assert data[0]['IniId'] == '315506'
+        # Matches and ranks on the stored vector, no per-row to_tsvector()
+        query = mock_cursor.execute.call_args_list[0][0][0]
+        assert 'search_vector @@ query' in query
+        assert 'ts_rank_cd(search_vector, query)' in query
+        assert 'to_tsvector' not in query
+
+    def test_search_memory_backend(self, client, mock_db_connection, mock_iniciativas_data):
+        """With SEARCH_BACKEND=memory the index is built once per dataset version."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.side_effect = [mock_iniciativas_data, []]  # index build
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)), \
+                patch('api.app.SEARCH_BACKEND', 'memory'):
+            first = client.get('/api/search?q=test')
+            second = client.get('/api/search?q=habitação')
+
+        assert first.status_code == 200
+        assert first.get_json()[0]['IniId'] == '315506'
+        assert second.get_json() == []
+        # Two queries to build the index, none per search
+        assert mock_cursor.execute.call_count == 2
 
     def test_search_empty_query(self, client):
         """Search with empty query returns empty list."""
@@ -323,6 +958,55 @@ class TestSearchEndpoint:
         assert data == []
 
 
+class TestSearchSuggestEndpoint:
+    """Tests for /api/search/suggest endpoint."""
+
+    def test_suggest(self, client, mock_db_connection):
+        """One query returns suggestions for each kind."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {
+            'iniciativas': [{'id': '315506', 'title': 'Saúde mental', 'legislature': 'XVII'}],
+            'orgaos': [{'id': 100, 'name': 'Comissão de Saúde', 'acronym': 'CS'}],
+            'deputados': []
+        }
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/search/suggest?q=saú&limit=3')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['orgaos'][0]['name'] == 'Comissão de Saúde'
+        assert mock_cursor.execute.call_count == 1
+        params = mock_cursor.execute.call_args[0][1]
+        assert params['pattern'] == '%saú%'
+        assert params['prefix'] == 'saú%'
+        assert params['limit'] == 3
+
+    def test_wildcards_escaped(self, client, mock_db_connection):
+        """LIKE wildcards in the typed text match literally."""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'iniciativas': [], 'orgaos': [], 'deputados': []}
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            client.get('/api/search/suggest?q=50%_a')
+
+        assert mock_cursor.execute.call_args[0][1]['prefix'] == '50\\%\\_a%'
+
+    def test_short_query(self, client, mock_db_connection):
+        """Fewer than two characters returns empty lists without SQL."""
+        mock_conn, mock_cursor = mock_db_connection
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/search/suggest?q=s')
+
+        assert response.get_json() == {'iniciativas': [], 'orgaos': [], 'deputados': []}
+        mock_cursor.execute.assert_not_called()
+
+    def test_invalid_limit(self, client):
+        response = client.get('/api/search/suggest?q=saude&limit=100')
+        assert response.status_code == 400
+
+
 class TestOrgaosEndpoint:
     """Tests for /api/orgaos endpoint."""
 
@@ -395,6 +1079,10 @@ class TestSingleOrgaoEndpoint:
         assert 'members' in data
         assert 'agenda_events' in data
         assert 'initiatives' in data
+        # Agenda is joined by the foreign key resolved at load time
+        agenda_call = mock_cursor.execute.call_args_list[2]
+        assert 'WHERE orgao_id = %s' in agenda_call[0][0]
+        assert agenda_call[0][1] == (1,)
 
     def test_get_orgao_not_found(self, client, mock_db_connection):
         """Get single orgao returns 404 when not found."""
@@ -411,19 +1099,13 @@ class TestOrgaosSummaryEndpoint:
     """Tests for /api/orgaos/summary endpoint."""
 
     def test_get_orgaos_summary(self, client, mock_db_connection):
-        """Get orgaos summary returns aggregated party data."""
+        """Get orgaos summary returns aggregated party and initiative data."""
         mock_conn, mock_cursor = mock_db_connection
 
-        # First fetchall - committees with party breakdown
-        mock_cursor.fetchall.side_effect = [
-            [
-                {'id': 1, 'org_id': 100, 'name': 'Test Committee',
-                 'acronym': 'TC', 'org_type': 'comissao', 'party': 'PS', 'count': 5}
-            ],
-            [],  # authored
-            [],  # in_progress
-            [],  # approved
-            []   # rejected
+        mock_cursor.fetchall.return_value = [
+            {'id': 1, 'org_id': 100, 'name': 'Test Committee', 'acronym': 'TC',
+             'type': 'comissao', 'parties': {'PS': 5, 'PSD': 4}, 'total_members': 9,
+             'ini_authored': 0, 'ini_in_progress': 3, 'ini_approved': 2, 'ini_rejected': 1}
         ]
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
@@ -432,65 +1114,152 @@ class TestOrgaosSummaryEndpoint:
         assert response.status_code == 200
         data = response.get_json()
         assert isinstance(data, list)
+        assert data[0]['parties'] == {'PS': 5, 'PSD': 4}
+        assert data[0]['ini_approved'] == 2
+
+        # A single statement using the precomputed category, no ILIKE scans
+        assert mock_cursor.execute.call_count == 1
+        query = mock_cursor.execute.call_args[0][0]
+        assert 'FILTER' in query and 'status_category' in query
+        assert 'ILIKE' not in query
 
 
 class TestDeputadosEndpoint:
     """Tests for /api/deputados endpoint."""
 
+    BREAKDOWNS = [
+        {'dimension': 'total', 'value': None, 'count': 230},
+        {'dimension': 'party', 'value': 'PS', 'count': 100},
+        {'dimension': 'gender', 'value': 'M', 'count': 120},
+        {'dimension': 'gender', 'value': None, 'count': 2},
+        {'dimension': 'circulo', 'value': 'Lisboa', 'count': 50}
+    ]
+
     def test_get_deputados(self, client, mock_db_connection, mock_deputados_data):
-        """Get deputados returns list with summary."""
+        """Get deputados returns list with summary from a single query."""
         mock_conn, mock_cursor = mock_db_connection
-
-        # First query - deputados
-        mock_cursor.fetchall.side_effect = [
-            [
-                {
-                    'id': 1,
-                    'dep_id': 16194,
-                    'dep_cad_id': 12345,
-                    'legislature': 'XVII',
-                    'name': 'Test Deputy',
-                    'full_name': 'Test Full Name',
-                    'party': 'PS',
-                    'circulo_id': 1,
-                    'circulo': 'Lisboa',
-                    'gender': 'M',
-                    'birth_date': date(1980, 1, 1),
-                    'profession': 'Advogado',
-                    'situation': 'Efetivo',
-                    'situation_start': date(2025, 3, 26),
-                    'situation_end': None
-                }
-            ],
-            [],  # committee memberships
-            [{'party': 'PS', 'count': 100}],  # party composition
-            [{'gender': 'M', 'count': 120}],  # gender breakdown
-            [{'circulo': 'Lisboa', 'count': 50}]  # circulo breakdown
-        ]
+        mock_cursor.fetchone.return_value = {
+            'deputados': mock_deputados_data,
+            'breakdowns': self.BREAKDOWNS
+        }
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
             response = client.get('/api/deputados')
 
         assert response.status_code == 200
         data = response.get_json()
-        assert 'deputados' in data
-        assert 'summary' in data
         assert len(data['deputados']) == 1
+        assert data['summary'] == {
+            'total': 230,
+            'party_composition': {'PS': 100},
+            'gender_breakdown': {'M': 120, 'Unknown': 2},
+            'circulo_breakdown': {'Lisboa': 50}
+        }
+        assert mock_cursor.execute.call_count == 1
+        query, params = mock_cursor.execute.call_args[0]
+        assert 'GROUPING SETS' in query
+        assert params['legislature'] == 'XVII'
+        assert 'Efetivo Temporário' in params['situation']
 
     def test_get_deputados_with_filters(self, client, mock_db_connection):
         """Get deputados accepts filter parameters."""
         mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'deputados': [], 'breakdowns': None}
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/deputados?party=PS&circulo=Lisboa&situation=all')
+
+        assert response.status_code == 200
+        assert response.get_json()['summary']['total'] == 0
+        query, params = mock_cursor.execute.call_args[0]
+        assert params['party'] == 'PS'
+        assert params['circulo'] == 'Lisboa'
+        assert 'situation' not in params
+
+    def test_cached_per_effective_filters(self, client, mock_db_connection, mock_deputados_data):
+        """Requests with the same effective filters share one cache entry."""
+        from api.cache import Version
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {
+            'deputados': mock_deputados_data,
+            'breakdowns': self.BREAKDOWNS
+        }
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.read_dataset_version', return_value=Version(7, None)):
+            first = client.get('/api/deputados')
+            second = client.get('/api/deputados?legislature=XVII&situation=serving')
+
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert mock_cursor.execute.call_count == 1
+
+
+class TestBatchEndpoint:
+    """Tests for /api/batch endpoint."""
+
+    def test_batch_shares_one_connection(self, client, mock_db_connection):
+        """Sub-requests run over a single pooled connection, keyed by id."""
+        from api.app import get_db_pool
+        mock_conn, mock_cursor = mock_db_connection
         mock_cursor.fetchall.side_effect = [
-            [],  # deputados
-            [{'party': 'PS', 'count': 100}],  # party composition
-            [{'gender': 'M', 'count': 120}],  # gender breakdown
-            [{'circulo': 'Lisboa', 'count': 50}]  # circulo breakdown
+            [{'org_id': 100, 'name': 'Comissão de Saúde'}],  # orgaos summary
+            [{'phase_name': 'Entrada', 'count': 3}]          # phase counts
         ]
 
         with patch('api.app.get_db_connection', return_value=mock_conn):
-            response = client.get('/api/deputados?party=PS&circulo=Lisboa')
+            pool = get_db_pool()
+            with patch.object(pool, 'getconn', wraps=pool.getconn) as getconn:
+                response = client.post('/api/batch', json={'requests': [
+                    {'id': 'summary', 'path': '/api/orgaos/summary'},
+                    {'id': 'phases', 'path': '/api/phase-counts', 'params': {'legislature': 'XVII'}},
+                    {'id': 'missing', 'path': '/api/nope'}
+                ]})
+
+        assert response.status_code == 200
+        data = response.get_json()['responses']
+        assert list(data) == ['summary', 'phases', 'missing']
+        assert data['summary'] == {'status': 200, 'body': [{'org_id': 100, 'name': 'Comissão de Saúde'}]}
+        assert data['phases']['status'] == 200
+        assert data['missing']['status'] == 404
+        assert getconn.call_count == 1
+        # Each sub-request is bounded by the time left in the batch
+        timeouts = [c for c in mock_cursor.execute.call_args_list if 'statement_timeout' in c[0][0]]
+        assert len(timeouts) == 3
+
+    def test_batch_limits(self, client):
+        """Oversized, non-GET and malformed batches are rejected."""
+        with patch('api.app.BATCH_MAX_REQUESTS', 2):
+            response = client.post('/api/batch', json={'requests': [
+                {'id': str(i), 'path': '/api/legislatures'} for i in range(3)
+            ]})
+        assert response.status_code == 400
+
+        response = client.post('/api/batch', json={'requests': [
+            {'id': 'a', 'path': '/api/feedback', 'method': 'POST'}
+        ]})
+        assert response.status_code == 400
+
+        response = client.post('/api/batch', json={'requests': [
+            {'id': 'a', 'path': '/api/batch'}
+        ]})
+        assert response.status_code == 400
+
+        response = client.post('/api/batch', data='not json')
+        assert response.status_code == 400
+
+    def test_batch_time_limit(self, client, mock_db_connection):
+        """Sub-requests not started before the deadline get 504."""
+        mock_conn, mock_cursor = mock_db_connection
+
+        with patch('api.app.get_db_connection', return_value=mock_conn), \
+                patch('api.app.BATCH_MAX_SECONDS', 0):
+            response = client.post('/api/batch', json={'requests': [
+                {'id': 'stats', 'path': '/api/stats'}
+            ]})
 
         assert response.status_code == 200
+        assert response.get_json()['responses']['stats']['status'] == 504
 
 
 class TestFeedbackEndpoint:
@@ -548,11 +1317,64 @@ class TestFeedbackEndpoint:
                 'honeypot': 'filled by bot'
             })
 
-        # Should return success but not create issue
-        assert response.status_code == 200
+        # Should return success but not queue an issue
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data['success'] is True
+        from api.app import feedback_outbox
+        assert feedback_outbox.stats()['pending'] == 0
+
+    def test_feedback_queued(self, client):
+        """Valid feedback is queued for GitHub and accepted with 202."""
+        with patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'}):
+            response = client.post('/api/feedback', json={
+                'title': 'Broken link',
+                'description': 'The text link on this initiative is broken',
+                'page': '/iniciativas/123'
+            })
+
+        assert response.status_code == 202
         data = response.get_json()
         assert data['success'] is True
 
+        from api.app import feedback_outbox
+        item = feedback_outbox.get(data['id'])
+        assert item['status'] == 'pending'
+        assert item['payload']['title'] == '[Feedback] Broken link'
+        assert '**Page:** /iniciativas/123' in item['payload']['body']
+        assert item['payload']['labels'] == ['user-feedback']
+
+    def test_feedback_rate_limited(self, client):
+        """A client gets 3 submissions per 5 minutes, then 429 with Retry-After."""
+        payload = {'title': 'Broken link', 'description': 'The text link is broken'}
+        with patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'}):
+            statuses = [client.post('/api/feedback', json=payload).status_code for _ in range(3)]
+            limited = client.post('/api/feedback', json=payload)
+            other = client.post('/api/feedback', json=payload,
+                                headers={'X-Forwarded-For': '203.0.113.9'})
+
+        assert statuses == [202, 202, 202]
+        assert limited.status_code == 429
+        assert 'Please wait 5 minutes' in limited.get_json()['error']
+        assert int(limited.headers['Retry-After']) > 0
+        assert other.status_code == 202
+
+    def test_feedback_rate_limit_counts_accepted_only(self, client):
+        """Rejected posts and honeypot hits don't use up a client's submissions."""
+        with patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'}):
+            for _ in range(5):
+                assert client.post('/api/feedback', json={
+                    'title': 'abc', 'description': 'The text link is broken'
+                }).status_code == 400
+                client.post('/api/feedback', json={
+                    'title': 'Bot feedback', 'description': 'Bot description here', 'honeypot': 'x'
+                })
+            response = client.post('/api/feedback', json={
+                'title': 'Broken link', 'description': 'The text link is broken'
+            })
+
+        assert response.status_code == 202
+
 
 class TestCORSHeaders:
     """Tests for CORS configuration."""
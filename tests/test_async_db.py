@@ -0,0 +1,289 @@
+"""
+Tests for the asyncpg pool facade used by the ASGI entry point.
+"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from api.async_db import AsyncpgPool, convert_query
+from api.db import PoolTimeout
+
+
+class FakeTransaction:
+    def __init__(self, log):
+        self.log = log
+
+    async def start(self):
+        self.log.append('BEGIN')
+
+    async def commit(self):
+        self.log.append('COMMIT')
+
+    async def rollback(self):
+        self.log.append('ROLLBACK')
+
+
+class FakeServerCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, count):
+        batch, self.rows = self.rows[:count], self.rows[count:]
+        return batch
+
+
+class FakeConnection:
+    """Stands in for asyncpg.Connection; records statements and returns `rows`."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.log = []
+
+    def is_closed(self):
+        return False
+
+    def transaction(self):
+        return FakeTransaction(self.log)
+
+    async def fetch(self, sql, *args):
+        self.log.append((sql, args))
+        return self.rows
+
+    async def cursor(self, sql, *args):
+        self.log.append((sql, args))
+        return FakeServerCursor(list(self.rows))
+
+    def terminate(self):
+        self.log.append('TERMINATE')
+
+
+class FakePool:
+    def __init__(self, conn, timeout=False):
+        self.conn = conn
+        self.timeout = timeout
+        self.released = 0
+
+    async def acquire(self, timeout=None):
+        if self.timeout:
+            raise asyncio.TimeoutError()
+        return self.conn
+
+    async def release(self, conn):
+        self.released += 1
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def loop():
+    """Event loop running in a background thread, as under an ASGI server."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+class TestConvertQuery:
+    """Tests for psycopg2 -> asyncpg placeholder rewriting."""
+
+    def test_positional(self):
+        assert convert_query("SELECT * FROM t WHERE a = %s AND b = %s", ('x', 2)) == \
+            ("SELECT * FROM t WHERE a = $1 AND b = $2", ['x', 2])
+
+    def test_named_reused(self):
+        sql, args = convert_query(
+            "WHERE legislature = %(leg)s AND (%(party)s::text IS NULL OR party = %(party)s)",
+            {'leg': 'XVII', 'party': None})
+        assert sql == "WHERE legislature = $1 AND ($2::text IS NULL OR party = $2)"
+        assert args == ['XVII', None]
+
+    def test_escaped_percent(self):
+        assert convert_query("SELECT %s LIKE 'a%%'", ['abc']) == ("SELECT $1 LIKE 'a%'", ['abc'])
+
+    def test_no_params_untouched(self):
+        assert convert_query("SELECT '100%%'") == ("SELECT '100%%'", [])
+
+
+class TestAsyncpgPool:
+    """Tests for the blocking psycopg2-style facade."""
+
+    def test_query_in_transaction(self, loop):
+        conn = FakeConnection(rows=[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])
+        pool = AsyncpgPool(FakePool(conn), loop)
+
+        db_conn = pool.getconn()
+        cur = db_conn.cursor()
+        cur.execute("SELECT id, name FROM t WHERE id > %s", (0,))
+        assert cur.fetchone() == {'id': 1, 'name': 'a'}
+        assert cur.fetchall() == [{'id': 2, 'name': 'b'}]
+        assert cur.fetchone() is None
+        pool.putconn(db_conn)
+
+        assert conn.log == ['BEGIN', ("SELECT id, name FROM t WHERE id > $1", (0,)), 'ROLLBACK']
+        assert pool.stats()['checked_out'] == 0
+
+    def test_named_cursor_fetches_in_batches(self, loop):
+        conn = FakeConnection(rows=[{'id': i} for i in range(5)])
+        pool = AsyncpgPool(FakePool(conn), loop)
+
+        cur = pool.getconn().cursor(name='stream')
+        cur.itersize = 2
+        cur.execute("SELECT id FROM t")
+        assert [row['id'] for row in cur] == [0, 1, 2, 3, 4]
+
+    def test_timeout(self, loop):
+        pool = AsyncpgPool(FakePool(FakeConnection(), timeout=True), loop)
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+        assert pool.stats()['timeouts'] == 1
+
+    def test_refuses_to_block_the_loop(self, loop):
+        pool = AsyncpgPool(FakePool(FakeConnection()), loop)
+
+        async def call_on_loop():
+            pool.getconn()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run_coroutine_threadsafe(call_on_loop(), loop).result()
+
+
+class SlowConnection(FakeConnection):
+    """Takes 50 ms per statement and records how many run at once."""
+
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+
+    async def fetch(self, sql, *args):
+        self.pool.in_flight += 1
+        self.pool.peak = max(self.pool.peak, self.pool.in_flight)
+        await asyncio.sleep(0.05)
+        self.pool.in_flight -= 1
+        return self.pool.rows_for(sql)
+
+
+class SlowPool(FakePool):
+    """Hands out a fresh SlowConnection per acquire."""
+
+    def __init__(self, rows_for):
+        super().__init__(None)
+        self.rows_for = rows_for
+        self.in_flight = 0
+        self.peak = 0
+
+    async def acquire(self, timeout=None):
+        return SlowConnection(self)
+
+
+def committee_rows(sql):
+    """Rows for /api/orgaos/5001: the committee, one member, nothing else."""
+    if 'FROM orgaos' in sql:
+        return [{'id': 7, 'org_id': '5001', 'legislature': 'XVII', 'name': 'Comissão',
+                 'acronym': 'CACDLG', 'org_type': 'CO', 'number': 1}]
+    if 'FROM orgao_membros' in sql:
+        return [{'dep_id': 1, 'deputy_name': 'A', 'party': 'PS', 'role': None,
+                 'member_type': 'efetivo'}]
+    return []
+
+
+class TestConcurrentSubQueries:
+    """Handlers with independent queries await them together on the asyncpg pool."""
+
+    @pytest.fixture
+    def slow_pool(self, app, loop):
+        from api.app import install_db_pool
+
+        pool = SlowPool(committee_rows)
+        install_db_pool(AsyncpgPool(pool, loop))
+        yield pool
+        install_db_pool(None)
+
+    def test_orgao_detail(self, app, slow_pool):
+        response = app.test_client().get('/api/orgaos/5001')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['member_count'] == 1
+        assert data['agenda_events'] == [] and data['initiatives'] == []
+        # Members, agenda events and initiatives ran at the same time
+        assert slow_pool.peak == 3
+
+    def test_change_feed(self, app, slow_pool):
+        response = app.test_client().get('/api/agenda/changes?since=2026-01-01')
+
+        assert response.status_code == 200
+        assert response.get_json()['changes'] == []
+        assert slow_pool.peak == 2
+
+    def test_sequential_inside_batch(self, app, slow_pool):
+        response = app.test_client().post('/api/batch', json={'requests': [
+            {'id': 'orgao', 'path': '/api/orgaos/5001'}]})
+
+        assert response.get_json()['responses']['orgao']['status'] == 200
+        assert slow_pool.peak == 1
+
+
+class TestAsgiEntryPoint:
+    """The ASGI app end to end: lifespan opens the asyncpg pool, requests use it."""
+
+    def test_lifespan_pool_serves_concurrent_queries(self, app):
+        from api import asgi
+        from api.app import get_db_pool
+
+        pool = SlowPool(committee_rows)
+
+        async def create_pool(dsn, **kwargs):
+            return pool
+
+        async def run():
+            asgi_app = asgi.AsgiApp(app)
+            lifespan = asyncio.Queue()
+            sent = []
+
+            async def send_lifespan(message):
+                sent.append(message['type'])
+
+            task = asyncio.create_task(asgi_app({'type': 'lifespan'}, lifespan.get, send_lifespan))
+            await lifespan.put({'type': 'lifespan.startup'})
+            while not sent:
+                await asyncio.sleep(0.01)
+            assert sent == ['lifespan.startup.complete']
+            installed = get_db_pool()
+
+            request = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            messages = []
+
+            async def receive():
+                return request.pop(0)
+
+            async def send(message):
+                messages.append(message)
+
+            await asgi_app({
+                'type': 'http', 'method': 'GET', 'path': '/api/orgaos/5001', 'query_string': b'',
+                'headers': [(b'host', b'localhost'), (b'accept-encoding', b'identity')],
+            }, receive, send)
+
+            await lifespan.put({'type': 'lifespan.shutdown'})
+            await task
+            return installed, messages
+
+        with patch.object(asgi, 'DB_DRIVER', 'asyncpg'), \
+                patch.object(asgi.async_db, 'create_pool', create_pool), \
+                patch.object(asgi, 'ensure_warm', lambda: None):
+            installed, messages = asyncio.run(run())
+
+        assert isinstance(installed, AsyncpgPool)
+        assert messages[0]['status'] == 200
+        body = json.loads(b''.join(m.get('body', b'') for m in messages[1:]))
+        assert body['member_count'] == 1
+        # Lookup first, then members, agenda events and initiatives together
+        assert pool.peak == 3
@@ -0,0 +1,102 @@
+"""
+Tests for the API response cache and dataset version stamp.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from api.cache import DatasetVersion, ResponseCache, Version
+
+
+class TestDatasetVersion:
+    """Tests for DatasetVersion."""
+
+    def test_value_reused_within_ttl(self):
+        """The database is only asked again after the TTL expires."""
+        fetch = MagicMock(return_value=Version(3, None))
+        version = DatasetVersion(fetch, ttl=5)
+
+        with patch('api.cache.time.monotonic', return_value=100.0):
+            assert version.get().version == 3
+            assert version.get().version == 3
+        assert fetch.call_count == 1
+
+        with patch('api.cache.time.monotonic', return_value=106.0):
+            version.get()
+        assert fetch.call_count == 2
+
+    def test_fetch_error_returns_none(self):
+        """A missing table or DB error disables caching instead of failing."""
+        version = DatasetVersion(MagicMock(side_effect=Exception('no table')), ttl=5)
+        assert version.get() is None
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_get_and_set(self):
+        cache = ResponseCache(max_bytes=1000)
+        cache.set('a', b'[1]', 1)
+
+        assert cache.get('a') == b'[1]'
+        assert cache.get('b') is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Total size stays under max_bytes by evicting old entries."""
+        cache = ResponseCache(max_bytes=10)
+        cache.set('a', b'aaaa', 1)
+        cache.set('b', b'bbbb', 1)
+        cache.get('a')
+        cache.set('c', b'cccc', 1)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == b'aaaa'
+        assert cache.stats()['bytes'] <= 10
+
+    def test_new_version_drops_stale_entries(self):
+        """Storing a body for a newer version purges older versions."""
+        cache = ResponseCache(max_bytes=1000)
+        cache.set(('x', 1), b'old', 1)
+        cache.set(('x', 2), b'new', 2)
+
+        assert cache.get(('x', 1)) is None
+        assert cache.stats()['entries'] == 1
+
+        # Late writer for an older version must not repopulate
+        cache.set(('y', 1), b'late', 1)
+        assert cache.get(('y', 1)) is None
+
+    def test_disabled(self):
+        cache = ResponseCache(max_bytes=0)
+        cache.set('a', b'x', 1)
+        assert cache.get('a') is None
+
+    def test_compressed_variant_built_once(self):
+        """Each encoding is compressed once and then served from the entry."""
+        import gzip
+        from api.compression import compress as real_compress
+        body = b'[' + b'1,' * 1000 + b'1]'
+        cache = ResponseCache(max_bytes=100000)
+        cache.set('a', body, 1)
+
+        with patch('api.cache.compress', wraps=real_compress) as compress:
+            first = cache.get_encoded('a', 'gzip')
+            second = cache.get_encoded('a', 'gzip')
+
+        assert compress.call_count == 1
+        assert first == second and first[1] == 'gzip'
+        assert gzip.decompress(first[0]) == body
+        assert cache.stats()['bytes'] == len(body) + len(first[0])
+
+    def test_small_body_not_compressed(self):
+        cache = ResponseCache(max_bytes=1000)
+        cache.set('a', b'[1]', 1)
+        assert cache.get_encoded('a', 'gzip') == (b'[1]', None)
+
+    def test_identity_from_compressed_entry(self):
+        """An entry stored pre-compressed (e.g. a snapshot) can still be served plain."""
+        import gzip
+        cache = ResponseCache(max_bytes=1000)
+        cache.set('a', gzip.compress(b'[1]'), 1, encoding='gzip')
+        assert cache.get('a') == b'[1]'
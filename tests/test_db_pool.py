@@ -0,0 +1,276 @@
+"""
+Tests for the API connection pool and timed cursor.
+
+Uses fake connections so pool behaviour can be checked without PostgreSQL.
+"""
+
+import threading
+import pytest
+from unittest.mock import patch
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from api.db import ConnectionPool, PoolTimeout, TimedCursor
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise Exception('server closed the connection unexpectedly')
+        self.conn.status = TRANSACTION_STATUS_INTRANS
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = 1
+
+
+def run_within(seconds, fn):
+    """Call fn in another thread; fail if it's still blocked after `seconds`."""
+    result = {}
+
+    def target():
+        try:
+            result['value'] = fn()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "blocked on the pool lock"
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+@pytest.fixture
+def opened():
+    """List of connections created by the pool's factory."""
+    return []
+
+
+@pytest.fixture
+def make_pool(opened):
+    def factory(**kwargs):
+        def connect():
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+        return ConnectionPool(connect, **kwargs)
+    return factory
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool."""
+
+    def test_reuses_connections(self, make_pool, opened):
+        """Returned connections are handed out again instead of reconnecting."""
+        pool = make_pool(minconn=1, maxconn=2)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert len(opened) == 1
+        assert pool.stats()['checkouts'] == 2
+
+    def test_prefills_minimum(self, make_pool, opened):
+        """The pool opens `minconn` connections on first use."""
+        pool = make_pool(minconn=3, maxconn=5)
+        pool.putconn(pool.getconn())
+
+        assert len(opened) == 3
+        assert pool.stats()['idle'] == 3
+
+    def test_rolls_back_on_return(self, make_pool):
+        """Open transactions are rolled back when a connection is returned."""
+        pool = make_pool(minconn=0, maxconn=1)
+
+        with pool.connection() as conn:
+            conn.cursor().execute("SELECT 1")
+
+        assert conn.rollbacks == 1
+        assert conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+
+    def test_discards_closed_connections(self, make_pool, opened):
+        """Connections closed by the server are replaced."""
+        pool = make_pool(minconn=0, maxconn=1)
+
+        with pool.connection() as conn:
+            pass
+        conn.closed = 1
+
+        with pool.connection() as replacement:
+            pass
+
+        assert replacement is not conn
+        assert len(opened) == 2
+
+    def test_health_check_before_reuse(self, make_pool, opened):
+        """Idle connections failing the ping are discarded."""
+        pool = make_pool(minconn=0, maxconn=1, check_idle=0)
+
+        with pool.connection() as conn:
+            pass
+        conn.broken = True
+
+        with pool.connection() as replacement:
+            pass
+
+        assert replacement is not conn
+        assert pool.stats()['health_check_failures'] == 1
+
+    def test_recycles_old_connections(self, make_pool, opened):
+        """Connections older than max_age are closed instead of reused."""
+        pool = make_pool(minconn=0, maxconn=1, max_age=60)
+
+        with patch('api.db.time.monotonic', return_value=1000.0):
+            with pool.connection() as conn:
+                pass
+        with patch('api.db.time.monotonic', return_value=1100.0):
+            with pool.connection() as replacement:
+                pass
+
+        assert replacement is not conn
+        assert conn.closed
+        assert pool.stats()['connections_recycled'] == 1
+
+    def test_waits_then_times_out(self, make_pool):
+        """Checkouts beyond maxconn wait and raise PoolTimeout."""
+        pool = make_pool(minconn=0, maxconn=1, timeout=0.05)
+        pool.getconn()
+
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+
+        stats = pool.stats()
+        assert stats['waits'] == 1
+        assert stats['timeouts'] == 1
+        assert stats['checked_out'] == 1
+
+    def test_waiter_gets_returned_connection(self, make_pool):
+        """A blocked checkout is woken up when a connection is returned."""
+        pool = make_pool(minconn=0, maxconn=1, timeout=5)
+        conn = pool.getconn()
+
+        result = {}
+        waiter = threading.Thread(target=lambda: result.setdefault('conn', pool.getconn()))
+        waiter.start()
+        threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+        waiter.join(2)
+
+        assert result['conn'] is conn
+        stats = pool.stats()
+        assert stats['waits'] == 1
+        assert stats['wait_time_total'] > 0
+
+    def test_slow_connect_does_not_block_pool(self, opened):
+        """Other threads check out and return connections while one is connecting."""
+        connecting, release = threading.Event(), threading.Event()
+
+        def connect():
+            if opened:
+                connecting.set()
+                release.wait(5)
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+
+        pool = ConnectionPool(connect, minconn=1, maxconn=2, timeout=0.05)
+        first = pool.getconn()
+        slow = threading.Thread(target=pool.getconn)
+        slow.start()
+        try:
+            assert connecting.wait(2)
+            run_within(1, lambda: pool.putconn(first))
+            assert run_within(1, pool.getconn) is first
+            # The slot being connected still counts towards maxconn
+            with pytest.raises(PoolTimeout):
+                run_within(1, pool.getconn)
+        finally:
+            release.set()
+            slow.join(2)
+
+        assert pool.stats()['checked_out'] == 2
+
+    def test_health_check_outside_lock(self, make_pool):
+        """A connection being pinged doesn't hold the lock."""
+        pool = make_pool(minconn=0, maxconn=2, check_idle=0)
+        with pool.connection() as conn:
+            pass
+        pinging, release = threading.Event(), threading.Event()
+
+        def slow_cursor():
+            pinging.set()
+            release.wait(5)
+            return FakeCursor(conn)
+
+        conn.cursor = slow_cursor
+        checkout = threading.Thread(target=pool.getconn)
+        checkout.start()
+        try:
+            assert pinging.wait(2)
+            assert run_within(1, pool.stats)['size'] == 1
+            other = run_within(1, pool.getconn)
+            assert other is not conn
+        finally:
+            release.set()
+            checkout.join(2)
+
+    def test_invalid_size(self):
+        """min greater than max is rejected."""
+        with pytest.raises(ValueError):
+            ConnectionPool(FakeConnection, minconn=3, maxconn=1)
+
+
+class TestTimedCursor:
+    """Tests for TimedCursor."""
+
+    def test_counts_queries_and_rows(self):
+        stats = {'db_seconds': 0.0, 'db_queries': 0, 'db_rows': 0}
+        cur = TimedCursor(FakeCursor(FakeConnection()), stats)
+
+        cur.execute("SELECT 1")
+        assert cur.fetchone() == (1,)
+        assert cur.conn is not None  # Other attributes pass through
+
+        assert stats['db_queries'] == 1
+        assert stats['db_rows'] == 1
+        assert stats['db_seconds'] >= 0
+
+    def test_errors_still_counted(self):
+        stats = {'db_seconds': 0.0, 'db_queries': 0, 'db_rows': 0}
+        conn = FakeConnection()
+        conn.broken = True
+        cur = TimedCursor(FakeCursor(conn), stats)
+
+        with pytest.raises(Exception):
+            cur.execute("SELECT 1")
+        assert stats['db_queries'] == 1
@@ -0,0 +1,51 @@
+"""
+Tests for the JSON encoder layer.
+"""
+
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+
+from api.encoding import ENCODERS, get_encoder
+
+ROW = {
+    'IniId': '315506',
+    'IniTitulo': 'Alteração ao Código do Trabalho',
+    'DataInicioleg': date(2025, 3, 26),
+    'updated_at': datetime(2025, 3, 26, 10, 30, 15, tzinfo=timezone.utc),
+    'start_time': time(15, 0),
+    'link_confidence': Decimal('0.85'),
+    'IniEventos': [{'Fase': 'Entrada', 'DataFase': date(2025, 3, 26), 'DescFase': None}],
+}
+
+
+@pytest.mark.parametrize('name', sorted(ENCODERS))
+def test_encodes_database_types(name):
+    """Dates become ISO strings and Decimals numbers, without handler conversions."""
+    decoded = json.loads(get_encoder(name)(ROW))
+
+    assert decoded['DataInicioleg'] == '2025-03-26'
+    assert decoded['updated_at'] == '2025-03-26T10:30:15+00:00'
+    assert decoded['start_time'] == '15:00:00'
+    assert decoded['link_confidence'] == 0.85
+    assert decoded['IniEventos'][0]['DataFase'] == '2025-03-26'
+    assert decoded['IniTitulo'] == 'Alteração ao Código do Trabalho'
+
+
+def test_encoders_agree():
+    """All available encoders produce the same document."""
+    outputs = {json.dumps(json.loads(encode(ROW)), sort_keys=True) for encode in ENCODERS.values()}
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize('name', sorted(ENCODERS))
+def test_unsupported_type(name):
+    with pytest.raises(TypeError):
+        get_encoder(name)({'x': object()})
+
+
+def test_unknown_encoder():
+    with pytest.raises(ValueError):
+        get_encoder('simplejson')
@@ -0,0 +1,80 @@
+"""
+Tests for request metrics and their aggregation across workers.
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+from api.metrics import Metrics
+
+
+class TestMetrics:
+    """Tests for Metrics."""
+
+    def test_histogram_rendering(self, tmp_path):
+        metrics = Metrics(str(tmp_path))
+        metrics.observe('viriato_http_request_duration_seconds', 0.02, endpoint='/api/stats', method='GET', status=200)
+        metrics.observe('viriato_http_request_duration_seconds', 3.0, endpoint='/api/stats', method='GET', status=200)
+        metrics.inc('viriato_db_rows_fetched_total', 12, endpoint='/api/stats')
+
+        text = metrics.render()
+
+        labels = 'endpoint="/api/stats",method="GET",status="200"'
+        assert '# TYPE viriato_http_request_duration_seconds histogram' in text
+        assert f'viriato_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in text
+        assert f'viriato_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'viriato_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f'viriato_http_request_duration_seconds_count{{{labels}}} 2' in text
+        assert f'viriato_http_request_duration_seconds_sum{{{labels}}} 3.02' in text
+        assert 'viriato_db_rows_fetched_total{endpoint="/api/stats"} 12' in text
+
+    def test_aggregates_worker_files(self, tmp_path):
+        """Snapshots written by other workers are summed into the scrape."""
+        metrics = Metrics(str(tmp_path))
+        metrics.inc('viriato_db_queries_total', 2, endpoint='/api/agenda')
+
+        other = {'histograms': [], 'counters': [['viriato_db_queries_total', [['endpoint', '/api/agenda']], 3]]}
+        with open(os.path.join(tmp_path, 'worker-1.json'), 'w') as f:
+            json.dump(other, f)
+
+        assert 'viriato_db_queries_total{endpoint="/api/agenda"} 5' in metrics.render()
+
+    def test_flush_is_throttled(self, tmp_path):
+        metrics = Metrics(str(tmp_path), flush_interval=60)
+        metrics.inc('viriato_db_queries_total', endpoint='/api/agenda')
+        metrics.flush()
+        metrics.inc('viriato_db_queries_total', endpoint='/api/agenda')
+        metrics.flush()
+
+        with open(os.path.join(tmp_path, f'worker-{os.getpid()}.json')) as f:
+            assert json.load(f)['counters'][0][2] == 1
+
+    def test_values_reset_after_fork(self, tmp_path):
+        """A forked worker doesn't report the values it inherited."""
+        metrics = Metrics(str(tmp_path))
+        metrics.inc('viriato_db_queries_total', endpoint='/api/agenda')
+
+        with patch('api.metrics.os.getpid', return_value=os.getpid() + 1):
+            assert metrics.snapshot()['counters'] == []
+
+
+class TestMetricsEndpoint:
+    """Tests for /api/metrics and the request instrumentation."""
+
+    def test_requests_are_recorded(self, client, mock_db_connection):
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchall.return_value = [{'raw_data': {'Id': 1}}, {'raw_data': {'Id': 2}}]
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            client.get('/api/agenda')
+            response = client.get('/api/metrics')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        text = response.get_data(as_text=True)
+        assert 'viriato_http_request_duration_seconds_count{endpoint="/api/agenda",method="GET",status="200"} 1' in text
+        assert 'viriato_db_queries_total{endpoint="/api/agenda"} 1' in text
+        assert 'viriato_db_rows_fetched_total{endpoint="/api/agenda"} 2' in text
+        assert 'viriato_serialization_duration_seconds_count{endpoint="/api/agenda"} 1' in text
+        assert 'viriato_response_size_bytes_count{endpoint="/api/agenda"} 1' in text
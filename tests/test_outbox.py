@@ -0,0 +1,292 @@
+"""
+Tests for the feedback outbox, sending to a local stub of the GitHub API.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from api.outbox import Outbox, OutboxDrainer, PermanentError, PostgresOutbox
+
+
+@pytest.fixture
+def github():
+    """
+    Stub GitHub issues endpoint. Answers with `statuses` in turn (201 once
+    they run out) and records every request it gets.
+    """
+    state = {'statuses': [], 'requests': []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            state['requests'].append({'path': self.path, 'headers': dict(self.headers), 'body': body})
+            status = state['statuses'].pop(0) if state['statuses'] else 201
+            payload = json.dumps({'number': len(state['requests'])} if status == 201
+                                 else {'message': 'error'}).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch('api.app.GITHUB_API_URL', f'http://127.0.0.1:{server.server_port}'), \
+            patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token', 'GITHUB_REPO': 'owner/repo'}):
+        yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(str(tmp_path / 'outbox.sqlite3'), max_attempts=3, base_delay=10, max_delay=100)
+
+
+def _issue(title='[Feedback] Broken link'):
+    return {'title': title, 'body': 'Details', 'labels': ['user-feedback']}
+
+
+class TestOutbox:
+    def test_claim_leases_items(self, outbox):
+        first = outbox.enqueue(_issue('a'), now=1000.0)
+        outbox.enqueue(_issue('b'), now=1000.0)
+
+        assert [item[0] for item in outbox.claim(1, now=1000.0)] == [first]
+        # Leased items are skipped until the lease runs out
+        assert len(outbox.claim(10, now=1001.0)) == 1
+        assert outbox.claim(10, now=1002.0) == []
+        assert len(outbox.claim(10, now=1001.0 + outbox.lease_seconds)) == 2
+
+    def test_backoff_then_failed(self, outbox):
+        item_id = outbox.enqueue(_issue(), now=1000.0)
+
+        outbox.claim(now=1000.0)
+        assert outbox.fail(item_id, 'boom', now=1000.0) == 'pending'
+        retry_at = outbox.get(item_id)['next_attempt_at']
+        assert 1008.0 <= retry_at <= 1012.0
+        assert outbox.claim(now=retry_at - 1) == []
+
+        outbox.claim(now=retry_at)
+        assert outbox.fail(item_id, 'boom', now=retry_at) == 'pending'
+        assert outbox.get(item_id)['next_attempt_at'] - retry_at >= 16.0
+
+        outbox.claim(now=2000.0)
+        assert outbox.fail(item_id, 'boom', now=2000.0) == 'failed'
+        assert outbox.claim(now=9999.0) == []
+        assert outbox.stats() == {'pending': 0, 'sent': 0, 'failed': 1}
+
+
+
+@pytest.mark.skipif(not os.environ.get('DATABASE_URL'), reason='needs DATABASE_URL')
+class TestPostgresOutbox:
+    """The PostgreSQL outbox, in a scratch table dropped afterwards."""
+
+    @pytest.fixture
+    def pg_outbox(self):
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+
+        @contextmanager
+        def connection():
+            conn = psycopg2.connect(os.environ['DATABASE_URL'], cursor_factory=RealDictCursor)
+            try:
+                yield conn, conn.cursor()
+            finally:
+                conn.close()
+
+        outbox = PostgresOutbox(connection, table='test_outbox', max_attempts=3, base_delay=10, max_delay=100)
+        yield outbox
+        with connection() as (conn, cur):
+            cur.execute("DROP TABLE IF EXISTS test_outbox")
+            conn.commit()
+
+    def test_claim_renew_and_retry(self, pg_outbox):
+        first = pg_outbox.enqueue(_issue('a'), now=1000.0)
+        second = pg_outbox.enqueue(_issue('b'), now=1000.0)
+
+        (item_id, payload, attempts, lease), = pg_outbox.claim(1, now=1000.0)
+        assert (item_id, payload, attempts) == (first, _issue('a'), 0)
+        assert [item[0] for item in pg_outbox.claim(10, now=1001.0)] == [second]
+        assert pg_outbox.renew(first, lease, now=1002.0) is not None
+        assert pg_outbox.renew(first, lease, now=1003.0) is None  # Lease changed since
+
+        assert pg_outbox.fail(first, 'boom', now=1003.0) == 'pending'
+        pg_outbox.complete(second, 7, now=1003.0)
+        assert pg_outbox.get(second)['result'] == 7
+        assert pg_outbox.stats() == {'pending': 1, 'sent': 1, 'failed': 0}
+
+    def test_drained_once(self, pg_outbox):
+        sent = []
+        for title in ('1', '2', '3'):
+            pg_outbox.enqueue(_issue(title))
+        drainers = [OutboxDrainer(pg_outbox, lambda payload: sent.append(payload['title']), batch_size=2)
+                    for _ in range(2)]
+
+        while sum(drainer.drain_once() for drainer in drainers):
+            pass
+
+        assert sorted(sent) == ['1', '2', '3']
+
+class TestDrainer:
+    def test_sends_to_github(self, outbox, github):
+        from api.app import create_github_issue
+
+        item_id = outbox.enqueue(_issue())
+        assert OutboxDrainer(outbox, create_github_issue).drain_once() == 1
+
+        request = github['requests'][0]
+        assert request['path'] == '/repos/owner/repo/issues'
+        assert request['headers']['Authorization'] == 'token test-token'
+        assert request['body'] == _issue()
+        item = outbox.get(item_id)
+        assert (item['status'], item['result'], item['attempts']) == ('sent', 1, 1)
+
+    def test_server_error_is_retried(self, outbox, github):
+        from api.app import create_github_issue
+
+        github['statuses'] = [502]
+        item_id = outbox.enqueue(_issue(), now=1000.0)
+        drainer = OutboxDrainer(outbox, create_github_issue)
+
+        drainer.drain_once(now=1000.0)
+        item = outbox.get(item_id)
+        assert (item['status'], item['attempts']) == ('pending', 1)
+        assert '502' in item['last_error']
+
+        assert drainer.drain_once(now=1001.0) == 0   # Backing off
+        drainer.drain_once(now=1100.0)
+        assert outbox.get(item_id)['status'] == 'sent'
+        assert len(github['requests']) == 2
+
+    def test_rejected_issue_is_not_retried(self, outbox, github):
+        from api.app import create_github_issue
+
+        github['statuses'] = [422]
+        item_id = outbox.enqueue(_issue(), now=1000.0)
+
+        with pytest.raises(PermanentError):
+            create_github_issue(_issue())
+        github['statuses'] = [422]
+        OutboxDrainer(outbox, create_github_issue).drain_once(now=1000.0)
+
+        item = outbox.get(item_id)
+        assert (item['status'], item['attempts']) == ('failed', 1)
+
+    def test_batches(self, outbox):
+        sent = []
+        for i in range(5):
+            outbox.enqueue(_issue(str(i)), now=1000.0)
+        drainer = OutboxDrainer(outbox, lambda payload: sent.append(payload['title']), batch_size=2)
+
+        assert [drainer.drain_once(now=1000.0) for _ in range(4)] == [2, 2, 1, 0]
+        assert sent == ['0', '1', '2', '3', '4']
+
+    def test_batch_outliving_its_lease(self, tmp_path):
+        """Items another drainer claimed while a slow batch ran are sent once, by that drainer."""
+        path = str(tmp_path / 'outbox.sqlite3')
+        clock = [1000.0]
+        sent = []
+        other = OutboxDrainer(Outbox(path), lambda payload: sent.append(('b', payload['title'])))
+
+        def slow_send(payload):
+            sent.append(('a', payload['title']))
+            clock[0] += 35
+            if payload['title'] == '2':
+                other.drain_once()  # At 1070: item 3's lease (to 1060) has run out
+
+        with patch('api.outbox.time.time', lambda: clock[0]):
+            outbox = Outbox(path)
+            for title in ('1', '2', '3'):
+                outbox.enqueue(_issue(title))
+            OutboxDrainer(outbox, slow_send).drain_once()
+
+        assert sent == [('a', '1'), ('a', '2'), ('b', '3')]
+        assert outbox.stats() == {'pending': 0, 'sent': 3, 'failed': 0}
+
+    def test_background_thread(self, outbox, github):
+        from api.app import create_github_issue
+
+        drainer = OutboxDrainer(outbox, create_github_issue, interval=60)
+        drainer.start()
+        try:
+            item_id = outbox.enqueue(_issue())
+            drainer.wake()
+            for _ in range(100):
+                if outbox.get(item_id)['status'] == 'sent':
+                    break
+                threading.Event().wait(0.05)
+        finally:
+            drainer.stop()
+
+        assert outbox.get(item_id)['status'] == 'sent'
+        assert len(github['requests']) == 1
+
+
+class TestFeedbackEndpoint:
+    def test_feedback_reaches_github(self, client, github):
+        """End to end: the handler answers 202, the drainer creates the issue."""
+        from api import app as app_module
+
+        drainer = OutboxDrainer(app_module.feedback_outbox, app_module.create_github_issue)
+        with patch('api.app.feedback_drainer', drainer):
+            response = client.post('/api/feedback', json={
+                'title': 'Broken link',
+                'description': 'The text link on this initiative is broken'
+            })
+            assert response.status_code == 202
+            for _ in range(100):
+                if github['requests']:
+                    break
+                threading.Event().wait(0.05)
+            drainer.stop()  # Waits for the drainer to record the result
+
+        assert github['requests'][0]['body']['title'] == '[Feedback] Broken link'
+        assert app_module.feedback_outbox.get(response.get_json()['id'])['status'] == 'sent'
+
+    def test_without_outbox_issue_is_created_in_request(self, client, github):
+        """With FEEDBACK_OUTBOX=off nothing is queued: the issue exists before the response."""
+        with patch('api.app.feedback_outbox', None), patch('api.app.feedback_drainer', None):
+            response = client.post('/api/feedback', json={
+                'title': 'Broken link',
+                'description': 'The text link on this initiative is broken'
+            })
+            github['statuses'] = [502]
+            failed = client.post('/api/feedback', json={
+                'title': 'Broken link',
+                'description': 'The text link on this initiative is broken'
+            }, headers={'X-Forwarded-For': '203.0.113.9'})
+
+        assert response.status_code == 200
+        assert response.get_json()['issue_number'] == 1
+        assert failed.status_code == 500
+
+    def test_postgres_outbox_by_default(self):
+        """Unless FEEDBACK_OUTBOX says otherwise, feedback is queued in the API's database."""
+        from api import app as app_module
+        if 'FEEDBACK_OUTBOX' in os.environ or app_module.DATA_BACKEND != 'postgres':
+            pytest.skip('FEEDBACK_OUTBOX or DATA_BACKEND overridden')
+
+        assert isinstance(app_module.feedback_outbox, PostgresOutbox)
+        assert app_module.feedback_drainer.outbox is app_module.feedback_outbox
+
+    def test_health_reports_queue(self, client, mock_db_connection):
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {'count': 1}
+        from api import app as app_module
+        app_module.feedback_outbox.enqueue(_issue())
+
+        with patch('api.app.get_db_connection', return_value=mock_conn):
+            response = client.get('/api/health')
+
+        assert response.get_json()['feedback_outbox'] == {'pending': 1, 'sent': 0, 'failed': 0}
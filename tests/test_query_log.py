@@ -0,0 +1,93 @@
+"""
+Tests for the slow-query log.
+"""
+
+import json
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.db import TimedCursor
+from api.query_log import SlowQueryLog
+
+PLAN = [{'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'iniciativas'}}]
+
+
+@pytest.fixture
+def cursor():
+    cursor = MagicMock()
+    explain_cursor = MagicMock()
+    explain_cursor.fetchone.return_value = {'QUERY PLAN': PLAN}
+    cursor.connection.cursor.return_value = explain_cursor
+    return cursor
+
+
+def read_entries(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestSlowQueryLog:
+    """Tests for SlowQueryLog with TimedCursor."""
+
+    def test_slow_query_logged_with_plan(self, tmp_path, cursor):
+        path = tmp_path / 'slow.log'
+        log = SlowQueryLog(str(path), threshold_ms=0, explain_sample=1)
+
+        TimedCursor(cursor, slow_log=log, context='/api/search').execute(
+            "SELECT * FROM iniciativas\n  WHERE start_date > %s", (date(2025, 1, 1),))
+
+        [entry] = read_entries(path)
+        assert entry['endpoint'] == '/api/search'
+        assert entry['query'] == 'SELECT * FROM iniciativas WHERE start_date > %s'
+        assert entry['params'] == ['2025-01-01']
+        assert entry['plan'] == PLAN
+
+        # The plan is taken inside a savepoint on the same connection
+        explain_calls = [c[0][0] for c in cursor.connection.cursor.return_value.execute.call_args_list]
+        assert explain_calls[0] == 'SAVEPOINT slow_query_explain'
+        assert explain_calls[1].startswith('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT')
+        assert explain_calls[2] == 'RELEASE SAVEPOINT slow_query_explain'
+
+    def test_fast_query_not_logged(self, tmp_path, cursor):
+        path = tmp_path / 'slow.log'
+        log = SlowQueryLog(str(path), threshold_ms=60000, explain_sample=1)
+
+        TimedCursor(cursor, slow_log=log).execute("SELECT 1")
+
+        assert not path.exists()
+
+    def test_unsampled_and_non_select_have_no_plan(self, tmp_path, cursor):
+        path = tmp_path / 'slow.log'
+        TimedCursor(cursor, slow_log=SlowQueryLog(str(path), threshold_ms=0, explain_sample=0)).execute(
+            "SELECT 1")
+        TimedCursor(cursor, slow_log=SlowQueryLog(str(path), threshold_ms=0, explain_sample=1)).execute(
+            "SET LOCAL statement_timeout = %s", (1000,))
+
+        assert all('plan' not in entry for entry in read_entries(path))
+        cursor.connection.cursor.assert_not_called()
+
+    def test_failed_query_logged_without_plan(self, tmp_path, cursor):
+        path = tmp_path / 'slow.log'
+        cursor.execute.side_effect = Exception('canceling statement due to statement timeout')
+        log = SlowQueryLog(str(path), threshold_ms=0, explain_sample=1)
+
+        with pytest.raises(Exception):
+            TimedCursor(cursor, slow_log=log).execute("SELECT pg_sleep(10)")
+
+        [entry] = read_entries(path)
+        assert 'statement timeout' in entry['error']
+        assert 'plan' not in entry
+
+    def test_explain_error_rolls_back_savepoint(self, tmp_path, cursor):
+        path = tmp_path / 'slow.log'
+        explain_cursor = cursor.connection.cursor.return_value
+        explain_cursor.execute.side_effect = [None, Exception('permission denied'), None]
+        log = SlowQueryLog(str(path), threshold_ms=0, explain_sample=1)
+
+        TimedCursor(cursor, slow_log=log).execute("SELECT 1")
+
+        [entry] = read_entries(path)
+        assert entry['plan_error'] == 'permission denied'
+        assert explain_cursor.execute.call_args_list[-1][0][0] == 'ROLLBACK TO SAVEPOINT slow_query_explain'
@@ -0,0 +1,81 @@
+"""
+Tests for the token-bucket rate limiter stores.
+"""
+
+import multiprocessing
+
+import pytest
+
+from api.rate_limit import MemoryBucketStore, SqliteBucketStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBucketStore()
+    return SqliteBucketStore(str(tmp_path / 'buckets.sqlite3'))
+
+
+def _take_in_child(path, queue):
+    queue.put(SqliteBucketStore(path).take('shared', 2, 60, now=1000.0)[0])
+
+
+class TestBucketStores:
+    """Behaviour common to both stores."""
+
+    def test_burst_then_limited(self, store):
+        results = [store.take('ip', 3, 300, now=1000.0) for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[-1][1] == pytest.approx(100.0)  # One token per 100 s
+
+    def test_refills_over_time(self, store):
+        for _ in range(3):
+            store.take('ip', 3, 300, now=1000.0)
+
+        assert store.take('ip', 3, 300, now=1050.0)[0] is False
+        assert store.take('ip', 3, 300, now=1100.0)[0] is True
+        assert store.take('ip', 3, 300, now=1100.0)[0] is False
+
+    def test_keys_are_independent(self, store):
+        store.take('a', 1, 60, now=1000.0)
+
+        assert store.take('a', 1, 60, now=1000.0)[0] is False
+        assert store.take('b', 1, 60, now=1000.0)[0] is True
+
+
+class TestMemoryBucketStore:
+    def test_bounded(self):
+        store = MemoryBucketStore(max_keys=2)
+        for key in ('a', 'b', 'c'):
+            store.take(key, 1, 60, now=1000.0)
+
+        assert len(store) == 2
+        # 'a' was evicted, so it starts over with a full bucket
+        assert store.take('a', 1, 60, now=1000.0)[0] is True
+
+
+class TestSqliteBucketStore:
+    def test_shared_between_processes(self, tmp_path):
+        """A bucket drained by one worker process is empty for the others."""
+        path = str(tmp_path / 'buckets.sqlite3')
+        SqliteBucketStore(path).take('shared', 2, 60, now=1000.0)
+
+        queue = multiprocessing.get_context('fork').Queue()
+        child = multiprocessing.get_context('fork').Process(target=_take_in_child, args=(path, queue))
+        child.start()
+        child.join(10)
+
+        assert queue.get(timeout=5) is True
+        assert SqliteBucketStore(path).take('shared', 2, 60, now=1000.0)[0] is False
+
+    def test_purge_drops_full_buckets_and_caps_rows(self, tmp_path):
+        store = SqliteBucketStore(str(tmp_path / 'buckets.sqlite3'), max_keys=2)
+        store.take('old', 1, 60, now=1000.0)     # Full again at 1060
+        for key in ('a', 'b', 'c'):
+            store.take(key, 1, 60, now=1050.0)
+
+        store.purge(now=1070.0)
+
+        assert len(store) == 2
+        assert store.take('old', 1, 60, now=1070.0)[0] is True
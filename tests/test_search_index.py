@@ -0,0 +1,118 @@
+"""
+Tests for the in-memory search index.
+
+The parity test compares rankings with PostgreSQL full-text search and
+only runs against a real database (set DATABASE_URL).
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.search_index import SearchEngine, SearchIndex, analyze, fold_accents, parse_query
+
+
+def make_doc(title, summary=None, legislature='XVII'):
+    return {'title': title, 'summary': summary, 'legislature': legislature, 'body': title.encode('utf-8')}
+
+
+DOCUMENTS = [
+    make_doc('Habitação acessível para jovens', 'Medidas de apoio ao arrendamento.'),
+    make_doc('Código do Trabalho', 'Altera o regime de habitação dos trabalhadores deslocados.'),
+    make_doc('Serviço Nacional de Saúde', 'Reforço da saúde mental nos centros de saúde.', legislature='XVI'),
+    make_doc('Saúde mental nas escolas', None),
+]
+
+
+class TestAnalyze:
+    """Tests for text analysis."""
+
+    def test_accents_folded(self):
+        assert fold_accents('habitação') == 'habitacao'
+        assert analyze('Habitação') == analyze('habitacao')
+
+    def test_stopwords_dropped_and_plurals_stemmed(self):
+        assert analyze('a saúde das escolas') == analyze('saúde escola')
+
+    def test_parse_query_operators(self):
+        groups = parse_query('saúde & !escolas | habit:*')
+        assert groups == [(analyze('saúde'), analyze('escolas'), []), ([], [], ['habit'])]
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex."""
+
+    def test_title_ranks_above_summary(self):
+        index = SearchIndex(DOCUMENTS)
+        assert index.search('habitação') == [b'Habita\xc3\xa7\xc3\xa3o acess\xc3\xadvel para jovens',
+                                             'Código do Trabalho'.encode('utf-8')]
+
+    def test_and_not_prefix(self):
+        index = SearchIndex(DOCUMENTS)
+        assert len(index.search('saúde & mental')) == 2
+        assert index.search('saúde & !escolas') == ['Serviço Nacional de Saúde'.encode('utf-8')]
+        assert len(index.search('trabalh:*')) == 1
+
+    def test_legislature_and_limit(self):
+        index = SearchIndex(DOCUMENTS)
+        assert index.search('saúde', legislature='XVI') == ['Serviço Nacional de Saúde'.encode('utf-8')]
+        assert len(index.search('saúde | habitação', limit=3)) == 3
+
+    def test_no_match(self):
+        assert SearchIndex(DOCUMENTS).search('orçamento') == []
+        assert SearchIndex([]).search('saúde') == []
+
+
+class TestSearchEngine:
+    """Tests for SearchEngine."""
+
+    def test_rebuilt_when_version_changes(self):
+        load = MagicMock(return_value=DOCUMENTS)
+        engine = SearchEngine(load)
+
+        first = engine.get(1)
+        assert engine.get(1) is first
+        assert load.call_count == 1
+
+        assert engine.get(2) is not first
+        assert load.call_count == 2
+
+    def test_build_error_keeps_no_index(self):
+        engine = SearchEngine(MagicMock(side_effect=Exception('db down')))
+        with pytest.raises(Exception):
+            engine.get(1)
+
+
+# to_tsquery syntax, as /api/search passes q to PostgreSQL (bare words need '&')
+PARITY_QUERIES = ['saúde', 'habitação', 'trabalho', 'ensino & superior', 'ambiente & energia', 'imposto | taxa']
+
+
+@pytest.mark.skipif(not os.environ.get('DATABASE_URL'), reason='needs DATABASE_URL with loaded data')
+def test_parity_with_postgres():
+    """The in-memory index finds mostly the same top results as PostgreSQL."""
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    try:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("SELECT ini_id, title, summary, legislature FROM iniciativas")
+        index = SearchIndex([dict(row, body=row['ini_id']) for row in cur.fetchall()])
+
+        for query in PARITY_QUERIES:
+            cur.execute("""
+                SELECT ini_id
+                FROM iniciativas, to_tsquery('portuguese', %s) AS query
+                WHERE search_vector @@ query
+                ORDER BY ts_rank_cd(search_vector, query) DESC
+                LIMIT 10
+            """, (query,))
+            expected = {row['ini_id'] for row in cur.fetchall()}
+            found = set(index.search(query, limit=10))
+
+            if expected:
+                overlap = len(expected & found) / len(expected)
+                assert overlap >= 0.6, f"{query!r}: {overlap:.0%} of the SQL top 10"
+    finally:
+        conn.close()
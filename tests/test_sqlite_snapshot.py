@@ -0,0 +1,169 @@
+"""
+Tests for the read-only SQLite snapshot backend (DATA_BACKEND=sqlite).
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from api import app as api_app
+from api.sqlite_snapshot import SqliteSnapshot
+
+# The conftest app fixture stubs this out; these tests need the real one
+real_read_dataset_version = api_app.read_dataset_version
+
+
+def write_snapshot(path, version=3, responses=(), iniciativas=(), documents=()):
+    """Write a file shaped like pipeline/export_sqlite.py output."""
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+    db.executemany("INSERT INTO snapshot_meta VALUES (?, ?)", [
+        ('dataset_version', str(version)),
+        ('dataset_updated_at', '2025-06-01T12:00:00'),
+        ('exported_at', '2025-06-01T12:05:00'),
+    ])
+    db.execute("CREATE TABLE iniciativas (ini_id TEXT PRIMARY KEY, raw_data TEXT) WITHOUT ROWID")
+    db.executemany("INSERT INTO iniciativas VALUES (?, ?)",
+                   [(ini_id, json.dumps(raw)) for ini_id, raw in iniciativas])
+    db.execute("""
+        CREATE TABLE api_responses (
+            path TEXT, query TEXT, body BLOB, body_gzip BLOB, PRIMARY KEY (path, query)
+        )
+    """)
+    db.executemany("INSERT INTO api_responses VALUES (?, ?, ?, ?)",
+                   [(p, q, body, gzip.compress(body)) for p, q, body in responses])
+    db.execute("CREATE TABLE search_documents (title TEXT, summary TEXT, legislature TEXT, body BLOB)")
+    db.executemany("INSERT INTO search_documents VALUES (?, ?, ?, ?)",
+                   [(d['title'], d['summary'], d['legislature'], d['body']) for d in documents])
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    path = str(tmp_path / 'api_snapshot.sqlite3')
+    write_snapshot(
+        path,
+        responses=[
+            ('/api/iniciativas', 'legislature=XVII', b'[{"IniId":"1"}]'),
+            ('/api/orgaos/summary', '', b'{"committees":[]}'),
+            ('/api/deputados', 'legislature=XVII&situation=serving', b'{"deputados":[]}'),
+            ('/api/deputados', 'legislature=XVII&party=PS&situation=serving', b'{"deputados":["PS"]}'),
+        ],
+        iniciativas=[('315506', {'IniId': '315506', 'IniTitulo': 'Habitação'})],
+        documents=[
+            {'title': 'Habitação acessível', 'summary': None, 'legislature': 'XVII',
+             'body': b'{"IniId":"1"}'},
+            {'title': 'Orçamento do Estado', 'summary': None, 'legislature': 'XVII',
+             'body': b'{"IniId":"2"}'},
+        ])
+    return path
+
+
+@pytest.fixture
+def sqlite_client(app, snapshot_file, mock_db_connection):
+    """Client for an app serving from the snapshot file, with no database."""
+    mock_conn, _ = mock_db_connection
+    with patch('api.app.sqlite_snapshot', SqliteSnapshot(snapshot_file)), \
+            patch('api.app.read_dataset_version', real_read_dataset_version):
+        yield app.test_client()
+    mock_conn.cursor.assert_not_called()
+
+
+class TestSqliteSnapshot:
+    """Tests for api.sqlite_snapshot.SqliteSnapshot."""
+
+    def test_reads(self, snapshot_file):
+        snapshot = SqliteSnapshot(snapshot_file)
+        assert snapshot.version().version == 3
+        assert snapshot.response('/api/orgaos/summary', '') == b'{"committees":[]}'
+        assert gzip.decompress(snapshot.response('/api/orgaos/summary', '', gzipped=True)) == \
+            b'{"committees":[]}'
+        assert snapshot.response('/api/orgaos/summary', 'x=1') is None
+        assert json.loads(snapshot.iniciativa_raw('315506'))['IniId'] == '315506'
+        assert snapshot.iniciativa_raw('missing') is None
+        assert len(snapshot.search_documents()) == 2
+
+    def test_opened_read_only(self, snapshot_file):
+        snapshot = SqliteSnapshot(snapshot_file)
+        with pytest.raises(sqlite3.OperationalError):
+            snapshot.connection().execute("DELETE FROM iniciativas")
+
+    def test_reopens_replaced_file(self, snapshot_file, tmp_path):
+        """An atomically replaced file is picked up on the next check."""
+        snapshot = SqliteSnapshot(snapshot_file, check_interval=0)
+        assert snapshot.version().version == 3
+
+        new_path = str(tmp_path / 'new.sqlite3')
+        write_snapshot(new_path, version=4)
+        os.replace(new_path, snapshot_file)
+
+        assert snapshot.version().version == 4
+
+
+class TestSqliteBackend:
+    """Tests for serving the API routes from the snapshot file."""
+
+    def test_prerendered_response(self, sqlite_client):
+        response = sqlite_client.get('/api/iniciativas?legislature=XVII',
+                                     headers={'Accept-Encoding': 'identity'})
+
+        assert response.status_code == 200
+        assert response.get_json() == [{'IniId': '1'}]
+        assert response.headers['ETag']
+
+    def test_gzip_response(self, sqlite_client):
+        response = sqlite_client.get('/api/orgaos/summary', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == b'{"committees":[]}'
+
+    def test_conditional_get(self, sqlite_client):
+        first = sqlite_client.get('/api/orgaos/summary', headers={'Accept-Encoding': 'identity'})
+        second = sqlite_client.get('/api/orgaos/summary', headers={
+            'Accept-Encoding': 'identity', 'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 304
+
+    def test_single_iniciativa(self, sqlite_client):
+        response = sqlite_client.get('/api/iniciativas/315506')
+        assert response.get_json()['IniTitulo'] == 'Habitação'
+
+        assert sqlite_client.get('/api/iniciativas/missing').status_code == 404
+
+    def test_not_exported(self, sqlite_client):
+        """Requests the exporter didn't render never reach a database."""
+        response = sqlite_client.get('/api/iniciativas?legislature=XVI')
+        assert response.status_code == 501
+
+    def test_deputados_filters(self, sqlite_client):
+        """Deputies are looked up by their effective filters, defaults included."""
+        for path in ('/api/deputados', '/api/deputados?legislature=XVII',
+                     '/api/deputados?situation=serving&party='):
+            assert sqlite_client.get(path).get_json() == {'deputados': []}
+        assert sqlite_client.get('/api/deputados?party=PS').get_json() == {'deputados': ['PS']}
+        assert sqlite_client.get('/api/deputados?party=PS&circulo=Lisboa').status_code == 501
+
+    def test_search_uses_memory_index(self, sqlite_client):
+        response = sqlite_client.get('/api/search?q=habitacao')
+        assert response.get_json() == [{'IniId': '1'}]
+
+    def test_health(self, sqlite_client):
+        data = sqlite_client.get('/api/health').get_json()
+        assert data['database'] == 'sqlite'
+        assert data['snapshot']['dataset_version'] == 3
+        assert data['snapshot']['iniciativas_count'] == 1
+
+    def test_batch(self, sqlite_client):
+        response = sqlite_client.post('/api/batch', json={'requests': [
+            {'id': 'summary', 'path': '/api/orgaos/summary'},
+            {'id': 'one', 'path': '/api/iniciativas/315506'},
+        ]})
+
+        data = response.get_json()['responses']
+        assert data['summary'] == {'status': 200, 'body': {'committees': []}}
+        assert data['one']['body']['IniId'] == '315506'